@@ -0,0 +1 @@
+"""Standalone benchmarks, and the local fixture site the tests share with them."""
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput of each extractor against a local fixture site.
+
+    python benchmarks/bench_e2e.py [--scenarios website,crawl,reddit,substack,pdf] [--posts 50]
+        [--latency 0.02] [--jitter 0.01] [--error-rate 0.05] [--concurrency 4] [--parse-workers 2]
+        [--json results.json]
+
+The fixture server (benchmarks/fixture_site.py) stands in for the real sites,
+with optional per-response latency and injected 503s, so runs are offline and
+repeatable. Each scenario runs in a fresh process so its peak RSS is its own.
+Per-item latency is the gap between consecutive items reaching the caller
+(the first one counts from the start of the run); CPU time includes worker
+processes, and ``http_seconds`` is the summed time requests spent on the wire.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fixture_site import FixtureSite  # noqa: E402
+
+SCENARIOS = ('website', 'crawl', 'reddit', 'substack', 'pdf')
+
+
+def _sources(site: FixtureSite, scenario: str) -> List[str]:
+    """Source URLs a scenario extracts from ``site``."""
+    return {
+        'website': lambda: [site.blog_url],
+        'crawl': lambda: [site.archive_url],
+        'reddit': site.reddit_urls,
+        'substack': site.substack_urls,
+        'pdf': lambda: [site.drive_folder_url],
+    }[scenario]()
+
+
+def _extractor(scenario: str, http, concurrency: int, base_url: str, parse_workers: int = 0):
+    if scenario in ('website', 'crawl'):
+        from extractors.website import WebsiteExtractor
+        return WebsiteExtractor(concurrency=concurrency, per_host_concurrency=concurrency,
+                                parse_workers=parse_workers, http=http)
+    if scenario == 'reddit':
+        from extractors.reddit import RedditExtractor
+        return RedditExtractor(api_base=base_url, http=http)
+    if scenario == 'substack':
+        from extractors.substack import SubstackExtractor
+        return SubstackExtractor(http=http)
+    from extractors.gdrive import GoogleDriveExtractor
+
+    class FixtureDriveExtractor(GoogleDriveExtractor):
+        # The fixture folder is a plain page of links rather than Drive's script data
+        def _find_pdf_links(self, soup):
+            return [(a['href'], a.get_text(strip=True)) for a in soup.find_all('a', href=True)]
+
+    return FixtureDriveExtractor(download_workers=concurrency, http=http)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_mb() -> float:
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run_scenario(scenario: str, sources: List[str], concurrency: int = 4,
+                 rate_limit: float = 0, max_retries: int = 3, parse_workers: int = 0) -> Dict[str, Any]:
+    """Run one scenario in this process and return its measurements."""
+    import logging
+
+    from utils.http import HttpClient
+    from utils.throttle import Throttle
+
+    # The extractors log every page at INFO, which would dominate the timings
+    logging_disabled = logging.root.manager.disable
+    logging.disable(logging.INFO)
+    http = HttpClient(throttle=Throttle(rate=rate_limit, max_concurrency=concurrency), max_retries=max_retries)
+    origin = urlparse(sources[0])
+    extractor = _extractor(scenario, http, concurrency, f'{origin.scheme}://{origin.netloc}', parse_workers)
+    gaps = []
+    cpu_start = _cpu_seconds()
+    start = last = time.perf_counter()
+    try:
+        if scenario == 'reddit':
+            # Permalinks are looked up in batches through the fixture's /api/info
+            runs = [(item for _, item in extractor.iter_extract_many(sources))]
+        else:
+            runs = (extractor.iter_extract(source) for source in sources)
+        for run in runs:
+            with closing(run) as items:
+                for _ in items:
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+    finally:
+        extractor.close()
+        http.close()
+        logging.disable(logging_disabled)
+    wall = time.perf_counter() - start
+    hosts = http.stats().values()
+    return {
+        'items': len(gaps),
+        'requests': sum(host['requests'] for host in hosts),
+        'retries': sum(host['retries'] for host in hosts),
+        'wall_seconds': round(wall, 3),
+        'items_per_sec': round(len(gaps) / wall, 2) if wall else 0.0,
+        'p50_ms': round(_percentile(gaps, 50) * 1000, 2),
+        'p95_ms': round(_percentile(gaps, 95) * 1000, 2),
+        'cpu_seconds': round(_cpu_seconds() - cpu_start, 3),
+        'http_seconds': round(sum(host['seconds'] for host in hosts), 3),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--posts', type=int, default=50, help='Blog posts (and Reddit comments) on the site')
+    parser.add_argument('--pdfs', type=int, default=3)
+    parser.add_argument('--pdf-pages', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra seconds per response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of responses replaced by 503')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help='Processes parsing web pages while more are fetched (website and crawl)')
+    parser.add_argument('--rate-limit', type=float, default=0, help='Requests/sec per host (0 = unlimited)')
+    parser.add_argument('--max-retries', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Write machine-readable results to this path')
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    site = FixtureSite(posts=args.posts, reddit_comments=args.posts, substack_posts=max(1, args.posts // 5),
+                       pdfs=args.pdfs, pdf_pages=args.pdf_pages, latency=args.latency, jitter=args.jitter,
+                       error_rate=args.error_rate, seed=args.seed)
+    results = {}
+    print(f"{'scenario':<10} {'items':>6} {'reqs':>6} {'items/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'cpu s':>7} {'rss MB':>7}")
+    with site:
+        for scenario in scenarios:
+            # A fresh interpreter per scenario keeps peak RSS and CPU time separate
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                result = pool.submit(run_scenario, scenario, _sources(site, scenario), args.concurrency,
+                                     args.rate_limit, args.max_retries, args.parse_workers).result()
+            results[scenario] = result
+            print(f"{scenario:<10} {result['items']:>6} {result['requests']:>6} {result['items_per_sec']:>9.1f} "
+                  f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['cpu_seconds']:>7.2f} "
+                  f"{result['peak_rss_mb']:>7.1f}")
+
+    if args.json:
+        options = {name: value for name, value in vars(args).items() if name != 'json'}
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'commit': _git_commit(), 'python': sys.version.split()[0], 'options': options,
+                       'injected_errors': site.injected_errors, 'scenarios': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Import-time cost of CLI startup, measured with ``python -X importtime``.
+
+    python benchmarks/bench_import.py [--runs 5] [--top 10] [--json results.json]
+
+Each scenario runs in a fresh interpreter. Totals are the median over runs;
+the top modules are the biggest cumulative imports from the last run.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'cli': 'import scrape',
+    'route-transcript': (
+        "from utils.router import ContentRouter; ContentRouter().get_extractor('notes.txt')"
+    ),
+    'route-website': (
+        "from utils.router import ContentRouter; ContentRouter().get_extractor('https://example.com/blog')"
+    ),
+}
+
+
+def measure(code: str):
+    """Return (total_us, [(cumulative_us, module), ...]) for one fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:   self_us |   cumulative_us | <indent>module"
+        _, cumulative_us, name = line.split(':', 1)[1].split('|')
+        depth = len(name) - len(name.lstrip())
+        modules.append((int(cumulative_us), name.strip(), depth))
+    # Top-level imports are the least indented entries
+    min_depth = min(depth for _, _, depth in modules)
+    total = sum(cumulative for cumulative, _, depth in modules if depth == min_depth)
+    return total, sorted(((c, n) for c, n, _ in modules), reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--json', help='Write machine-readable results to this path')
+    args = parser.parse_args()
+
+    results = {}
+    for scenario, code in SCENARIOS.items():
+        totals = []
+        top = []
+        for _ in range(args.runs):
+            total, top = measure(code)
+            totals.append(total)
+        median_ms = statistics.median(totals) / 1000
+        results[scenario] = {
+            'median_ms': round(median_ms, 2),
+            'runs_ms': [round(t / 1000, 2) for t in totals],
+            'top_modules': [{'module': name, 'cumulative_ms': round(c / 1000, 2)} for c, name in top[:args.top]],
+        }
+        print(f"{scenario:<18} {median_ms:8.1f} ms")
+        for c, name in top[:args.top]:
+            print(f"    {c / 1000:8.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'scenarios': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
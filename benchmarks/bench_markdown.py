@@ -0,0 +1,106 @@
+"""
+Plain-text to markdown throughput on large synthetic transcripts (pytest-benchmark).
+
+    python -m pytest benchmarks/bench_markdown.py [--benchmark-json results.json]
+
+``legacy_text_to_markdown`` is a copy of the converter before its patterns
+were precompiled: up to five ``re.match`` calls per line (CHAPTER twice),
+then a ``re.sub`` cleanup over the joined result. Each benchmark records
+lines/sec in ``extra_info``.
+"""
+import os
+import random
+import re
+import sys
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.markdown import stream_to_markdown, text_to_markdown  # noqa: E402
+
+LINE_COUNTS = [10_000, 100_000]
+
+SPEAKER_LINES = [
+    'Interviewer: Walk me through your approach.',
+    'Candidate: I would start with a hash map keyed by the prefix sum.',
+    'So the time complexity ends up being O(n log n) because of the sort.',
+    'Right, and what happens when the input is empty?',
+]
+STRUCTURE_LINES = ['CHAPTER 4 Heaps', 'Chapter 12', '3. Push every element onto the heap',
+                   'TIME COMPLEXITY', 'Edge cases:', 'KEY TAKEAWAYS']
+
+
+def make_transcript(lines: int, seed: int = 13) -> str:
+    """Mostly speaker turns, with roughly one structural line in ten."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(lines):
+        pool = STRUCTURE_LINES if rng.random() < 0.1 else SPEAKER_LINES
+        out.append(rng.choice(pool))
+        if rng.random() < 0.05:
+            out.append('')
+    return '\n'.join(out)
+
+
+def legacy_format_line(line: str) -> str:
+    if re.match(r'^CHAPTER\s+\d+', line, re.IGNORECASE):
+        chapter_match = re.match(r'^CHAPTER\s+(\d+)(.*)', line, re.IGNORECASE)
+        if chapter_match:
+            chapter_num = chapter_match.group(1)
+            chapter_title = chapter_match.group(2).strip()
+            if chapter_title:
+                return f"# Chapter {chapter_num}: {chapter_title}"
+            return f"# Chapter {chapter_num}"
+        return f"# {line}"
+    elif re.match(r'^\d+\.\s+', line):
+        return line
+    elif re.match(r'^[A-Z][A-Z\s]+$', line) and len(line) > 3:
+        return f"## {line.title()}"
+    elif line.endswith(':') and len(line) < 100:
+        return f"### {line}"
+    return line
+
+
+def legacy_text_to_markdown(text: str) -> str:
+    if not text:
+        return ""
+    lines = text.split('\n')
+    formatted_lines = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        formatted_lines.append(legacy_format_line(line))
+    result = '\n\n'.join(formatted_lines)
+    return re.sub(r'\n{3,}', '\n\n', result)
+
+
+def chunked(text: str, size: int = 4096):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def run(benchmark, fn, arg, lines: int):
+    result = benchmark(fn, arg)
+    benchmark.extra_info['lines'] = lines
+    benchmark.extra_info['lines_per_sec'] = round(lines / benchmark.stats.stats.mean)
+    return result
+
+
+@pytest.mark.parametrize('lines', LINE_COUNTS)
+def test_legacy(benchmark, lines):
+    run(benchmark, legacy_text_to_markdown, make_transcript(lines), lines)
+
+
+@pytest.mark.parametrize('lines', LINE_COUNTS)
+def test_text_to_markdown(benchmark, lines):
+    text = make_transcript(lines)
+    assert run(benchmark, text_to_markdown, text, lines) == legacy_text_to_markdown(text)
+
+
+@pytest.mark.parametrize('lines', LINE_COUNTS)
+def test_stream_to_markdown(benchmark, lines):
+    text = make_transcript(lines)
+    assert run(benchmark, stream_to_markdown, chunked(text), lines) == legacy_text_to_markdown(text)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Memory held by extracted items on their way to a ``--format json`` output.
+
+    python benchmarks/bench_memory.py [--items 200] [--content-kb 1024] [--records 100000] [--json results.json]
+
+Two measurements:
+
+- ``sink``: ``--items`` items of ``--content-kb`` each go through
+  prepare_item() into a JsonSink, once holding every content in memory
+  (``spill_threshold=0``) and once with large contents spilled to a temp
+  file (the default). Each runs in a fresh process; peak RSS is reported
+  above that process's baseline.
+- ``records``: bytes per item for ``--records`` small items, built as the
+  ``__slots__`` ContentItem vs the pydantic ItemSchema items used to be.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run_sink(items: int, content_kb: int, spill_threshold: int) -> Dict[str, Any]:
+    """Write ``items`` large items through a JsonSink in this process and measure it."""
+    from extractors.base import ContentItem
+    from utils.batch import prepare_item
+    from utils.sinks import JsonSink
+
+    baseline = _rss_mb()
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'output.json')
+        sink = JsonSink(path, 'bench', spill_threshold=spill_threshold)
+        line = 'All work and no play makes a large book. ' * 16 + '\n'
+        for i in range(items):
+            # A fresh string per item, as an extractor would produce
+            content = f'Chapter {i}\n' + line * (content_kb * 1024 // len(line))
+            item = ContentItem(title=f'Chapter {i}', content=content, content_type='book',
+                               source_url=f'https://example.com/book/{i}')
+            sink.write(prepare_item(item, None, 'bench'))
+            del content, item
+        sink.close()
+        size = os.path.getsize(path)
+    return {
+        'items': items,
+        'output_mb': round(size / (1024 * 1024), 1),
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'peak_rss_mb': round(_rss_mb() - baseline, 1),
+    }
+
+
+def record_bytes(records: int) -> Dict[str, float]:
+    """tracemalloc bytes per small item for each item representation."""
+    from extractors.base import ContentItem, ItemSchema
+
+    results = {}
+    for name, cls in (('slots', ContentItem), ('pydantic', ItemSchema)):
+        tracemalloc.start()
+        items = [cls(title='Post', content='Short body', content_type='blog', source_url='https://example.com',
+                     author='', user_id='') for _ in range(records)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del items
+        results[name] = round(size / records, 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--items', type=int, default=200)
+    parser.add_argument('--content-kb', type=int, default=1024, help='Size of each item content')
+    parser.add_argument('--records', type=int, default=100000, help='Small items for the per-item overhead')
+    parser.add_argument('--json', help='Write machine-readable results to this path')
+    args = parser.parse_args()
+
+    import config
+
+    results = {'sink': {}}
+    print(f"{'sink':<10} {'items':>6} {'out MB':>7} {'wall s':>7} {'peak RSS MB':>12}")
+    for name, threshold in (('memory', 0), ('spill', config.SPILL_CONTENT_CHARS)):
+        # A fresh interpreter per run keeps peak RSS separate
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            result = pool.submit(run_sink, args.items, args.content_kb, threshold).result()
+        results['sink'][name] = result
+        print(f"{name:<10} {result['items']:>6} {result['output_mb']:>7.1f} {result['wall_seconds']:>7.2f} "
+              f"{result['peak_rss_mb']:>12.1f}")
+
+    results['records'] = record_bytes(args.records)
+    records = results['records']
+    print(f"bytes/item: {records['slots']} (__slots__) vs {records['pydantic']} (pydantic)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'options': vars(args), **results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Per-page CPU cost of parsing an article: legacy multi-parse path vs ParsedDocument.
+
+    python benchmarks/bench_parse.py [--pages 200] [--paragraphs 60]
+
+The legacy path is a copy of what WebsiteExtractor did before pages were
+parsed once: decode ``resp.text``, build an html.parser soup, then serialize
+the main element and let markdownify parse it again.
+"""
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from utils.document import ParsedDocument  # noqa: E402
+from utils.markdown import html_to_markdown, soup_to_markdown  # noqa: E402
+
+
+def make_page(paragraphs: int) -> bytes:
+    body = ''.join(
+        f'<p>Paragraph {i} with <a href="/post/{i}">a link</a> and <b>some bold</b> text. '
+        + 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 4 + '</p>'
+        for i in range(paragraphs)
+    )
+    nav = ''.join(f'<li><a href="/blog/post-{i}">Post {i}</a></li>' for i in range(50))
+    return (
+        '<!doctype html><html><head><meta charset="utf-8"><title>Benchmark post</title></head>'
+        f'<body><nav><ul>{nav}</ul></nav><article><h1>Benchmark post</h1>'
+        f'<time>2024-01-01</time>{body}</article><footer>footer</footer></body></html>'
+    ).encode('utf-8')
+
+
+def make_response(raw: bytes) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = raw
+    resp.headers['Content-Type'] = 'text/html'
+    resp.url = 'https://example.com/blog/post'
+    return resp
+
+
+def legacy(resp: requests.Response) -> str:
+    soup = BeautifulSoup(resp.text, 'html.parser')
+    title_elem = soup.find(['h1', 'h2'])
+    title = title_elem.get_text(strip=True) if title_elem else ''
+    date_elem = soup.find('time')
+    date = date_elem.get_text(strip=True) if date_elem else ''
+    main = soup.find('main') or soup.find('article')
+    return f"{title}{date}{html_to_markdown(str(main))}"
+
+
+def parse_once(resp: requests.Response) -> str:
+    soup = ParsedDocument.from_response(resp).soup
+    title_elem = soup.find(['h1', 'h2'])
+    title = title_elem.get_text(strip=True) if title_elem else ''
+    date_elem = soup.find('time')
+    date = date_elem.get_text(strip=True) if date_elem else ''
+    main = soup.find('main') or soup.find('article')
+    return f"{title}{date}{soup_to_markdown(main)}"
+
+
+def bench(fn, resp: requests.Response, pages: int) -> float:
+    start = time.process_time()
+    for _ in range(pages):
+        # requests caches the decoded text per Response, so use a fresh one each time
+        fn(make_response(resp.content))
+    return (time.process_time() - start) / pages * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--paragraphs', type=int, default=60)
+    args = parser.parse_args()
+
+    resp = make_response(make_page(args.paragraphs))
+    legacy_ms = bench(legacy, resp, args.pages)
+    new_ms = bench(parse_once, resp, args.pages)
+    print(f"page size:     {len(resp.content) / 1024:.1f} KiB")
+    print(f"legacy:        {legacy_ms:.2f} ms CPU/page")
+    print(f"parse-once:    {new_ms:.2f} ms CPU/page")
+    print(f"saved:         {legacy_ms - new_ms:.2f} ms/page ({(1 - new_ms / legacy_ms) * 100:.0f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Cost of picking the main content block on a page without ``<main>``/``<article>``.
+
+    python benchmarks/bench_scoring.py [--pages 20] [--depth 40] [--paragraphs 60]
+
+The legacy path is what WebsiteExtractor did before utils/scoring.py: the
+``div`` with the longest ``get_text()``, which re-walks every nested div's
+subtree. The page nests its content ``--depth`` divs deep inside layout
+wrappers, as page builders do.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from utils.document import PARSER  # noqa: E402
+from utils.scoring import best_content_block  # noqa: E402
+
+
+def make_page(depth: int, paragraphs: int) -> str:
+    body = ''.join(
+        f'<p>Paragraph {i} with <a href="/post/{i}">a link</a> and <b>some bold</b> text. '
+        + 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 4 + '</p>'
+        for i in range(paragraphs)
+    )
+    nav = ''.join(f'<div class="item"><a href="/blog/post-{i}">Post {i}</a></div>' for i in range(50))
+    wrapped = '<div class="wrap">' * depth + f'<div class="content">{body}</div>' + '</div>' * depth
+    return f'<html><body><div class="nav">{nav}</div>{wrapped}<div class="footer">footer</div></body></html>'
+
+
+def legacy(soup: BeautifulSoup):
+    return max(soup.find_all('div'), key=lambda d: len(d.get_text()))
+
+
+def bench(fn, soup: BeautifulSoup, pages: int) -> float:
+    start = time.process_time()
+    for _ in range(pages):
+        fn(soup)
+    return (time.process_time() - start) / pages * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--depth', type=int, default=40)
+    parser.add_argument('--paragraphs', type=int, default=60)
+    args = parser.parse_args()
+
+    soup = BeautifulSoup(make_page(args.depth, args.paragraphs), PARSER)
+    legacy_ms = bench(legacy, soup, args.pages)
+    scored_ms = bench(best_content_block, soup, args.pages)
+    print(f"legacy picks:  div.{' '.join(legacy(soup)['class'])}")
+    print(f"scorer picks:  div.{' '.join(best_content_block(soup)['class'])}")
+    print(f"legacy:        {legacy_ms:.2f} ms CPU/page")
+    print(f"scored:        {scored_ms:.2f} ms CPU/page")
+    print(f"speedup:       {legacy_ms / scored_ms:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
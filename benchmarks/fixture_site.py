@@ -0,0 +1,225 @@
+"""
+A local stand-in for the sites we scrape, for offline end-to-end runs.
+
+``FixtureSite`` serves generated but realistically shaped content from a
+threaded ``http.server``:
+
+- ``/robots.txt`` and ``/sitemap.xml`` listing every blog post
+- ``/blog/<slug>`` article pages, also reachable from the paginated
+  ``/archive`` listing (``/archive/page/N``) for crawler runs
+- ``/api/info.json?id=t1_...`` resolving the Reddit comment permalinks
+  ``/r/interviews/comments/<post>/<slug>/<comment>``
+- ``/p/<slug>`` Substack-style posts
+- ``/drive/folder`` linking to ``/files/<name>.pdf`` text PDFs
+
+Every response can be delayed (``latency`` plus up to ``jitter`` seconds) and
+a share of them (``error_rate``) replaced by ``503`` with ``Retry-After: 0``.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import json
+import random
+import threading
+import time
+
+LOREM = (
+    'Interviewers look for a clear plan before any code is written. Start by restating the problem, '
+    'then walk through a brute force solution and its complexity before optimizing. '
+)
+PAGE_SIZE = 10
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def text_pdf(pages: List[List[str]]) -> bytes:
+    """A minimal PDF with one page per entry of ``pages`` (a list of text lines)."""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for lines in pages:
+        ops = ['BT', '/F1 11 Tf', '14 TL', '72 740 Td']
+        for line in lines:
+            ops.append(f'({_escape(line)}) Tj T*')
+        ops.append('ET')
+        stream = '\n'.join(ops).encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        content_id = len(objects)
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_id)
+        kids.append(b'%d 0 R' % len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [' + b' '.join(kids) + b'] /Count %d >>' % len(kids)
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def write_text_pdf(path, pages: List[List[str]]) -> str:
+    """Write text_pdf(pages) to ``path`` and return the path as a string."""
+    with open(path, 'wb') as f:
+        f.write(text_pdf(pages))
+    return str(path)
+
+
+def _article(title: str, paragraphs: int) -> str:
+    body = ''.join(f'<h2>Step {i + 1}</h2><p>{LOREM * 3}</p>' for i in range(paragraphs))
+    nav = ''.join(f'<li><a href="/blog/topic-{i}">Topic {i}</a></li>' for i in range(30))
+    return (
+        f'<!doctype html><html><head><meta charset="utf-8"><title>{title}</title></head>'
+        f'<body><nav><ul>{nav}</ul></nav><article><h1>{title}</h1><time>2024-01-01</time>'
+        f'{body}</article><footer>Footer links</footer></body></html>'
+    )
+
+
+class FixtureSite:
+    """Serves the fixture content on an ephemeral localhost port; use as a context manager."""
+
+    def __init__(self, posts: int = 50, reddit_comments: int = 20, substack_posts: int = 10,
+                 pdfs: int = 3, pdf_pages: int = 20, paragraphs: int = 12,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.injected_errors = 0
+        self.pages: Dict[str, Tuple[str, bytes]] = {}
+        self.comments: Dict[str, dict] = {}
+        self._posts = [f'interview-lesson-{n}' for n in range(posts)]
+        self._build(reddit_comments, substack_posts, pdfs, pdf_pages, paragraphs)
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self.url = ''
+
+    def _add(self, path: str, body, content_type: str = 'text/html; charset=utf-8'):
+        self.pages[path] = (content_type, body.encode('utf-8') if isinstance(body, str) else body)
+
+    def _build(self, reddit_comments: int, substack_posts: int, pdfs: int, pdf_pages: int, paragraphs: int):
+        for n, slug in enumerate(self._posts):
+            page = _article(f'Interview lesson number {n}', paragraphs)
+            self._add(f'/blog/{slug}', page)
+            self._add(f'/archive/{slug}', page)
+        for page in range(0, max(1, len(self._posts)), PAGE_SIZE):
+            number = page // PAGE_SIZE + 1
+            links = ''.join(f'<li><a href="/archive/{slug}">{slug}</a></li>'
+                            for slug in self._posts[page:page + PAGE_SIZE])
+            older = (f'<a href="/archive/page/{number + 1}">Older posts</a>'
+                     if page + PAGE_SIZE < len(self._posts) else '')
+            path = '/archive' if number == 1 else f'/archive/page/{number}'
+            self._add(path, f'<html><head><title>Archive</title></head><body><ul>{links}</ul>{older}</body></html>')
+
+        self._add('/robots.txt', 'User-agent: *\nSitemap: /sitemap.xml\n', 'text/plain')
+
+        for n in range(reddit_comments):
+            self.comments[f't1_c{n}'] = {
+                'name': f't1_c{n}', 'author': f'user{n}', 'author_fullname': f't2_{n}',
+                'permalink': f'/r/interviews/comments/abc{n}/thread/c{n}/',
+                'body_html': f'<div class="md"><p>Comment {n}: {LOREM}</p><ul><li>Point one</li></ul></div>',
+            }
+
+        for n in range(substack_posts):
+            self._add(f'/p/newsletter-issue-{n}', _article(f'Newsletter issue {n}', paragraphs))
+
+        for n in range(pdfs):
+            pages = [[f'CHAPTER {p + 1}' if p % 5 == 0 else f'Section {p}', LOREM[:90], LOREM[90:170],
+                      'KEY TAKEAWAYS', 'Summary:'] for p in range(pdf_pages)]
+            self._add(f'/files/book-{n}.pdf', text_pdf(pages), 'application/pdf')
+
+    # Source URLs for each scenario
+    @property
+    def blog_url(self) -> str:
+        return f'{self.url}/blog'
+
+    @property
+    def archive_url(self) -> str:
+        return f'{self.url}/archive'
+
+    @property
+    def drive_folder_url(self) -> str:
+        return f'{self.url}/drive/folder'
+
+    def reddit_urls(self) -> List[str]:
+        return [f"{self.url}{comment['permalink']}" for comment in self.comments.values()]
+
+    def substack_urls(self) -> List[str]:
+        return [f'{self.url}{path}' for path in self.pages if path.startswith('/p/')]
+
+    def _info(self, path: str) -> Tuple[str, bytes]:
+        """Reddit's /api/info: a Listing of the requested things that exist."""
+        ids = parse_qs(urlparse(path).query).get('id', [''])[0].split(',')
+        children = [{'kind': 't1', 'data': self.comments[thing]} for thing in ids if thing in self.comments]
+        return 'application/json', json.dumps({'kind': 'Listing', 'data': {'children': children}}).encode()
+
+    def _respond(self, handler: BaseHTTPRequestHandler):
+        with self._lock:
+            self.requests += 1
+            fail = self._random.random() < self.error_rate
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            if fail:
+                self.injected_errors += 1
+        if delay:
+            time.sleep(delay)
+        path = handler.path.split('#')[0]
+        page = self._info(path) if path.startswith('/api/info.json') else self.pages.get(path)
+        if fail:
+            status, content_type, body, headers = 503, 'text/plain', b'busy', {'Retry-After': '0'}
+        elif page is None:
+            status, content_type, body, headers = 404, 'text/plain', b'not found', {}
+        else:
+            status, (content_type, body), headers = 200, page, {}
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self) -> 'FixtureSite':
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                site._respond(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = 'http://127.0.0.1:%d' % self._httpd.server_address[1]
+        # Sitemaps and the Drive folder hold absolute URLs, so they wait for the port
+        urls = ''.join(f'<url><loc>{self.url}/blog/{slug}</loc><lastmod>2024-01-01</lastmod></url>'
+                       for slug in self._posts)
+        self._add('/sitemap.xml', f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/'
+                                  f'sitemap/0.9">{urls}</urlset>', 'application/xml')
+        links = ''.join(f'<a href="{self.url}{path}">{path.rsplit("/", 1)[-1]}</a>'
+                        for path in self.pages if path.startswith('/files/'))
+        self._add('/drive/folder', f'<html><body>{links}</body></html>')
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> 'FixtureSite':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
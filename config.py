@@ -0,0 +1,106 @@
+"""Centralized scraper configuration: HTTP defaults, browser options, etc."""
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+# Seconds before a regular page fetch gives up
+REQUEST_TIMEOUT = 15
+# Seconds before a file download (PDFs etc.) gives up
+DOWNLOAD_TIMEOUT = 30
+
+# Downloads are streamed in chunks of this many bytes
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Downloaded PDFs up to this size stay in memory; larger ones spill to a temp file
+PDF_MEMORY_THRESHOLD = 16 * 1024 * 1024
+# Streamed downloads are stored in the response cache only when they declare a
+# Content-Length up to this size; larger or unsized ones pass through uncached
+CACHE_MAX_STREAM_BYTES = PDF_MEMORY_THRESHOLD
+
+# Per-host pacing (utils/throttle.py): sustained requests per second and
+# burst size (RATE_LIMIT_PER_HOST = 0 disables the rate cap), and the range
+# the adaptive in-flight limit moves in. Both back off on 429/503 and
+# recover on success.
+RATE_LIMIT_PER_HOST = 5.0
+RATE_LIMIT_BURST = 5
+HOST_MIN_CONCURRENCY = 1
+HOST_MAX_CONCURRENCY = 8
+
+# Retries for connection errors and these statuses, with exponential
+# backoff and full jitter (seconds), honouring Retry-After up to RETRY_AFTER_MAX
+MAX_RETRIES = 3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+THROTTLE_STATUSES = (429, 503)
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 30
+RETRY_AFTER_MAX = 120
+
+# Number of per-host connection pools kept alive, and connections per pool.
+# POOL_MAXSIZE should be at least the per-host concurrency or requests will
+# open throwaway connections.
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 16
+
+# Most sitemaps and feeds (indexes included) fetched while discovering one source's articles
+SITEMAP_MAX_DOCUMENTS = 50
+
+# Listing pages (blog index, categories, pagination) crawled per source, and
+# how many links deep below the source the crawl may go
+CRAWL_MAX_PAGES = 50
+CRAWL_MAX_DEPTH = 2
+# Minimum seconds between listing fetches from one host; robots.txt
+# Crawl-delay raises it
+CRAWL_DELAY = 0
+# URLs containing any of these are never crawled
+CRAWL_DENY_PATTERNS = [
+    '/login', '/signin', '/signup', '/register', '/search', '/cart', '/wp-admin',
+    '/feed', '.xml', '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.zip',
+]
+# Per-domain overrides for which listings may be crawled, e.g.
+#   {'nilmamano.com': {'allow': ['/blog/'], 'deny': ['/blog/category/personal']}}
+# Without one, only listings below the source URL's path are crawled.
+CRAWL_SCOPE_RULES = {}
+
+# Processes that parse fetched pages and convert them to markdown while more
+# pages are fetched; 0 does that work on the fetch threads
+PARSE_WORKERS = 0
+
+# Query parameters that only track where a visitor came from; URLs differing
+# only in these are treated as the same page
+TRACKING_PARAM_PREFIXES = ('utm_',)
+TRACKING_PARAMS = frozenset({
+    'ref', 'ref_src', 'ref_url', 'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid',
+    'mc_cid', 'mc_eid', 'igshid', '_hsenc', '_hsmi', 'mkt_tok',
+})
+
+# Reddit API root (point it at a mirror or a test server), and how many IDs
+# go into one /api/info or /api/morechildren call (100 is the API maximum)
+REDDIT_API_BASE = 'https://www.reddit.com'
+REDDIT_BATCH_SIZE = 100
+# Reddit sources in a --sources-file are looked up together in groups of this size
+REDDIT_BULK_SOURCES = 1000
+
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Chrome flags used for the Selenium fallback
+SELENIUM_ARGUMENTS = [
+    '--headless',  # Run headless for production
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--window-size=1920,1080',
+    f'--user-agent={USER_AGENT}',
+]
+# Ceiling in seconds for any single browser readiness wait
+BROWSER_WAIT_TIMEOUT = 10
+# A page counts as network-idle once no new resources load for this long
+BROWSER_NETWORK_IDLE = 0.5
+
+# With --format json, item contents at least this many characters long wait
+# in a temp file instead of memory until the output is written; 0 disables
+SPILL_CONTENT_CHARS = 256 * 1024
@@ -1,8 +1,49 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import Any, Iterator, List, Dict, Optional, TYPE_CHECKING
 from pydantic import BaseModel
 
-class ContentItem(BaseModel):
+from utils.manifest import Manifest
+from utils.urls import UrlIndex
+
+if TYPE_CHECKING:
+    from utils.http import HttpClient
+
+class ContentItem:
+    """
+    One extracted article, chapter, comment or page.
+
+    A plain ``__slots__`` record, cheap to build and small to hold for the
+    many items a large run produces. Nothing is checked on construction;
+    items are validated against ItemSchema once, on their way to the output
+    (see validate_item()).
+    """
+
+    __slots__ = ('title', 'content', 'content_type', 'source_url', 'author', 'user_id')
+
+    def __init__(self, title: str, content: str, content_type: str, source_url: Optional[str] = None,
+                 author: Optional[str] = None, user_id: Optional[str] = None):
+        self.title = title
+        self.content = content
+        self.content_type = content_type
+        self.source_url = source_url
+        self.author = author
+        self.user_id = user_id
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The item as an output record; the dict shares its strings with the item."""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ContentItem):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (f"ContentItem(title={self.title!r}, content_type={self.content_type!r}, "
+                f"source_url={self.source_url!r})")
+
+class ItemSchema(BaseModel):
+    """The shape every output item must have."""
     title: str
     content: str
     content_type: str
@@ -10,10 +51,66 @@ class ContentItem(BaseModel):
     author: Optional[str] = None
     user_id: Optional[str] = None
 
+def validate_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check an output record against ItemSchema and return it unchanged.
+
+    Raises pydantic.ValidationError. Validation doesn't copy the strings, so
+    a multi-MB ``content`` still exists only once.
+    """
+    ItemSchema.model_validate(item)
+    return item
+
 class ContentExtractor(ABC):
     """Base class for all content extractors."""
+
+    def __init__(self, http: Optional['HttpClient'] = None, manifest: Optional[Manifest] = None,
+                 urls: Optional[UrlIndex] = None):
+        self._http = http
+        # Set for incremental runs; see _is_unchanged/_remember
+        self.manifest = manifest
+        # Pages already fetched this run; the router shares one across extractors
+        self.urls = urls if urls is not None else UrlIndex()
+
+    @property
+    def http(self) -> 'HttpClient':
+        """Shared HTTP client; created on first use if none was injected."""
+        if self._http is None:
+            from utils.http import HttpClient
+            self._http = HttpClient()
+        return self._http
+
+    def _fingerprint(self, raw: bytes) -> Optional[str]:
+        """Content hash of ``raw``, or None when not running incrementally."""
+        if self.manifest is None:
+            return None
+        return Manifest.content_hash(raw)
+
+    def _fingerprint_file(self, path: str) -> Optional[str]:
+        """Like _fingerprint, for a file on disk."""
+        if self.manifest is None:
+            return None
+        return Manifest.file_hash(path)
+
+    def _is_unchanged(self, key: str, digest: Optional[str]) -> bool:
+        """True when ``key`` was extracted before from identical content."""
+        return digest is not None and self.manifest.is_unchanged(key, digest)
+
+    def _is_current(self, key: str, lastmod: Optional[str]) -> bool:
+        """True when ``key`` was extracted before at the same reported modification date."""
+        return lastmod is not None and self.manifest is not None and self.manifest.is_current(key, lastmod)
+
+    def _remember(self, key: str, digest: Optional[str], lastmod: Optional[str] = None):
+        """Record in the incremental manifest that ``key`` was extracted from this content."""
+        if digest is not None:
+            self.manifest.record(key, digest, lastmod)
     
-    @abstractmethod
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # extract() and iter_extract() default to each other
+        if cls.extract is ContentExtractor.extract and cls.iter_extract is ContentExtractor.iter_extract:
+            raise TypeError(f"{cls.__name__} must implement extract() or iter_extract()")
+
     def extract(self, source: str) -> List[ContentItem]:
         """
         Extract content from the given source.
@@ -24,8 +121,24 @@ class ContentExtractor(ABC):
         Returns:
             List of ContentItem objects containing the extracted content
         """
-        pass
+        return list(self.iter_extract(source))
+
+    def iter_extract(self, source: str) -> Iterator[ContentItem]:
+        """
+        Yield content from the given source as it is extracted.
+
+        Extractors that can produce items one at a time override this so
+        callers needing only the first few items don't pay for the rest;
+        the default just runs extract(). Callers that stop early should
+        close the iterator (e.g. with ``contextlib.closing``) so pending work
+        is cancelled.
+        """
+        yield from self.extract(source)
     
+    def close(self):
+        """Release resources held across extract() calls (browsers, pools)."""
+        pass
+
     @abstractmethod
     def can_handle(self, source: str) -> bool:
         """
@@ -1,28 +1,44 @@
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import closing
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+import hashlib
+import io
 import os
 import re
-import requests
 import logging
-from bs4 import BeautifulSoup
+import tempfile
+from urllib.parse import urlparse
 from extractors.base import ContentExtractor, ContentItem
+from utils.sources import is_gdrive_folder
 from extractors.pdf import PDFExtractor
+from utils.document import ParsedDocument
+from utils.metrics import metrics
+
+import config
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 class GoogleDriveExtractor(ContentExtractor):
+    def __init__(self, pdf_workers: int = 1, pdf_split_chapters: bool = False, download_workers: int = 4,
+                 memory_threshold: int = config.PDF_MEMORY_THRESHOLD, **kwargs):
+        super().__init__(**kwargs)
+        self.pdf_workers = pdf_workers
+        self.pdf_split_chapters = pdf_split_chapters
+        self.download_workers = max(1, download_workers)
+        self.memory_threshold = memory_threshold
+
     def can_handle(self, source: str) -> bool:
-        return 'drive.google.com/drive/folders/' in source
+        return is_gdrive_folder(source)
 
-    def extract(self, source: str) -> List[ContentItem]:
+    def iter_extract(self, source: str) -> Iterator[ContentItem]:
         logger.info(f"Starting Google Drive extraction for: {source}")
         # Scrape the folder page for PDF links
-        resp = requests.get(source, timeout=15)
+        resp = self.http.get(source)
         resp.raise_for_status()
-        html_content = resp.text
-        logger.info(f"Retrieved HTML content, length: {len(html_content)}")
+        logger.info(f"Retrieved HTML content, length: {len(resp.content)}")
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = ParsedDocument.from_response(resp).soup
         pdf_links = self._find_pdf_links(soup)
         logger.info(f"Found {len(pdf_links)} PDF links")
         
@@ -36,22 +52,78 @@ class GoogleDriveExtractor(ContentExtractor):
         
         logger.info(f"After deduplication: {len(unique_pdf_links)} unique PDF links")
         
-        items = []
-        for pdf_url, pdf_name in unique_pdf_links:
+        pdf_extractor = PDFExtractor(workers=self.pdf_workers, split_chapters=self.pdf_split_chapters)
+        # Downloads finish out of order; hold finished PDFs until every earlier
+        # one is out, so items keep the folder's listing order
+        ready = {}
+        next_index = 0
+        count = 0
+        with closing(self._iter_downloads(unique_pdf_links)) as downloads:
+            for index, future in downloads:
+                ready[index] = self._extract_download(pdf_extractor, future, *unique_pdf_links[index])
+                while next_index in ready:
+                    for item in ready.pop(next_index):
+                        count += 1
+                        yield item
+                    next_index += 1
+        logger.info(f"Google Drive extraction completed. Total items: {count}")
+
+    def _extract_download(self, pdf_extractor: PDFExtractor, future: Future,
+                          pdf_url: str, pdf_name: str) -> List[ContentItem]:
+        """Items from one finished download; empty if it failed or is unchanged."""
+        try:
+            pdf, digest = future.result()
+        except Exception as e:
+            logger.error(f"Error downloading PDF {pdf_name}: {e}")
+            return []
+        try:
+            if self._is_unchanged(pdf_url, digest):
+                logger.info(f"Unchanged since last run, skipping: {pdf_name}")
+                return []
+            logger.info(f"Processing PDF: {pdf_name} from {pdf_url}")
+            pdf_items = pdf_extractor.extract_pdf(pdf, pdf_name.replace('.pdf', ''))
+            for item in pdf_items:
+                item.source_url = pdf_url
+            self._remember(pdf_url, digest)
+            logger.info(f"Successfully processed PDF: {pdf_name}")
+            return pdf_items
+        except Exception as e:
+            logger.error(f"Error processing PDF {pdf_name}: {e}")
+            return []
+        finally:
+            if isinstance(pdf, str):
+                os.remove(pdf)
+
+    def _iter_downloads(self, links: List[Tuple[str, str]]) -> Iterator[Tuple[int, Future]]:
+        """
+        Download PDFs concurrently, yielding ``(index, future)`` as each finishes.
+
+        The caller extracts each PDF while later downloads carry on. At most
+        ``2 * download_workers`` PDFs are downloaded but not yet consumed, so
+        memory and temp-file use stay bounded on large folders.
+        """
+        window = self.download_workers * 2
+        with ThreadPoolExecutor(max_workers=self.download_workers) as pool:
+            pending = {}
+            next_index = 0
             try:
-                logger.info(f"Processing PDF: {pdf_name} from {pdf_url}")
-                local_path = self._download_pdf(pdf_url, pdf_name)
-                pdf_items = PDFExtractor().extract(local_path)
-                for item in pdf_items:
-                    item.source_url = pdf_url
-                items.extend(pdf_items)
-                os.remove(local_path)
-                logger.info(f"Successfully processed PDF: {pdf_name}")
-            except Exception as e:
-                logger.error(f"Error processing PDF {pdf_name}: {e}")
-                continue
-        logger.info(f"Google Drive extraction completed. Total items: {len(items)}")
-        return items
+                while pending or next_index < len(links):
+                    while next_index < len(links) and len(pending) < window:
+                        future = pool.submit(self._download_pdf, links[next_index][0])
+                        pending[future] = next_index
+                        next_index += 1
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future
+            finally:
+                # Closed early: drop queued downloads and the temp files of finished ones
+                for future in pending:
+                    future.cancel()
+                for future in wait(pending).done:
+                    if not future.cancelled() and future.exception() is None:
+                        pdf, _ = future.result()
+                        if isinstance(pdf, str):
+                            os.remove(pdf)
 
     def _find_pdf_links(self, soup):
         # Google Drive folder page: look for JavaScript data structures containing file info
@@ -100,10 +172,42 @@ class GoogleDriveExtractor(ContentExtractor):
         logger.info(f"Total PDF links found: {len(links)}")
         return links
 
-    def _download_pdf(self, url, name):
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        local_path = f'_gdrive_{name.replace(" ", "_")}'
-        with open(local_path, 'wb') as f:
-            f.write(resp.content)
-        return local_path 
\ No newline at end of file
+    def _download_pdf(self, url: str) -> Tuple[Union[str, BinaryIO], Optional[str]]:
+        """
+        Stream a PDF download in chunks.
+
+        Returns an in-memory buffer while the file is below
+        ``memory_threshold`` bytes, otherwise the path of a uniquely named temp
+        file (which the caller removes), plus the manifest content hash when
+        running incrementally.
+        """
+        digest = hashlib.sha256() if self.manifest is not None else None
+        buffer = io.BytesIO()
+        spill = None
+        size = 0
+        try:
+            with metrics.timer('pdf_download'), \
+                    self.http.get(url, stream=True, timeout=config.DOWNLOAD_TIMEOUT) as resp:
+                resp.raise_for_status()
+                for chunk in resp.iter_content(chunk_size=config.DOWNLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+                    if spill is None and buffer.tell() + len(chunk) > self.memory_threshold:
+                        spill = tempfile.NamedTemporaryFile(prefix='_gdrive_', suffix='.pdf', delete=False)
+                        spill.write(buffer.getvalue())
+                        buffer = None
+                    (spill or buffer).write(chunk)
+        except Exception:
+            if spill is not None:
+                spill.close()
+                os.remove(spill.name)
+            raise
+        finally:
+            metrics.count('http_bytes_total', size, host=urlparse(url).netloc.lower())
+        hexdigest = digest.hexdigest() if digest is not None else None
+        if spill is not None:
+            spill.close()
+            return spill.name, hexdigest
+        buffer.seek(0)
+        return buffer, hexdigest
@@ -12,13 +12,18 @@ class GenericExtractor(ContentExtractor):
         if os.path.isfile(source):
             with open(source, 'r', encoding='utf-8') as f:
                 text = f.read()
+            digest = self._fingerprint(text.encode('utf-8'))
+            if self._is_unchanged(source, digest):
+                return []
             markdown = text_to_markdown(text)
-            return [ContentItem(
+            item = ContentItem(
                 title=os.path.basename(source),
                 content=markdown,
                 content_type='other',
                 source_url=None,
                 author='',
                 user_id=''
-            )]
+            )
+            self._remember(source, digest)
+            return [item]
         return [] 
\ No newline at end of file
@@ -1,29 +1,36 @@
 from typing import List
-import requests
-from bs4 import BeautifulSoup
 from extractors.base import ContentExtractor, ContentItem
-from utils.markdown import html_to_markdown
+from utils.sources import is_linkedin
+from utils.document import ParsedDocument
+from utils.markdown import soup_to_markdown
 
 class LinkedInExtractor(ContentExtractor):
     def can_handle(self, source: str) -> bool:
-        return 'linkedin.com' in source
+        return is_linkedin(source)
 
     def extract(self, source: str) -> List[ContentItem]:
-        resp = requests.get(source, timeout=10)
+        if not self.urls.claim(source):
+            return []
+        resp = self.http.get(source)
         resp.raise_for_status()
-        html = resp.text
-        soup = BeautifulSoup(html, 'html.parser')
+        digest = self._fingerprint(resp.content)
+        if self._is_unchanged(source, digest):
+            return []
+        doc = ParsedDocument.from_response(resp)
+        soup = doc.soup
         # Heuristic: find main post content
         post_div = soup.find('div', {'class': 'break-words'})
         if not post_div:
             return []
-        markdown = html_to_markdown(str(post_div))
-        title = soup.title.string.strip() if soup.title else source
-        return [ContentItem(
+        markdown = soup_to_markdown(post_div)
+        title = doc.title or source
+        item = ContentItem(
             title=title,
             content=markdown,
             content_type='linkedin_post',
             source_url=source,
             author='',
             user_id=''
-        )] 
\ No newline at end of file
+        )
+        self._remember(source, digest)
+        return [item] 
\ No newline at end of file
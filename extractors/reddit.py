@@ -1,36 +1,215 @@
-from typing import List
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+import re
+
 import requests
+
 from extractors.base import ContentExtractor, ContentItem
+from utils.sources import is_reddit
 from utils.markdown import html_to_markdown
-import re
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# /r/<sub>/comments/<post id>/<slug>/<comment id>; the slug and comment are optional
+PERMALINK = re.compile(r'/comments/(?P<post>[a-z0-9]+)(?:/[^/?#]*(?:/(?P<comment>[a-z0-9]+))?)?',
+                       re.IGNORECASE)
+
+
+def thing_id(url: str) -> Optional[str]:
+    """Reddit fullname a permalink points at: ``t1_<id>`` for a comment, ``t3_<id>`` for a post."""
+    match = PERMALINK.search(url)
+    if not match:
+        return None
+    if match.group('comment'):
+        return f"t1_{match.group('comment').lower()}"
+    return f"t3_{match.group('post').lower()}"
+
+
+def _thread_comments(data: Any) -> Any:
+    """The comments Listing of a thread response, which is ``[post, comments]``."""
+    return data[1] if isinstance(data, list) and len(data) > 1 else None
+
+
+def _listing_children(listing: Any) -> List[Dict[str, Any]]:
+    """Children of a Listing object; ``replies`` is an empty string when there are none."""
+    if not isinstance(listing, dict):
+        return []
+    return listing.get('data', {}).get('children', [])
+
 
 class RedditExtractor(ContentExtractor):
+    """
+    Reddit comments, looked up in bulk.
+
+    Comment permalinks are resolved through ``/api/info`` in batches of up to
+    ``config.REDDIT_BATCH_SIZE`` IDs, so many URLs cost a handful of requests.
+    With ``comment_trees``, post URLs yield every comment in the thread
+    (optionally only those by ``authors``), expanding "load more" stubs with
+    ``/api/morechildren``. Other URLs fall back to one ``.json`` request each.
+    """
+
+    def __init__(self, api_base: str = config.REDDIT_API_BASE, comment_trees: bool = False,
+                 authors: Optional[Iterable[str]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.api_base = api_base.rstrip('/')
+        self.comment_trees = comment_trees
+        self.authors = {author.lower() for author in authors or ()}
+
     def can_handle(self, source: str) -> bool:
-        return 'reddit.com' in source
+        return is_reddit(source)
+
+    def iter_extract(self, source: str) -> Iterator[ContentItem]:
+        for _, item in self.iter_extract_many([source]):
+            yield item
+
+    def iter_extract_many(self, sources: Iterable[str]) -> Iterator[Tuple[str, ContentItem]]:
+        """Yield ``(source, item)`` for many Reddit URLs, in input order."""
+        batch: List[Tuple[str, str]] = []
+        for source in sources:
+            if not self.urls.claim(source):
+                continue
+            thing = thing_id(source)
+            if thing and thing.startswith('t1_'):
+                batch.append((source, thing))
+                if len(batch) >= config.REDDIT_BATCH_SIZE:
+                    yield from self._lookup(batch)
+                    batch = []
+                continue
+            # Keep input order: comments queued so far come out first
+            if batch:
+                yield from self._lookup(batch)
+                batch = []
+            if thing and self.comment_trees:
+                for item in self._iter_thread(source, thing[3:]):
+                    yield source, item
+            else:
+                for item in self._extract_permalink(source):
+                    yield source, item
+        if batch:
+            yield from self._lookup(batch)
+
+    def _get_json(self, url: str, **params) -> Any:
+        resp = self.http.get(url, params=dict(params, raw_json=1))
+        resp.raise_for_status()
+        return resp.json()
+
+    def _lookup(self, batch: List[Tuple[str, str]]) -> Iterator[Tuple[str, ContentItem]]:
+        """Resolve a batch of comment fullnames with one /api/info call."""
+        try:
+            data = self._get_json(f'{self.api_base}/api/info.json', id=','.join(thing for _, thing in batch))
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Could not look up {len(batch)} Reddit comments: {e}")
+            return
+        found = {child['data'].get('name'): child['data'] for child in _listing_children(data)
+                 if child.get('kind') == 't1'}
+        for source, thing in batch:
+            comment = found.get(thing)
+            if comment is None:
+                logger.info(f"Reddit comment not found (deleted or private?): {source}")
+                continue
+            item = self._comment_item(comment, source)
+            if item is not None:
+                yield source, item
+
+    def _iter_thread(self, source: str, post_id: str) -> Iterator[ContentItem]:
+        """
+        Every comment in a post's thread, depth first.
 
-    def extract(self, source: str) -> List[ContentItem]:
-        # Try to get comment via Reddit JSON API
+        The walk keeps an explicit stack instead of recursing, so deep threads
+        can't hit the recursion limit. "load more" stubs are collected and
+        expanded in batches through /api/morechildren; "continue this thread"
+        stubs (no child IDs) are fetched as the subtree of their parent.
+        """
+        try:
+            data = self._get_json(f'{self.api_base}/comments/{post_id}.json', limit=500)
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Could not fetch Reddit thread {source}: {e}")
+            return
+        link_id = f't3_{post_id}'
+        stack = list(reversed(_listing_children(_thread_comments(data))))
+        more: deque = deque()
+        continued: deque = deque()
+        seen = set()
+        # "continue this thread" parents already queued; the API can repeat a stub
+        seen_parents = set()
+        count = 0
+        while stack or more or continued:
+            if not stack:
+                stack = self._expand(link_id, more, continued, post_id)
+                continue
+            child = stack.pop()
+            kind, node = child.get('kind'), child.get('data', {})
+            if kind == 'more':
+                if node.get('children'):
+                    more.extend(c for c in node['children'] if c not in seen)
+                elif node.get('parent_id', '').startswith('t1_') and node['parent_id'] not in seen_parents:
+                    seen_parents.add(node['parent_id'])
+                    continued.append(node['parent_id'][3:])
+                continue
+            if kind != 't1' or node.get('name') in seen:
+                continue
+            seen.add(node.get('name'))
+            seen.add(node.get('id'))
+            stack.extend(reversed(_listing_children(node.get('replies'))))
+            if self.authors and (node.get('author') or '').lower() not in self.authors:
+                continue
+            permalink = f"{self.api_base}{node['permalink']}" if node.get('permalink') else source
+            item = self._comment_item(node, permalink)
+            if item is not None:
+                count += 1
+                yield item
+        logger.info(f"Extracted {count} comments from Reddit thread {source}")
+
+    def _expand(self, link_id: str, more: deque, continued: deque, post_id: str) -> List[Dict[str, Any]]:
+        """Fetch the next batch of hidden comments; returns them as a new stack."""
+        try:
+            if more:
+                ids = [more.popleft() for _ in range(min(len(more), config.REDDIT_BATCH_SIZE))]
+                data = self._get_json(f'{self.api_base}/api/morechildren.json', api_type='json',
+                                      link_id=link_id, children=','.join(ids))
+                things = data.get('json', {}).get('data', {}).get('things', [])
+            else:
+                parent = continued.popleft()
+                data = self._get_json(f'{self.api_base}/comments/{post_id}/_/{parent}.json')
+                # The subtree's root is the parent comment, which was already emitted
+                roots = _listing_children(_thread_comments(data))
+                things = [reply for root in roots for reply in _listing_children(root.get('data', {}).get('replies'))]
+        except (requests.RequestException, ValueError, IndexError, AttributeError) as e:
+            logger.warning(f"Could not expand more comments in {link_id}: {e}")
+            return []
+        return list(reversed(things))
+
+    def _extract_permalink(self, source: str) -> List[ContentItem]:
+        """One ``.json`` request for a URL whose comment can't be looked up by ID."""
         api_url = self._to_json_url(source)
         try:
-            resp = requests.get(api_url, headers={'User-agent': 'Mozilla/5.0'})
+            resp = self.http.get(api_url)
             resp.raise_for_status()
-            data = resp.json()
-            comment = self._extract_comment(data)
+            comment = self._extract_comment(resp.json())
             if comment:
-                markdown = html_to_markdown(comment['body_html'])
-                return [ContentItem(
-                    title=f"Reddit comment by {comment.get('author', '')}",
-                    content=markdown,
-                    content_type='reddit_comment',
-                    source_url=source,
-                    author=comment.get('author', ''),
-                    user_id=comment.get('author_fullname', '')
-                )]
-        except Exception:
-            pass
-        # Fallback: scrape HTML
+                item = self._comment_item(comment, source)
+                return [item] if item is not None else []
+        except (requests.RequestException, ValueError, KeyError) as e:
+            # Transient failures were already retried by the HTTP client
+            logger.warning(f"Could not fetch Reddit comment {source}: {e}")
         return []
 
+    def _comment_item(self, comment: Dict[str, Any], source_url: str) -> Optional[ContentItem]:
+        if not comment.get('body_html'):
+            return None
+        author = comment.get('author', '')
+        return ContentItem(
+            title=f"Reddit comment by {author}",
+            content=html_to_markdown(comment['body_html']),
+            content_type='reddit_comment',
+            source_url=source_url,
+            author=author,
+            user_id=comment.get('author_fullname', '')
+        )
+
     def _to_json_url(self, url: str) -> str:
         if not url.endswith('.json'):
             if url.endswith('/'): url = url[:-1]
@@ -45,4 +224,4 @@ class RedditExtractor(ContentExtractor):
                 return comments[0]['data']
         except Exception:
             return None
-        return None 
\ No newline at end of file
+        return None
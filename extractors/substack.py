@@ -1,30 +1,33 @@
 from typing import List
-import requests
-from trafilatura import extract as trafilatura_extract
 from extractors.base import ContentExtractor, ContentItem
-from utils.markdown import html_to_markdown
+from utils.sources import is_substack
+from utils.markdown import extract_main_markdown
+from utils.document import extract_title_tag
 
 class SubstackExtractor(ContentExtractor):
     def can_handle(self, source: str) -> bool:
-        return 'substack.com' in source
+        return is_substack(source)
 
     def extract(self, source: str) -> List[ContentItem]:
-        resp = requests.get(source, timeout=10)
+        if not self.urls.claim(source):
+            return []
+        resp = self.http.get(source)
         resp.raise_for_status()
-        html = resp.text
-        main_content = trafilatura_extract(html, include_comments=False, include_tables=True)
-        if not main_content:
+        digest = self._fingerprint(resp.content)
+        if self._is_unchanged(source, digest):
+            return []
+        markdown = extract_main_markdown(resp.content, url=source)
+        if not markdown:
             return []
-        markdown = html_to_markdown(main_content)
-        # Try to extract title
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.title.string.strip() if soup.title else source
-        return [ContentItem(
+        # Only <title> is needed, so don't build a tree for the whole page
+        title = extract_title_tag(resp) or source
+        item = ContentItem(
             title=title,
             content=markdown,
             content_type='blog',
             source_url=source,
             author='',
             user_id=''
-        )] 
\ No newline at end of file
+        )
+        self._remember(source, digest)
+        return [item] 
\ No newline at end of file
@@ -1,21 +1,27 @@
 from typing import List
 import os
 from extractors.base import ContentExtractor, ContentItem
+from utils.sources import is_transcript_file
 from utils.markdown import text_to_markdown
 
 class TranscriptExtractor(ContentExtractor):
     def can_handle(self, source: str) -> bool:
-        return os.path.isfile(source) and source.lower().endswith('.txt')
+        return is_transcript_file(source)
 
     def extract(self, source: str) -> List[ContentItem]:
         with open(source, 'r', encoding='utf-8') as f:
             text = f.read()
+        digest = self._fingerprint(text.encode('utf-8'))
+        if self._is_unchanged(source, digest):
+            return []
         markdown = text_to_markdown(text)
-        return [ContentItem(
+        item = ContentItem(
             title=os.path.basename(source),
             content=markdown,
             content_type='call_transcript',
             source_url=None,
             author='',
             user_id=''
-        )] 
\ No newline at end of file
+        )
+        self._remember(source, digest)
+        return [item] 
\ No newline at end of file
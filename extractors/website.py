@@ -1,281 +1,430 @@
-from typing import List
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, TYPE_CHECKING
 import requests
 from bs4 import BeautifulSoup
-from trafilatura import extract as trafilatura_extract
 from extractors.base import ContentExtractor, ContentItem
-from utils.markdown import html_to_markdown
+from utils.sources import is_web_url
+from utils.markdown import extract_main_markdown, soup_to_markdown
+from utils.document import ParsedDocument, declared_charset
+from utils.concurrency import FetchLimiter
+from utils.pipeline import Pipeline
+from utils.scoring import best_content_block
+from utils.crawler import Crawler, RobotsPolicy
+from utils.discovery import discover_sitemap_urls, feed_links, in_scope, read_documents
+from utils.urls import dedupe_urls
 import re
 from urllib.parse import urljoin, urlparse
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
 import logging
-import time
-from selenium.webdriver.chrome.service import Service
+import threading
+from contextlib import closing
+
+import config
+
+if TYPE_CHECKING:
+    # Selenium is only imported once the browser fallback is actually used
+    from utils.browser import BrowserPool
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class PageResult(NamedTuple):
+    """What one discovered URL led to: items read from it directly, or more pages to visit."""
+    url: str
+    items: Sequence[ContentItem] = ()
+    # Full articles linked from post cards on the page
+    article_links: Sequence[str] = ()
+    # Post cards without links; only a browser can get at the articles
+    needs_browser: bool = False
+
+class FetchedPage(NamedTuple):
+    """A downloaded page on its way from the fetch stage to a parse stage, possibly in another process."""
+    url: str
+    raw: bytes
+    # URL after redirects, for resolving relative links
+    final_url: str
+    encoding: Optional[str] = None
+    digest: Optional[str] = None
+
+class ParsedPage(NamedTuple):
+    """What a parse stage made of a FetchedPage."""
+    url: str
+    digest: Optional[str] = None
+    canonical_url: Optional[str] = None
+    title: str = ''
+    markdown: str = ''
+    # Listing pages: links from post cards, and whether there were any cards at all
+    article_links: Sequence[str] = ()
+    has_post_cards: bool = False
+
+def _is_post_card(tag) -> bool:
+    """Blog post containers, by common blog-like classes."""
+    classes = tag.get('class', [])
+    return tag.name == 'div' and (
+        ('bg-white' in classes and 'p-[30px]' in classes)
+        or 'blog-post' in classes
+        or 'post' in classes
+        or 'article' in classes
+    )
+
+def parse_page(page: FetchedPage) -> Optional[ParsedPage]:
+    """
+    Parse stage for discovered URLs: links out of the post cards on a
+    listing, or else the page's main content via trafilatura.
+    """
+    try:
+        doc = ParsedDocument(page.raw, page.final_url, page.encoding)
+        soup = doc.soup
+        post_divs = soup.find_all(_is_post_card)
+        logger.info(f"Found {len(post_divs)} post divs")
+
+        article_links = []
+        for div in post_divs:
+            # Try to find a link or button to the full article
+            link = None
+            a_tag = div.find('a', href=True)
+            if a_tag:
+                link = a_tag['href']
+            else:
+                button = div.find('button')
+                if button and button.parent.name == 'a' and button.parent.has_attr('href'):
+                    link = button.parent['href']
+            if link:
+                article_links.append(urljoin(page.final_url, link))
+        if post_divs:
+            # Several cards often link the same post, with and without tracking params
+            return ParsedPage(page.url, page.digest, doc.canonical_url,
+                              article_links=dedupe_urls(article_links), has_post_cards=True)
+
+        # No listing: use trafilatura for main content extraction
+        markdown = extract_main_markdown(doc.raw, url=page.url)
+        return ParsedPage(page.url, page.digest, doc.canonical_url, extract_title(soup), markdown or '')
+    except Exception as e:
+        logger.error(f"Error parsing {page.url}: {e}")
+        return None
+
+def parse_article(page: FetchedPage) -> Optional[ParsedPage]:
+    """Parse stage for article pages: title, date and the main element as markdown."""
+    try:
+        doc = ParsedDocument(page.raw, page.final_url, page.encoding)
+        soup = doc.soup
+
+        # Extract title
+        title_elem = soup.find(['h1', 'h2'])
+        title = title_elem.get_text(strip=True) if title_elem else page.url
+
+        # Extract date
+        date_elem = soup.find('time') or soup.find(['h4', 'span'], class_=lambda c: c and 'text-slate-500' in c and 'text-sm' in c)
+        date = date_elem.get_text(strip=True) if date_elem else ''
+
+        # Extract main content
+        main_content_elem = soup.find('main') or soup.find('article') or best_content_block(soup)
+
+        # Convert the already-parsed element; no serialize/re-parse round trip
+        markdown = soup_to_markdown(main_content_elem or soup)
+
+        if date:
+            markdown = f"Date: {date}\n\n{markdown}"
+        return ParsedPage(page.url, page.digest, doc.canonical_url, title, markdown)
+    except Exception as e:
+        logger.error(f"Error extracting from {page.url}: {e}")
+        return None
+
+def extract_title(soup: BeautifulSoup) -> str:
+    """Extract title from an already-parsed page."""
+    # Try different title selectors
+    title_selectors = [
+        'h1',
+        'title',
+        '[class*="title"]',
+        '[class*="heading"]',
+        'h2',
+        'h3'
+    ]
+
+    for selector in title_selectors:
+        title_elem = soup.select_one(selector)
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+            if title and len(title) > 5:
+                return title
+
+    return "Untitled"
+
 class WebsiteExtractor(ContentExtractor):
+    """
+    Blogs and article pages.
+
+    Each page goes through a Pipeline: fetched on a thread (``concurrency``
+    at a time), parsed and converted to markdown by ``parse_page`` or
+    ``parse_article`` (in ``parse_workers`` processes, or on the fetch
+    thread when 0), then deduplicated and recorded on the consumer's thread.
+    """
+
+    def __init__(self, concurrency: int = 1, per_host_concurrency: int = 2,
+                 browser_pool_size: int = 1, browser_timeout: float = config.BROWSER_WAIT_TIMEOUT,
+                 crawl_depth: int = config.CRAWL_MAX_DEPTH, crawl_max_pages: int = config.CRAWL_MAX_PAGES,
+                 parse_workers: int = config.PARSE_WORKERS, **kwargs):
+        super().__init__(**kwargs)
+        self.concurrency = max(1, concurrency)
+        self.limiter = FetchLimiter(self.concurrency, per_host_concurrency)
+        self.pipeline = Pipeline(self.concurrency, parse_workers)
+        self.browser_pool_size = browser_pool_size
+        self.browser_timeout = browser_timeout
+        self._browser_pool: Optional['BrowserPool'] = None
+        self._browser_lock = threading.Lock()
+        # lastmod of URLs found in sitemaps and feeds, for incremental runs
+        self._lastmods: Dict[str, Optional[str]] = {}
+        self.crawl_depth = crawl_depth
+        self.crawl_max_pages = crawl_max_pages
+        self.robots = RobotsPolicy(self._fetch)
+
+    @property
+    def browser_pool(self) -> 'BrowserPool':
+        """Warm Chrome instances for the Selenium fallback, started on first use."""
+        with self._browser_lock:
+            if self._browser_pool is None:
+                from utils.browser import BrowserPool
+
+                self._browser_pool = BrowserPool(self.browser_pool_size, self.browser_timeout)
+            return self._browser_pool
+
+    def close(self):
+        self.pipeline.close()
+        if self._browser_pool is not None:
+            self._browser_pool.close()
+
     def can_handle(self, source: str) -> bool:
-        return source.startswith('http')
+        return is_web_url(source)
 
-    def extract(self, source: str) -> List[ContentItem]:
+    def iter_extract(self, source: str) -> Iterator[ContentItem]:
         logger.info(f"Starting extraction for source: {source}")
         
         # Crawl index if needed
-        urls = self._discover_urls(source)
+        urls = dedupe_urls(self._discover_urls(source))
         logger.info(f"Discovered {len(urls)} URLs to process")
+        if self.manifest is not None:
+            # Pages whose sitemap/feed date hasn't moved aren't fetched at all
+            fresh = [url for url in urls if not self._is_current(url, self._lastmods.get(url))]
+            if len(fresh) < len(urls):
+                logger.info(f"Skipping {len(urls) - len(fresh)} URLs unchanged since last run")
+            urls = fresh
         
-        items = []
-        for url in urls:
-            try:
-                logger.info(f"Processing URL: {url}")
-                resp = requests.get(url, timeout=15, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                })
-                resp.raise_for_status()
-                html = resp.text
-                soup = BeautifulSoup(html, 'html.parser')
-
-                # Try to find blog post containers by common blog-like classes
-                post_divs = soup.find_all(
-                    lambda tag: tag.name == 'div' and (
-                        ('bg-white' in tag.get('class', []) and 'p-[30px]' in tag.get('class', []))
-                        or 'blog-post' in tag.get('class', [])
-                        or 'post' in tag.get('class', [])
-                        or 'article' in tag.get('class', [])
-                    )
-                )
-                logger.info(f"Found {len(post_divs)} post divs")
-                
-                article_links = []
-                for div in post_divs:
-                    # Try to find a link or button to the full article
-                    link = None
-                    a_tag = div.find('a', href=True)
-                    if a_tag:
-                        link = a_tag['href']
-                        logger.info(f"Found link in a tag: {link}")
-                    else:
-                        button = div.find('button')
-                        if button and button.parent.name == 'a' and button.parent.has_attr('href'):
-                            link = button.parent['href']
-                            logger.info(f"Found link in button parent: {link}")
-                    if link:
-                        full_url = urljoin(url, link)
-                        article_links.append(full_url)
-
-                logger.info(f"Found {len(article_links)} article links")
-
-                # If we found article links, visit each and extract full content
-                if article_links:
-                    for article_url in article_links:
-                        try:
-                            logger.info(f"Extracting from article URL: {article_url}")
-                            article_resp = requests.get(article_url, timeout=15, headers={
-                                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                            })
-                            article_resp.raise_for_status()
-                            article_html = article_resp.text
-                            article_soup = BeautifulSoup(article_html, 'html.parser')
-                            
-                            # Extract title
-                            title_elem = article_soup.find(['h1', 'h2'])
-                            title = title_elem.get_text(strip=True) if title_elem else article_url
-                            
-                            # Extract date
-                            date_elem = article_soup.find('time') or article_soup.find(['h4', 'span'], class_=lambda c: c and 'text-slate-500' in c and 'text-sm' in c)
-                            date = date_elem.get_text(strip=True) if date_elem else ''
-                            
-                            # Extract main content
-                            main_content_elem = article_soup.find('main') or article_soup.find('article')
-                            if not main_content_elem:
-                                # Try to find the largest content div
-                                content_divs = article_soup.find_all('div')
-                                if content_divs:
-                                    main_content_elem = max(content_divs, key=lambda d: len(d.get_text()))
-                            
-                            content_html = str(main_content_elem) if main_content_elem else article_html
-                            markdown = html_to_markdown(content_html)
-                            
-                            if date:
-                                markdown = f"Date: {date}\n\n{markdown}"
-                            
-                            items.append(ContentItem(
-                                title=title,
-                                content=markdown,
-                                content_type='blog',
-                                source_url=article_url,
-                                author='',
-                                user_id=''
-                            ))
-                            logger.info(f"Successfully extracted article: {title}")
-                        except Exception as e:
-                            logger.error(f"Error extracting from {article_url}: {e}")
-                            continue
-                    continue
-
-                # If no article links found, try Selenium as a fallback
-                if not article_links and post_divs:
-                    logger.info("No article links found, trying Selenium fallback")
-                    items.extend(self._extract_with_selenium(url))
-                    continue
-
-                # Fallback: Use trafilatura for main content extraction
-                logger.info("Using trafilatura fallback")
-                main_content = trafilatura_extract(html, include_comments=False, include_tables=True)
-                if not main_content:
-                    logger.warning("No main content found with trafilatura")
-                    continue
-                markdown = html_to_markdown(main_content)
-                title = self._extract_title(html)
-                items.append(ContentItem(
-                    title=title or url,
-                    content=markdown,
-                    content_type='blog',
-                    source_url=url,
-                    author='',
-                    user_id=''
-                ))
-                logger.info(f"Successfully extracted with trafilatura: {title}")
-            except Exception as e:
-                logger.error(f"Error processing {url}: {e}")
-                continue
+        # Pages are only fetched as items are pulled, a bounded window ahead;
+        # closing this generator cancels the rest
+        count = 0
+        with closing(self.pipeline.run(urls, self._fetch_page, parse_page)) as pages:
+            for url, parsed in pages:
+                with closing(self._iter_page_items(self._page_result(url, parsed))) as page_items:
+                    for item in page_items:
+                        count += 1
+                        yield item
         
-        logger.info(f"Total items extracted: {len(items)}")
-        return items
+        logger.info(f"Total items extracted: {count}")
+
+    def _iter_page_items(self, page: PageResult) -> Iterator[ContentItem]:
+        """Items for one processed page, visiting its article links or a browser as needed."""
+        if page.article_links:
+            with closing(self.pipeline.run(page.article_links, self._fetch_page, parse_article)) as articles:
+                for _, parsed in articles:
+                    item = self._finish_item(parsed)
+                    if item:
+                        yield item
+        elif page.needs_browser:
+            logger.info("No article links found, trying Selenium fallback")
+            yield from self._iter_selenium(page.url)
+        else:
+            yield from page.items
+
+    def _fetch(self, url: str) -> requests.Response:
+        """Fetch a URL while holding a slot from the concurrency limiter."""
+        with self.limiter.slot(url):
+            resp = self.http.get(url)
+        resp.raise_for_status()
+        return resp
+
+    def _fetch_page(self, url: str) -> Optional[FetchedPage]:
+        """Fetch stage: download ``url`` unless it was already fetched this run or hasn't changed."""
+        if not self.urls.claim(url):
+            logger.info(f"Already fetched this run, skipping: {url}")
+            return None
+        try:
+            logger.info(f"Processing URL: {url}")
+            resp = self._fetch(url)
+        except Exception as e:
+            logger.error(f"Error processing {url}: {e}")
+            return None
+        digest = self._fingerprint(resp.content)
+        if self._is_unchanged(url, digest):
+            logger.info(f"Unchanged since last run, skipping: {url}")
+            return None
+        return FetchedPage(url, resp.content, resp.url, declared_charset(resp), digest)
+
+    def _page_result(self, url: str, parsed: Optional[ParsedPage]) -> PageResult:
+        """Final stage for a discovered URL: its item, or what to visit next."""
+        if parsed is None:
+            return PageResult(url)
+        if parsed.has_post_cards:
+            article_links = [link for link in parsed.article_links if link not in self.urls]
+            logger.info(f"Found {len(article_links)} article links")
+            # If we found article links, visit each and extract full content
+            if article_links:
+                return PageResult(url, article_links=article_links)
+            # If no article links found, try Selenium as a fallback
+            return PageResult(url, needs_browser=True)
+        item = self._finish_item(parsed)
+        return PageResult(url, items=[item] if item else ())
 
-    def _extract_with_selenium(self, url: str) -> List[ContentItem]:
+    def _finish_item(self, parsed: Optional[ParsedPage]) -> Optional[ContentItem]:
+        """Final stage for an article, on the consumer's thread: drop duplicates, then record it."""
+        if parsed is None:
+            return None
+        url = parsed.url
+        if not self.urls.claim_canonical(url, parsed.canonical_url):
+            logger.info(f"Duplicate of {parsed.canonical_url}, skipping: {url}")
+            return None
+        if not parsed.markdown:
+            logger.warning(f"No main content found for {url}")
+            return None
+        logger.info(f"Successfully extracted: {parsed.title}")
+        item = ContentItem(
+            title=parsed.title or url,
+            content=parsed.markdown,
+            content_type='blog',
+            source_url=url,
+            author='',
+            user_id=''
+        )
+        self._remember(url, parsed.digest, lastmod=self._lastmods.get(url))
+        return item
+
+    def _iter_selenium(self, url: str) -> Iterator[ContentItem]:
         """Selenium fallback for extracting content when no direct links are found"""
         logger.info(f"Starting Selenium fallback extraction for: {url}")
+        from selenium.webdriver.common.by import By
+        from utils.browser import is_broken_session, load_page, wait_for_ready, wait_for_url_change
         
-        options = Options()
-        options.add_argument('--headless')  # Run headless for production
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-        
-        driver = None
-        items = []
+        timeout = self.browser_pool.wait_timeout
         try:
-            # Use the modern Selenium approach without executable_path
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
-            logger.info("Chrome driver initialized")
-            
-            driver.get(url)
-            logger.info(f"Loaded page: {driver.current_url}")
-            driver.implicitly_wait(5)
-
-            # Wait for page to load completely
-            time.sleep(3)
-            
-            # First pass: collect all URLs we can find
-            article_urls = set()
-            
-            # Look for "Read more" buttons and get their URLs
-            read_more_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Read more') or contains(text(), 'Read More') or contains(text(), 'Continue reading') or contains(text(), 'Read article') or contains(text(), 'View post')]")
-            logger.info(f"Found {len(read_more_buttons)} 'Read more' buttons")
-            
-            for i, btn in enumerate(read_more_buttons):
-                try:
-                    # Try to get the URL from the button's parent link or data attributes
-                    parent_link = None
+            with self.browser_pool.driver() as driver:
+                load_page(driver, url, timeout)
+                logger.info(f"Loaded page: {driver.current_url}")
+                
+                # First pass: collect all URLs we can find, in page order
+                article_urls = {}
+                
+                # Look for "Read more" buttons and get their URLs
+                read_more_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Read more') or contains(text(), 'Read More') or contains(text(), 'Continue reading') or contains(text(), 'Read article') or contains(text(), 'View post')]")
+                logger.info(f"Found {len(read_more_buttons)} 'Read more' buttons")
+                
+                for i, btn in enumerate(read_more_buttons):
                     try:
-                        parent_link = btn.find_element(By.XPATH, "./ancestor::a[contains(@href, '/blog/') or contains(@href, '/post/') or contains(@href, '/article/') or contains(@href, '/news/')]")
-                    except Exception:
-                        pass
-                    
-                    if parent_link:
-                        href = parent_link.get_attribute('href')
-                        if href:
-                            article_urls.add(href)
-                            logger.info(f"Found article URL from button {i}: {href}")
-                    else:
-                        # Try to click the button and see if it navigates
-                        try:
-                            btn.click()
-                            time.sleep(2)
-                            current_url = driver.current_url
-                            if current_url != url and self._is_article_url(current_url):
-                                article_urls.add(current_url)
-                                logger.info(f"Found article URL from button click {i}: {current_url}")
-                            driver.back()
-                            time.sleep(1)
-                        except Exception as e:
-                            logger.warning(f"Could not click button {i}: {e}")
+                        # Try to get the URL from the button's parent link or data attributes
+                        parent_links = btn.find_elements(By.XPATH, "./ancestor::a[contains(@href, '/blog/') or contains(@href, '/post/') or contains(@href, '/article/') or contains(@href, '/news/')]")
+                        
+                        if parent_links:
+                            href = parent_links[0].get_attribute('href')
+                            if href:
+                                article_urls.setdefault(href, None)
+                                logger.info(f"Found article URL from button {i}: {href}")
+                        else:
+                            # Try to click the button and see if it navigates
+                            try:
+                                before = driver.current_url
+                                btn.click()
+                                if wait_for_url_change(driver, before, timeout):
+                                    current_url = driver.current_url
+                                    if current_url != url and self._is_article_url(current_url):
+                                        article_urls.setdefault(current_url, None)
+                                        logger.info(f"Found article URL from button click {i}: {current_url}")
+                                    driver.back()
+                                    wait_for_ready(driver, timeout)
+                            except Exception as e:
+                                if is_broken_session(e):
+                                    raise
+                                logger.warning(f"Could not click button {i}: {e}")
+                                continue
+                    except Exception as e:
+                        if is_broken_session(e):
+                            raise
+                        logger.warning(f"Error processing button {i}: {e}")
+                        continue
+                
+                # Also look for any links that might be article links
+                all_links = driver.find_elements(By.TAG_NAME, "a")
+                for link in all_links:
+                    try:
+                        href = link.get_attribute('href')
+                        if href and self._is_article_url(href):
+                            article_urls.setdefault(href, None)
+                    except Exception as e:
+                        if is_broken_session(e):
+                            raise
+                        continue
+                
+                article_urls = dedupe_urls(article_urls)
+                logger.info(f"Total article URLs found: {len(article_urls)}")
+                
+                # Now extract content from each article URL
+                for article_url in article_urls:
+                    if not self.urls.claim(article_url):
+                        logger.info(f"Already fetched this run, skipping: {article_url}")
+                        continue
+                    try:
+                        logger.info(f"Extracting content from: {article_url}")
+                        load_page(driver, article_url, timeout)
+                        canonical = driver.find_elements(By.CSS_SELECTOR, 'link[rel="canonical"]')
+                        canonical_url = canonical[0].get_attribute('href') if canonical else None
+                        if not self.urls.claim_canonical(article_url, canonical_url):
+                            logger.info(f"Duplicate of {canonical_url}, skipping: {article_url}")
                             continue
-                except Exception as e:
-                    logger.warning(f"Error processing button {i}: {e}")
-                    continue
-            
-            # Also look for any links that might be article links
-            all_links = driver.find_elements(By.TAG_NAME, "a")
-            for link in all_links:
-                try:
-                    href = link.get_attribute('href')
-                    if href and self._is_article_url(href):
-                        article_urls.add(href)
-                except Exception:
-                    continue
-            
-            logger.info(f"Total article URLs found: {len(article_urls)}")
-            
-            # Now extract content from each article URL
-            for article_url in article_urls:
-                try:
-                    logger.info(f"Extracting content from: {article_url}")
-                    driver.get(article_url)
-                    time.sleep(2)
-                    
-                    # Extract title
-                    title_elem = driver.find_element(By.TAG_NAME, "h1")
-                    title = title_elem.text if title_elem else article_url
-                    
-                    # Extract content
-                    content_elem = driver.find_element(By.TAG_NAME, "body")
-                    content_html = content_elem.get_attribute('innerHTML')
-                    
-                    # Use trafilatura to clean the content
-                    main_content = trafilatura_extract(content_html, include_comments=False, include_tables=True)
-                    if not main_content:
-                        logger.warning(f"No main content found for {article_url}")
+                        
+                        # Extract title
+                        title_elems = driver.find_elements(By.TAG_NAME, "h1")
+                        title = title_elems[0].text if title_elems else article_url
+                        
+                        # Extract content
+                        content_elem = driver.find_element(By.TAG_NAME, "body")
+                        content_html = content_elem.get_attribute('innerHTML')
+                        digest = self._fingerprint(content_html.encode('utf-8'))
+                        if self._is_unchanged(article_url, digest):
+                            logger.info(f"Unchanged since last run, skipping: {article_url}")
+                            continue
+                        
+                        # Use trafilatura to clean the content, else the densest block
+                        markdown = extract_main_markdown(content_html, url=article_url)
+                        if not markdown:
+                            block = best_content_block(ParsedDocument(content_html.encode('utf-8'), article_url,
+                                                                      'utf-8').soup)
+                            markdown = soup_to_markdown(block) if block is not None else ''
+                        if not markdown:
+                            logger.warning(f"No main content found for {article_url}")
+                            continue
+                        
+                        item = ContentItem(
+                            title=title,
+                            content=markdown,
+                            content_type='blog',
+                            source_url=article_url,
+                            author='',
+                            user_id=''
+                        )
+                        self._remember(article_url, digest, lastmod=self._lastmods.get(article_url))
+                        logger.info(f"Successfully extracted: {title}")
+                    except Exception as e:
+                        if is_broken_session(e):
+                            # Out of the pool's context manager, which replaces the dead browser
+                            raise
+                        logger.error(f"Error extracting from {article_url}: {e}")
                         continue
-                    
-                    markdown = html_to_markdown(main_content)
-                    
-                    items.append(ContentItem(
-                        title=title,
-                        content=markdown,
-                        content_type='blog',
-                        source_url=article_url,
-                        author='',
-                        user_id=''
-                    ))
-                    logger.info(f"Successfully extracted: {title}")
-                except Exception as e:
-                    logger.error(f"Error extracting from {article_url}: {e}")
-                    continue
+                    # The browser stays checked out until the consumer moves on
+                    yield item
                     
         except Exception as e:
             logger.error(f"Error in Selenium extraction: {e}")
-        finally:
-            if driver:
-                driver.quit()
-                logger.info("Chrome driver closed")
-        
-        return items
 
-    def _extract_quill_posts(self, html: str, base_url: str) -> List[ContentItem]:
+    def _extract_quill_posts(self, soup: BeautifulSoup, base_url: str) -> List[ContentItem]:
         """Extract posts from Quill-based websites (like interviewing.io)"""
-        soup = BeautifulSoup(html, 'html.parser')
         items = []
         
         # Look for Quill post containers
@@ -292,8 +441,7 @@ class WebsiteExtractor(ContentExtractor):
                 if not content_elem:
                     content_elem = container
                 
-                content_html = str(content_elem)
-                markdown = html_to_markdown(content_html)
+                markdown = soup_to_markdown(content_elem)
                 
                 items.append(ContentItem(
                     title=title,
@@ -315,28 +463,31 @@ class WebsiteExtractor(ContentExtractor):
             # If it's already an article URL, return it directly
             if self._is_article_url(source):
                 return [source]
+
+            # Sitemaps list every post in one or two fetches, with dates
+            sitemaps = discover_sitemap_urls(source, self._fetch, self.robots.sitemaps(source))
+            urls = self._articles_in_scope(source, sitemaps)
+            if urls:
+                logger.info(f"Found {len(urls)} article URLs in sitemaps")
+                return urls
             
-            # Try to crawl the page to find article links
-            resp = requests.get(source, timeout=15, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            })
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            
-            # Find all links on the page
-            links = set()
-            for a in soup.find_all('a', href=True):
-                href = a['href']
-                full_url = urljoin(source, href)
-                
-                # Only include article URLs
-                if self._is_article_url(full_url):
-                    links.add(full_url)
+            resp = self._fetch(source)
+            soup = ParsedDocument.from_response(resp).soup
+
+            feeds = feed_links(soup, source)
+            if feeds:
+                urls = self._articles_in_scope(source, read_documents(feeds, self._fetch))
+                if urls:
+                    logger.info(f"Found {len(urls)} article URLs in feeds")
+                    return urls
             
-            # If we found article links, return them
+            # Crawl the listing, its pagination and sub-listings (categories etc.)
+            crawler = Crawler(self._fetch, self._is_article_url, self.crawl_depth,
+                              self.crawl_max_pages, robots=self.robots)
+            links = crawler.crawl(source, soup)
             if links:
                 logger.info(f"Found {len(links)} article URLs to process")
-                return list(links)
+                return links
             
             # If no article links found, treat the source as a single article
             logger.info("No article links found, treating source as single article")
@@ -346,6 +497,13 @@ class WebsiteExtractor(ContentExtractor):
             logger.error(f"Error discovering URLs from {source}: {e}")
             return [source]
 
+    def _articles_in_scope(self, source: str, pages: Dict[str, Optional[str]]) -> List[str]:
+        """Article URLs under ``source`` from discovered pages, remembering their lastmod."""
+        urls = dedupe_urls(url for url in pages if in_scope(url, source) and self._is_article_url(url))
+        for url in urls:
+            self._lastmods[url] = pages[url]
+        return urls
+
     def _is_article_url(self, url: str) -> bool:
         """Check if a URL is likely to be an article."""
         if not url:
@@ -385,26 +543,3 @@ class WebsiteExtractor(ContentExtractor):
             return True
         
         return False
-
-    def _extract_title(self, html: str) -> str:
-        """Extract title from HTML."""
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Try different title selectors
-        title_selectors = [
-            'h1',
-            'title',
-            '[class*="title"]',
-            '[class*="heading"]',
-            'h2',
-            'h3'
-        ]
-        
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-                if title and len(title) > 5:
-                    return title
-        
-        return "Untitled" 
\ No newline at end of file
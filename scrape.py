@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
 import click
-import json
-from pathlib import Path
-from typing import Optional
+from contextlib import closing
+from itertools import islice
+from typing import Any, Dict, Optional, Tuple
 from rich.console import Console
 from rich.logging import RichHandler
 import logging
 
 from utils.router import ContentRouter
-from extractors.base import ContentItem
+from utils.batch import load_sources, prepare_item, run_batch
+from utils.manifest import Manifest
+from utils.metrics import metrics, profiled
+from utils.sinks import FORMATS, open_sink
+import config
 
 # Set up logging
 logging.basicConfig(
@@ -20,71 +24,217 @@ logging.basicConfig(
 logger = logging.getLogger("scraper")
 console = Console()
 
+
+def run_sources_file(sources_file: str, settings: Dict[str, Any], workers: Optional[int],
+                     sink, manifest: Optional[Manifest]) -> int:
+    """Extract every source listed in ``sources_file`` into ``sink``; returns skipped count."""
+    specs = load_sources(sources_file)
+    skipped = 0
+    failed = []
+    for result in run_batch(specs, settings, workers):
+        for item in result['items']:
+            sink.write(item)
+        skipped += result['skipped']
+        if result['metrics']:
+            metrics.merge(result['metrics'])
+        if manifest is not None:
+            manifest.merge_updates(result['manifest'], result['unchanged'])
+        if result['error']:
+            failed.append(result)
+        else:
+            logger.info(f"{result['source']}: {len(result['items'])} items")
+    if failed:
+        logger.warning(f"{len(failed)} of {len(specs)} sources failed:")
+        for result in failed:
+            logger.warning(f"  {result['source']}: {result['error']}")
+        if len(failed) == len(specs):
+            raise RuntimeError("Every source in the batch failed")
+    return skipped
+
+
 @click.command()
-@click.option('--source', required=True, help='URL or file path to extract content from')
+@click.option('--source', help='URL or file path to extract content from')
+@click.option('--sources-file', type=click.Path(exists=True, dir_okay=False),
+              help='File listing many sources (one per line, or a JSON list with per-source options)')
+@click.option('--workers', type=int, help='Worker processes for --sources-file (default: number of CPUs); '
+                   'sources on the same host share one worker so per-host limits hold')
 @click.option('--team-id', required=True, help='Team identifier for the output')
 @click.option('--output', default='output.json', help='Output file path')
 @click.option('--force-content-type', help='Override content type detection')
-@click.option('--max-items', type=int, help='Maximum number of items to extract')
-def main(source: str, team_id: str, output: str, force_content_type: Optional[str], max_items: Optional[int]):
+@click.option('--max-items', type=int, help='Maximum number of items to extract (per source with --sources-file)')
+@click.option('--concurrency', type=int, default=1, show_default=True,
+              help='Maximum number of pages fetched in parallel')
+@click.option('--parse-workers', type=int, default=config.PARSE_WORKERS, show_default=True,
+              help='Processes parsing fetched pages into markdown while more are fetched (0 = on the fetch threads)')
+@click.option('--per-host-concurrency', type=int, default=2, show_default=True,
+              help='Maximum number of parallel fetches against a single host')
+@click.option('--browser-pool-size', type=int, default=1, show_default=True,
+              help='Headless Chrome instances kept warm for the Selenium fallback. The fallback runs one '
+                   'listing page at a time, so more than 1 only helps callers sharing the extractor across threads')
+@click.option('--browser-timeout', type=float, default=config.BROWSER_WAIT_TIMEOUT, show_default=True,
+              help='Ceiling in seconds for each browser readiness wait')
+@click.option('--pdf-workers', type=int, default=1, show_default=True,
+              help='Processes used to extract text from each PDF')
+@click.option('--pdf-chapters', is_flag=True, help='Emit one item per PDF chapter instead of one per book')
+@click.option('--download-workers', type=int, default=4, show_default=True,
+              help='Parallel file downloads (Google Drive folders)')
+@click.option('--rate-limit', type=float, default=config.RATE_LIMIT_PER_HOST, show_default=True,
+              help='Requests per second per host (halved on 429/503, recovers on success; 0 = no cap)')
+@click.option('--max-retries', type=int, default=config.MAX_RETRIES, show_default=True,
+              help='Retries for connection errors and 429/5xx responses, with exponential backoff')
+@click.option('--crawl-depth', type=int, default=config.CRAWL_MAX_DEPTH, show_default=True,
+              help='Link hops from a listing page into sub-listings (categories, tags) when crawling a site')
+@click.option('--crawl-max-pages', type=int, default=config.CRAWL_MAX_PAGES, show_default=True,
+              help='Maximum listing pages fetched while crawling a site')
+@click.option('--reddit-comment-trees', is_flag=True,
+              help='For Reddit post URLs, extract every comment in the thread instead of the top one')
+@click.option('--reddit-author', 'reddit_authors', multiple=True,
+              help='Only keep Reddit thread comments by this author (repeatable)')
+@click.option('--cache-dir', help='Directory for the on-disk HTTP response cache (disabled if omitted)')
+@click.option('--cache-ttl', type=float, default=0, show_default=True,
+              help='Seconds a cached response is reused without revalidating')
+@click.option('--cache-max-size', type=int, default=512, show_default=True,
+              help='Maximum size of the response cache in MB')
+@click.option('--cache-only', is_flag=True, help='Serve every fetch from the cache; never use the network')
+@click.option('--incremental', is_flag=True,
+              help='Only extract items that are new or changed since the last incremental run, and merge '
+                   'them into the existing output so unchanged items are kept (implies --merge)')
+@click.option('--manifest-dir', default='.scrape_manifests', show_default=True,
+              help='Directory holding per-team incremental manifests')
+@click.option('--merge', is_flag=True, help='Merge new/changed items into the existing output file')
+@click.option('--format', 'output_format', type=click.Choice(FORMATS), default='json', show_default=True,
+              help='json writes one document at the end; jsonl streams one item per line as extracted')
+@click.option('--spill-chars', 'spill_threshold', type=int, default=config.SPILL_CONTENT_CHARS, show_default=True,
+              help='With --format json, hold item contents of at least this many characters in a temp file '
+                   '(0 = never)')
+@click.option('--profile', 'profile_path',
+              help='Write per-stage timings and counters here at the end (.prom/.txt: Prometheus textfile, else JSON)')
+@click.option('--profile-cpu', 'profile_cpu_path', help='Write a cProfile capture of the run here (open with pstats)')
+def main(source: Optional[str], sources_file: Optional[str], workers: Optional[int], team_id: str, output: str,
+         force_content_type: Optional[str], max_items: Optional[int], concurrency: int, parse_workers: int,
+         per_host_concurrency: int, browser_pool_size: int, browser_timeout: float, pdf_workers: int,
+         pdf_chapters: bool, download_workers: int, rate_limit: float, max_retries: int, crawl_depth: int,
+         crawl_max_pages: int, reddit_comment_trees: bool, reddit_authors: Tuple[str, ...],
+         cache_dir: Optional[str], cache_ttl: float, cache_max_size: int, cache_only: bool,
+         incremental: bool, manifest_dir: str, merge: bool, output_format: str, spill_threshold: int,
+         profile_path: Optional[str], profile_cpu_path: Optional[str]):
     """Extract content from various sources and output in a standardized format."""
-    try:
-        router = ContentRouter()
-        extractor = router.get_extractor(source)
-        if not extractor:
-            logger.error(f"No suitable extractor found for source: {source}")
-            return
-        
-        logger.info(f"Starting extraction from: {source}")
-        items = extractor.extract(source)
-        
-        # Apply max_items limit if specified
-        if max_items and len(items) > max_items:
-            logger.info(f"Limiting output to {max_items} items (found {len(items)})")
-            items = items[:max_items]
-        
-        skipped = 0
-        processed_items = []
-        
-        for item in items:
-            if force_content_type:
-                item.content_type = force_content_type
-            elif not item.content_type:
-                item.content_type = router.infer_content_type(source, item.content)
-            
-            if not item.content:
-                skipped += 1
-                continue
-                
-            # Use model_dump() instead of dict() for Pydantic v2 compatibility
+    if bool(source) == bool(sources_file):
+        raise click.UsageError('Pass exactly one of --source or --sources-file')
+    if cache_only and not cache_dir:
+        raise click.UsageError('--cache-only requires --cache-dir')
+    # Unchanged sources yield nothing, so their items only survive in the previous output
+    merge = merge or incremental
+    with profiled(profile_path, profile_cpu_path):
+        # The report is written even if extraction fails
+        manifest_path = Manifest.path_for_team(manifest_dir, team_id) if incremental else None
+        settings = {
+            'extractor_options': {
+                'WebsiteExtractor': {
+                    'concurrency': concurrency,
+                    'parse_workers': parse_workers,
+                    'per_host_concurrency': per_host_concurrency,
+                    'browser_pool_size': browser_pool_size,
+                    'browser_timeout': browser_timeout,
+                    'crawl_depth': crawl_depth,
+                    'crawl_max_pages': crawl_max_pages,
+                },
+                'PDFExtractor': {'workers': pdf_workers, 'split_chapters': pdf_chapters},
+                'RedditExtractor': {'comment_trees': reddit_comment_trees, 'authors': list(reddit_authors)},
+                'GoogleDriveExtractor': {
+                    'pdf_workers': pdf_workers,
+                    'pdf_split_chapters': pdf_chapters,
+                    'download_workers': download_workers,
+                },
+            },
+            'pool_maxsize': max(config.POOL_MAXSIZE, per_host_concurrency),
+            'per_host_concurrency': per_host_concurrency,
+            'rate_limit': rate_limit,
+            'max_retries': max_retries,
+            'cache_dir': cache_dir,
+            'cache_ttl': cache_ttl,
+            'cache_max_bytes': cache_max_size * 1024 * 1024,
+            'cache_only': cache_only,
+            'manifest_path': manifest_path,
+            'max_items': max_items,
+            'force_content_type': force_content_type,
+        }
+
+        if sources_file:
+            manifest = Manifest(manifest_path) if manifest_path else None
             try:
-                processed_items.append(item.model_dump())
-            except AttributeError:
-                # Fallback for older Pydantic versions
-                processed_items.append(item.dict())
+                sink = open_sink(output_format, output, team_id, merge=merge,
+                             spill_threshold=spill_threshold)
+                skipped = run_sources_file(sources_file, settings, workers, sink, manifest)
+                total = sink.close(skipped=skipped)
+                logger.info(f"Successfully extracted {sink.count} items to {output}")
+                if merge:
+                    logger.info(f"Output now holds {total} items after merging")
+                if manifest is not None:
+                    manifest.save()
+                    if manifest.unchanged:
+                        logger.info(f"Skipped {manifest.unchanged} unchanged items (incremental)")
+                if skipped:
+                    logger.warning(f"Skipped {skipped} items due to empty content.")
+            except Exception as e:
+                logger.error(f"Error processing sources file: {str(e)}")
+                raise click.Abort()
+            return
+
+        router = ContentRouter.from_settings(settings)
+        manifest = router.manifest
+        try:
+            extractor = router.get_extractor(source)
+            if not extractor:
+                logger.error(f"No suitable extractor found for source: {source}")
+                return
         
-        output_data = {
-            "team_id": team_id,
-            "items": processed_items
-        }
+            logger.info(f"Starting extraction from: {source}")
+            skipped = 0
+            first_content_type = None
+            sink = open_sink(output_format, output, team_id, merge=merge,
+                             spill_threshold=spill_threshold)
         
-        # Ensure output directory exists
-        output_path = Path(output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+            # Items are pulled one at a time and written as they arrive; with
+            # --max-items, closing the iterator stops the extractor's remaining work
+            with closing(extractor.iter_extract(source)) as items:
+                for item in islice(items, max_items or None):
+                    prepared = prepare_item(item, router, source, force_content_type)
+                    if prepared is None:
+                        skipped += 1
+                        continue
+                    sink.write(prepared)
+                    if first_content_type is None:
+                        first_content_type = item.content_type
+            if max_items and sink.count + skipped >= max_items:
+                logger.info(f"Stopped after {max_items} items (--max-items)")
         
-        with open(output, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+            total = sink.close(skipped=skipped)
         
-        logger.info(f"Successfully extracted {len(processed_items)} items to {output}")
-        if processed_items:
-            content_type = force_content_type or processed_items[0].get('content_type', 'unknown')
-            logger.info(f"Content type: {content_type}")
-        if skipped:
-            logger.warning(f"Skipped {skipped} items due to empty content.")
+            logger.info(f"Successfully extracted {sink.count} items to {output}")
+            if merge:
+                logger.info(f"Output now holds {total} items after merging")
+            if manifest is not None:
+                manifest.save()
+                if manifest.unchanged:
+                    logger.info(f"Skipped {manifest.unchanged} unchanged items (incremental)")
+            if router.urls.duplicates:
+                logger.info(f"Skipped {router.urls.duplicates} duplicate URLs")
+            for host, stats in router.http_stats().items():
+                logger.info(f"{host}: {stats['requests']} requests, {stats['retries']} retries, "
+                            f"{stats['throttled']} throttled, {stats['errors']} errors, "
+                            f"avg {stats['avg_seconds']}s, final concurrency {stats['concurrency']}")
+            if sink.count:
+                content_type = force_content_type or first_content_type or 'unknown'
+                logger.info(f"Content type: {content_type}")
+            if skipped:
+                logger.warning(f"Skipped {skipped} items due to empty content.")
             
-    except Exception as e:
-        logger.error(f"Error processing source: {str(e)}")
-        raise click.Abort()
+        except Exception as e:
+            logger.error(f"Error processing source: {str(e)}")
+            raise click.Abort()
+        finally:
+            router.close()
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,58 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from benchmarks.fixture_site import write_text_pdf
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    def make(pages, name='book.pdf'):
+        return write_text_pdf(tmp_path / name, pages)
+    return make
+
+
+class StaticSite:
+    """Pages served by the ``site`` fixture, keyed by path, and the paths requested so far."""
+
+    def __init__(self, url):
+        self.url = url
+        self.pages = {}
+        self.requested = []
+
+
+@pytest.fixture
+def site():
+    """
+    A local HTTP server answering from ``site.pages``; unknown paths are 404.
+
+    A page is a body (served with 200), a ``(status, body, headers)`` tuple,
+    or a list of either, served one per request.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state.requested.append(self.path)
+            page = state.pages.get(self.path, (404, 'not found', {}))
+            if isinstance(page, list):
+                page = page.pop(0) if len(page) > 1 else page[0]
+            status, body, headers = page if isinstance(page, tuple) else (200, page, {})
+            body = body.encode() if isinstance(body, str) else body
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    state = StaticSite('http://127.0.0.1:%d' % httpd.server_address[1])
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield state
+    httpd.shutdown()
+    httpd.server_close()
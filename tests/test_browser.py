@@ -0,0 +1,107 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+
+from extractors.website import WebsiteExtractor
+from utils.browser import BrowserPool, wait_for_ready
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_browser_pool_reuses_warm_drivers(monkeypatch):
+    started = []
+
+    def fake_start(self):
+        driver = FakeDriver()
+        started.append(driver)
+        return driver
+
+    monkeypatch.setattr(BrowserPool, '_start', fake_start)
+    pool = BrowserPool(size=2)
+    for _ in range(5):
+        with pool.driver() as driver:
+            assert driver is started[0]
+    assert len(started) == 1
+
+    pool.close()
+    assert started[0].quit_called
+
+
+class LoadingDriver(FakeDriver):
+    def execute_script(self, script):
+        return 'loading'
+
+
+def test_wait_for_ready_returns_false_on_timeout():
+    assert wait_for_ready(LoadingDriver(), timeout=0.1) is False
+
+
+@pytest.mark.parametrize('error, discarded', [
+    (TimeoutException('slow page'), False),
+    (NoSuchElementException('no h1'), False),
+    (WebDriverException('chrome not reachable'), True),
+])
+def test_only_broken_sessions_discard_the_driver(monkeypatch, error, discarded):
+    started = []
+    monkeypatch.setattr(BrowserPool, '_start', lambda self: started.append(FakeDriver()) or started[-1])
+    pool = BrowserPool(size=1)
+    with pytest.raises(type(error)):
+        with pool.driver():
+            raise error
+    with pool.driver() as driver:
+        pass
+    assert (driver is not started[0]) == discarded
+    assert started[0].quit_called == discarded
+
+
+class Element:
+    def __init__(self, **attributes):
+        self.attributes = attributes
+        self.text = ''
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class CrashingDriver(FakeDriver):
+    """A listing with three articles; Chrome dies while loading the second."""
+
+    links = [f'https://example.com/blog/post-{n}' for n in range(3)]
+
+    def __init__(self):
+        super().__init__()
+        self.current_url = None
+
+    def get(self, url):
+        if url == self.links[1]:
+            raise WebDriverException('chrome not reachable')
+        self.current_url = url
+
+    def execute_script(self, script):
+        return 'complete' if 'readyState' in script else 0
+
+    def find_elements(self, by, value):
+        return [Element(href=link) for link in self.links] if value == 'a' else []
+
+    def find_element(self, by, value):
+        return Element(innerHTML='<article><h1>Post</h1><p>' + 'Enough text to count as content. ' * 20
+                                 + '</p></article>')
+
+
+def test_browser_that_dies_mid_listing_is_replaced(monkeypatch):
+    started = []
+    monkeypatch.setattr(BrowserPool, '_start', lambda self: started.append(CrashingDriver()) or started[-1])
+    extractor = WebsiteExtractor(browser_timeout=0.2)
+    items = list(extractor._iter_selenium('https://example.com/blog'))
+
+    assert [item.source_url for item in items] == CrashingDriver.links[:1]
+    # The dead browser went back to neither the pool nor the next source
+    assert started[0].quit_called
+    with extractor.browser_pool.driver() as driver:
+        assert driver is not started[0]
+    extractor.close()
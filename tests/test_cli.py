@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from click.testing import CliRunner
+
+from scrape import main
+
+
+def run(args):
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def test_incremental_skips_unchanged_and_merges(tmp_path):
+    transcript = tmp_path / 'call.txt'
+    transcript.write_text('INTRODUCTION\nHello there.\n', encoding='utf-8')
+    output = tmp_path / 'out.json'
+    args = ['--source', str(transcript), '--team-id', 'aline123', '--output', str(output),
+            '--incremental', '--manifest-dir', str(tmp_path / 'manifests')]
+
+    run(args)
+    assert len(json.loads(output.read_text())['items']) == 1
+    # The manifest keeps hashes, not a second copy of the output
+    manifest = json.loads((tmp_path / 'manifests' / 'aline123.json').read_text())
+    assert list(manifest['entries'].values())[0].keys() == {'hash'}
+
+    # Nothing changed: no items extracted, previous output kept (--incremental implies --merge)
+    run(args)
+    items = json.loads(output.read_text())['items']
+    assert len(items) == 1
+    assert 'Hello there.' in items[0]['content']
+
+    transcript.write_text('INTRODUCTION\nHello again.\n', encoding='utf-8')
+    run(args)
+    items = json.loads(output.read_text())['items']
+    assert len(items) == 1
+    assert 'Hello again.' in items[0]['content']
+
+
+def test_jsonl_output_streams_header_items_footer(tmp_path):
+    transcript = tmp_path / 'call.txt'
+    transcript.write_text('Hello there.\n', encoding='utf-8')
+    output = tmp_path / 'out.jsonl'
+    run(['--source', str(transcript), '--team-id', 'aline123', '--output', str(output), '--format', 'jsonl'])
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r['type'] for r in records] == ['header', 'item', 'footer']
+    assert records[0]['team_id'] == 'aline123'
+    assert records[1]['item']['content'] == 'Hello there.'
+    assert records[2]['count'] == 1
+
+
+def test_sources_file_batch_reports_failures_without_aborting(tmp_path):
+    for name in ('a', 'b'):
+        (tmp_path / f'{name}.txt').write_text(f'Transcript {name}.\n', encoding='utf-8')
+    # Not valid UTF-8, so TranscriptExtractor raises for this source
+    (tmp_path / 'broken.txt').write_bytes(b'\xff\xfe\xfa')
+    sources = tmp_path / 'sources.json'
+    sources.write_text(json.dumps([
+        str(tmp_path / 'a.txt'),
+        str(tmp_path / 'broken.txt'),
+        {'source': str(tmp_path / 'b.txt'), 'force_content_type': 'other'},
+    ]), encoding='utf-8')
+    output = tmp_path / 'out.json'
+
+    run(['--sources-file', str(sources), '--team-id', 'aline123', '--output', str(output), '--workers', '2'])
+
+    items = json.loads(output.read_text())['items']
+    assert [item['content'] for item in items] == ['Transcript a.', 'Transcript b.']
+    assert [item['content_type'] for item in items] == ['call_transcript', 'other']
+
+
+def test_max_items_stops_fetching_early(site, tmp_path):
+    posts = [f'/blog/post-number-{n}' for n in range(20)]
+    site.pages = {
+        '/sitemap.xml': '<urlset>' + ''.join(f'<url><loc>{site.url}{p}</loc></url>' for p in posts) + '</urlset>',
+    }
+    for n, path in enumerate(posts):
+        site.pages[path] = f'<html><body><article><h1>Post number {n}</h1><p>Text {n}.</p></article></body></html>'
+    output = tmp_path / 'out.json'
+    run(['--source', f'{site.url}/blog', '--team-id', 'aline123', '--output', str(output), '--max-items', '2'])
+
+    assert [item['title'] for item in json.loads(output.read_text())['items']] == ['Post number 0', 'Post number 1']
+    assert [path for path in site.requested if path.startswith('/blog/')] == posts[:2]
+
+
+def test_profile_writes_stage_report(tmp_path):
+    transcript = tmp_path / 'call.txt'
+    transcript.write_text('INTRODUCTION\nHello there.\n', encoding='utf-8')
+    report_path = tmp_path / 'profile.json'
+    run(['--source', str(transcript), '--team-id', 'aline123', '--output', str(tmp_path / 'out.json'),
+         '--profile', str(report_path), '--profile-cpu', str(tmp_path / 'run.prof')])
+
+    report = json.loads(report_path.read_text())
+    assert report['items'] == 1
+    assert report['counters']['items_total{content_type="call_transcript"}'] == 1
+    assert {'run', 'text_markdown'} <= set(report['stages'])
+    assert (tmp_path / 'run.prof').stat().st_size > 0
+
+
+def test_sources_file_keeps_per_host_limits_across_workers(tmp_path):
+    peak = {'now': 0, 'max': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                peak['now'] += 1
+                peak['max'] = max(peak['max'], peak['now'])
+            time.sleep(0.2)
+            body = f'<html><body><article><h1>Post {self.path}</h1><p>Text.</p></article></body></html>'.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                peak['now'] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:%d' % httpd.server_address[1]
+    sources = tmp_path / 'sources.txt'
+    sources.write_text(''.join(f'{url}/post-{n}\n' for n in range(4)), encoding='utf-8')
+    output = tmp_path / 'out.json'
+    try:
+        run(['--sources-file', str(sources), '--team-id', 'aline123', '--output', str(output),
+             '--workers', '2', '--per-host-concurrency', '1', '--rate-limit', '0'])
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert len(json.loads(output.read_text())['items']) == 4
+    # Both workers would otherwise hit the host at once
+    assert peak['max'] == 1
@@ -0,0 +1,24 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.concurrency import FetchLimiter
+
+
+def test_fetch_limiter_caps_per_host():
+    limiter = FetchLimiter(max_concurrency=8, per_host=2)
+    active = {'n': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def fetch(url):
+        with limiter.slot(url):
+            with lock:
+                active['n'] += 1
+                active['peak'] = max(active['peak'], active['n'])
+            time.sleep(0.02)
+            with lock:
+                active['n'] -= 1
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(fetch, ['https://example.com/a/%d' % i for i in range(6)]))
+    assert active['peak'] == 2
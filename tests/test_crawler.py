@@ -0,0 +1,91 @@
+import threading
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+from extractors.website import WebsiteExtractor
+from utils.crawler import Crawler, CrawlScope, RobotsPolicy, pagination_links
+
+
+def listing(links, next_page=None):
+    anchors = ''.join(f'<a href="{href}">{href}</a>' for href in links)
+    nav = f'<a href="{next_page}">Older posts</a>' if next_page else ''
+    return f'<html><body>{anchors}{nav}</body></html>'
+
+
+def fetch(url):
+    resp = requests.get(url, timeout=5)
+    resp.raise_for_status()
+    return resp
+
+
+def test_pagination_links():
+    soup = BeautifulSoup(
+        '<head><link rel="next" href="/blog/page/2"></head>'
+        '<a href="/blog/post-one">Post</a><a href="?page=3">3</a><a href="/blog/x">Next »</a>', 'html.parser')
+    assert pagination_links(soup, 'https://example.com/blog') == [
+        'https://example.com/blog/page/2', 'https://example.com/blog?page=3', 'https://example.com/blog/x']
+
+
+def test_scope_keeps_listings_below_source():
+    scope = CrawlScope('https://www.example.com/blog', rules={'example.com': {'deny': ['/blog/category/private']}})
+    assert scope.allows_listing('https://example.com/blog/category/dsa')
+    assert not scope.allows_listing('https://example.com/docs/page/2')
+    assert not scope.allows_listing('https://example.com/blog/category/private')
+    assert scope.on_site('https://example.com/other/post-slug')
+    assert not scope.on_site('https://other.com/blog/post-slug')
+
+
+def test_crawl_follows_pagination_and_categories(site):
+    site.pages = {
+        '/robots.txt': 'User-agent: *\nDisallow: /blog/secret-post\nCrawl-delay: 0\n',
+        '/blog': listing(['/blog/first-post', '/blog/category/dsa', '/blog/secret-post'], '/blog/page/2'),
+        '/blog/page/2': listing(['/blog/second-post', '/blog/first-post'], '/blog/page/3'),
+        '/blog/page/3': listing(['/blog/third-post']),
+        '/blog/category/dsa': listing(['/blog/dsa-post', '/blog/category/dsa/sub']),
+        '/blog/category/dsa/sub': listing(['/blog/too-deep-post']),
+    }
+    crawler = Crawler(fetch, WebsiteExtractor()._is_article_url, max_depth=1, max_pages=10)
+    articles = crawler.crawl(f'{site.url}/blog')
+    assert [url[len(site.url):] for url in articles] == [
+        '/blog/first-post', '/blog/second-post', '/blog/third-post', '/blog/dsa-post']
+    assert '/blog/category/dsa/sub' not in site.requested
+
+    site.requested = []
+    Crawler(fetch, WebsiteExtractor()._is_article_url, max_depth=1, max_pages=2).crawl(f'{site.url}/blog')
+    assert [path for path in site.requested if path != '/robots.txt'] == ['/blog', '/blog/page/2']
+
+
+def test_robots_crawl_delay(site):
+    site.pages = {'/robots.txt': 'User-agent: *\nCrawl-delay: 3\nSitemap: /sitemap.xml\n'}
+    robots = RobotsPolicy(fetch)
+    assert robots.delay(f'{site.url}/blog') == 3
+    assert robots.sitemaps(f'{site.url}/blog') == [f'{site.url}/sitemap.xml']
+    assert site.requested == ['/robots.txt']
+
+
+def test_slow_robots_txt_only_blocks_its_own_host():
+    release = threading.Event()
+    fetched = []
+
+    def slow_fetch(url):
+        fetched.append(url)
+        if 'slow.example' in url:
+            release.wait(5)
+        resp = requests.Response()
+        resp.status_code, resp._content = 200, b'User-agent: *\nDisallow: /private\n'
+        return resp
+
+    robots = RobotsPolicy(slow_fetch)
+    waiting = threading.Thread(target=robots.allowed, args=('https://slow.example/post',))
+    waiting.start()
+    while not fetched:
+        time.sleep(0.01)
+    try:
+        assert not robots.allowed('https://fast.example/private/x')
+        assert waiting.is_alive()
+    finally:
+        release.set()
+        waiting.join()
+    assert fetched.count('https://slow.example/robots.txt') == 1
@@ -0,0 +1,79 @@
+import gzip
+
+from extractors.website import WebsiteExtractor
+from utils.discovery import iter_entries, sitemaps_from_robots
+from utils.manifest import Manifest
+
+SITEMAP_NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+ARTICLE = (
+    '<html><head><title>{0}</title></head><body><article><h1>{0}</h1>'
+    '<p>Body of {0}.</p></article></body></html>'
+)
+
+
+def chunks(data, size=16):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_sitemap_index_and_urlset_entries():
+    index = (
+        f'<?xml version="1.0"?><sitemapindex {SITEMAP_NS}>'
+        '<sitemap><loc>https://example.com/posts.xml</loc></sitemap></sitemapindex>'
+    ).encode()
+    urlset = (
+        f'<urlset {SITEMAP_NS}><url><loc> https://example.com/blog/a </loc>'
+        '<lastmod>2024-01-02</lastmod></url><url><loc>https://example.com/blog/b</loc></url></urlset>'
+    ).encode()
+    assert [(kind, url) for kind, (url, _) in iter_entries(chunks(index))] == [
+        ('sitemap', 'https://example.com/posts.xml')]
+    assert [entry for _, entry in iter_entries(chunks(gzip.compress(urlset)))] == [
+        ('https://example.com/blog/a', '2024-01-02'), ('https://example.com/blog/b', None)]
+
+
+def test_rss_and_atom_entries():
+    rss = (
+        '<rss version="2.0"><channel><link>https://example.com/</link>'
+        '<item><title>A</title><link>https://example.com/blog/a</link>'
+        '<pubDate>Tue, 02 Jan 2024 00:00:00 GMT</pubDate></item></channel></rss>'
+    ).encode()
+    atom = (
+        '<feed xmlns="http://www.w3.org/2005/Atom"><entry>'
+        '<link rel="replies" href="https://example.com/blog/a#comments"/>'
+        '<link href="https://example.com/blog/a"/><updated>2024-01-02T00:00:00Z</updated>'
+        '</entry></feed>'
+    ).encode()
+    assert [entry for _, entry in iter_entries(chunks(rss))] == [
+        ('https://example.com/blog/a', 'Tue, 02 Jan 2024 00:00:00 GMT')]
+    assert [entry for _, entry in iter_entries(chunks(atom))] == [
+        ('https://example.com/blog/a', '2024-01-02T00:00:00Z')]
+
+
+def test_sitemaps_from_robots():
+    robots = 'User-agent: *\nDisallow: /admin\nSitemap: /sitemap_index.xml\nsitemap: https://cdn.example.com/s.xml\n'
+    assert sitemaps_from_robots(robots, 'https://example.com') == [
+        'https://example.com/sitemap_index.xml', 'https://cdn.example.com/s.xml']
+
+
+def test_website_discovers_from_sitemap_and_skips_by_lastmod(site, tmp_path):
+    site.pages = {
+        '/robots.txt': 'User-agent: *\nSitemap: /sitemap.xml\n',
+        '/sitemap.xml': (
+            f'<urlset {SITEMAP_NS}>'
+            f'<url><loc>{site.url}/blog/first-post</loc><lastmod>2024-01-01</lastmod></url>'
+            f'<url><loc>{site.url}/blog/second-post</loc><lastmod>2024-02-01</lastmod></url>'
+            f'<url><loc>{site.url}/about</loc></url></urlset>'
+        ),
+        '/blog/first-post': ARTICLE.format('First post'),
+        '/blog/second-post': ARTICLE.format('Second post'),
+    }
+    manifest = Manifest(str(tmp_path / 'manifest.json'))
+    items = WebsiteExtractor(manifest=manifest).extract(f'{site.url}/blog')
+    assert [item.title for item in items] == ['First post', 'Second post']
+    # The blog index itself was never needed
+    assert '/blog' not in site.requested
+
+    site.requested = []
+    assert WebsiteExtractor(manifest=manifest).extract(f'{site.url}/blog') == []
+    assert manifest.unchanged == 2
+    assert not any(path.startswith('/blog/') for path in site.requested)
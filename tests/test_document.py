@@ -0,0 +1,18 @@
+import requests
+
+from utils.document import ParsedDocument, extract_title_tag
+
+
+def make_response(raw, content_type='text/html'):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = raw
+    resp.headers['Content-Type'] = content_type
+    return resp
+
+
+def test_encoding_sniffed_from_meta_charset():
+    raw = '<html><head><meta charset="utf-8"><title>Café</title></head><body></body></html>'.encode('utf-8')
+    resp = make_response(raw)
+    assert ParsedDocument.from_response(resp).title == 'Café'
+    assert extract_title_tag(resp) == 'Café'
@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks.bench_e2e import SCENARIOS, _sources, run_scenario
+from benchmarks.fixture_site import FixtureSite
+
+EXPECTED_ITEMS = {'website': 6, 'crawl': 12, 'reddit': 4, 'substack': 2, 'pdf': 2}
+
+
+@pytest.fixture(scope='module')
+def fixture_site():
+    with FixtureSite(posts=12, reddit_comments=4, substack_posts=2, pdfs=2, pdf_pages=3) as site:
+        yield site
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS)
+def test_each_scenario_extracts_every_item(fixture_site, scenario):
+    sources = _sources(fixture_site, scenario)
+    if scenario == 'website':
+        # Only the first half of the sitemap, to keep the run short
+        sources = [f'{fixture_site.url}/blog/interview-lesson-{n}' for n in range(6)]
+    result = run_scenario(scenario, sources, concurrency=2)
+    assert result['items'] == EXPECTED_ITEMS[scenario]
+    # Reddit comments are looked up in one batched request
+    assert result['requests'] == 1 if scenario == 'reddit' else result['requests'] >= result['items']
+    assert result['p95_ms'] >= result['p50_ms']
+
+
+def test_injected_errors_are_retried():
+    with FixtureSite(posts=12, error_rate=0.3, seed=1) as site:
+        result = run_scenario('crawl', _sources(site, 'crawl'), concurrency=2, max_retries=8)
+    assert site.injected_errors > 0
+    assert result['retries'] == site.injected_errors
+    assert result['items'] == 12
@@ -0,0 +1,63 @@
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from extractors.gdrive import GoogleDriveExtractor
+
+
+class _SlowHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        # The first PDF is slowest, so downloads complete out of order
+        if self.path.endswith('0.pdf'):
+            time.sleep(0.3)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pdf_server(tmp_path, make_pdf):
+    serve_dir = tmp_path / 'served'
+    serve_dir.mkdir()
+    for n in range(4):
+        make_pdf([[f'Book {n} text.']], name=f'served/{n}.pdf')
+    (serve_dir / 'folder.html').write_text('<html><body>folder</body></html>')
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), partial(_SlowHandler, directory=str(serve_dir)))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:%d' % httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_concurrent_downloads_keep_folder_order(pdf_server, monkeypatch):
+    links = [(f'{pdf_server}/{n}.pdf', f'{n}.pdf') for n in range(4)]
+    monkeypatch.setattr(GoogleDriveExtractor, '_find_pdf_links', lambda self, soup: links)
+    # A tiny threshold makes every download spill to a temp file
+    extractor = GoogleDriveExtractor(download_workers=4, memory_threshold=64)
+    spilled = []
+    original = extractor._download_pdf
+
+    def tracking_download(url):
+        pdf, digest = original(url)
+        spilled.append(pdf)
+        return pdf, digest
+
+    extractor._download_pdf = tracking_download
+
+    items = extractor.extract(f'{pdf_server}/folder.html')
+
+    assert [item.content for item in items] == [f'Book {n} text.' for n in range(4)]
+    assert [item.source_url for item in items] == [url for url, _ in links]
+    assert all(isinstance(path, str) and not os.path.exists(path) for path in spilled)
+
+
+def test_small_downloads_stay_in_memory(pdf_server):
+    pdf, digest = GoogleDriveExtractor()._download_pdf(f'{pdf_server}/1.pdf')
+    assert not isinstance(pdf, str)
+    assert pdf.read(5) == b'%PDF-'
+    assert digest is None
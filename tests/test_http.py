@@ -0,0 +1,127 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import config
+from utils.cache import CacheMissError, ResponseCache
+from utils.http import HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    ports = []
+    user_agents = []
+    statuses = []
+
+    def do_GET(self):
+        self.ports.append(self.client_address[1])
+        self.user_agents.append(self.headers.get('User-Agent'))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.statuses.append(304)
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.statuses.append(200)
+        body = b'<html><title>ok</title></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.ports = []
+    _Handler.user_agents = []
+    _Handler.statuses = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:%d' % httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_repeated_fetches_reuse_connection(server):
+    client = HttpClient()
+    for i in range(3):
+        resp = client.get(f'{server}/post-{i}')
+        assert resp.status_code == 200
+    client.close()
+    # Same client port for every request means one kept-alive connection
+    assert len(set(_Handler.ports)) == 1
+    assert _Handler.user_agents == [config.USER_AGENT] * 3
+
+
+def test_cache_revalidates_and_serves_304_from_disk(server, tmp_path):
+    client = HttpClient(cache=ResponseCache(str(tmp_path)))
+    first = client.get(f'{server}/post#comments')
+    second = client.get(f'{server}/post')
+    client.close()
+    assert _Handler.statuses == [200, 304]
+    assert second.text == first.text
+    assert getattr(second, 'from_cache', False)
+
+
+def test_cache_only_mode_never_hits_network(server, tmp_path):
+    warm = HttpClient(cache=ResponseCache(str(tmp_path)))
+    warm.get(f'{server}/post')
+    warm.close()
+
+    offline = HttpClient(cache=ResponseCache(str(tmp_path)), cache_only=True)
+    assert offline.get(f'{server}/post').status_code == 200
+    with pytest.raises(CacheMissError):
+        offline.get(f'{server}/other')
+    offline.close()
+    assert _Handler.statuses == [200]
+
+
+def test_cache_keys_on_params_and_replays_them_offline(server, tmp_path):
+    warm = HttpClient(cache=ResponseCache(str(tmp_path)))
+    warm.get(f'{server}/api/info', params={'id': 't1_a,t1_b', 'raw_json': 1})
+    warm.close()
+
+    offline = HttpClient(cache=ResponseCache(str(tmp_path)), cache_only=True)
+    assert offline.get(f'{server}/api/info', params={'raw_json': 1, 'id': 't1_a,t1_b'}).status_code == 200
+    with pytest.raises(CacheMissError):
+        offline.get(f'{server}/api/info', params={'id': 't1_c', 'raw_json': 1})
+    offline.close()
+    assert _Handler.statuses == [200]
+
+
+def test_streamed_responses_are_cached_and_replayed(server, tmp_path):
+    warm = HttpClient(cache=ResponseCache(str(tmp_path)))
+    with warm.get(f'{server}/book.pdf', stream=True) as resp:
+        first = b''.join(resp.iter_content(chunk_size=8))
+    warm.close()
+
+    offline = HttpClient(cache=ResponseCache(str(tmp_path)), cache_only=True)
+    with offline.get(f'{server}/book.pdf', stream=True) as resp:
+        assert b''.join(resp.iter_content(chunk_size=8)) == first
+    with pytest.raises(CacheMissError):
+        offline.get(f'{server}/other.pdf', stream=True)
+    offline.close()
+    assert _Handler.statuses == [200]
+
+
+def test_large_streamed_downloads_bypass_the_cache(server, tmp_path, monkeypatch):
+    # The test body is 30 bytes
+    monkeypatch.setattr(config, 'CACHE_MAX_STREAM_BYTES', 10)
+    warm = HttpClient(cache=ResponseCache(str(tmp_path)))
+    with warm.get(f'{server}/book.pdf', stream=True) as resp:
+        # Still unread: nothing went through resp.content
+        assert resp._content is False
+        assert b''.join(resp.iter_content(chunk_size=8)).startswith(b'<html>')
+    warm.close()
+
+    offline = HttpClient(cache=ResponseCache(str(tmp_path)), cache_only=True)
+    with pytest.raises(CacheMissError):
+        offline.get(f'{server}/book.pdf', stream=True)
+    offline.close()
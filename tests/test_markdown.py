@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from utils.markdown import extract_main_markdown, format_line, stream_to_markdown, text_to_markdown
+
+# Each <name>.txt is paired with the <name>.md the original per-line
+# re.match implementation produced for it; the output must stay byte-identical.
+GOLDEN_DIR = Path(__file__).parent / 'golden' / 'markdown'
+GOLDEN_CASES = sorted(path.stem for path in GOLDEN_DIR.glob('*.txt'))
+
+
+def read_golden(name, suffix):
+    with open(GOLDEN_DIR / f'{name}{suffix}', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('name', GOLDEN_CASES)
+def test_text_to_markdown_matches_golden(name):
+    assert text_to_markdown(read_golden(name, '.txt')) == read_golden(name, '.md')
+
+
+@pytest.mark.parametrize('name', GOLDEN_CASES)
+def test_stream_to_markdown_matches_golden(name):
+    text = read_golden(name, '.txt')
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    assert stream_to_markdown(chunks) == read_golden(name, '.md')
+
+
+def test_format_line_headings():
+    assert format_line('chapter 3  Sliding Window') == '# Chapter 3: Sliding Window'
+    assert format_line('CHAPTER 12') == '# Chapter 12'
+    assert format_line('CAPS HEADING') == '## Caps Heading'
+    assert format_line('CHAPTERS') == '## Chapters'
+    assert format_line('2. Use a heap') == '2. Use a heap'
+    assert format_line('Complexity:') == '### Complexity:'
+
+
+def test_extract_main_markdown_keeps_structure():
+    body = 'Some article text that is long enough to count as content. ' * 6
+    html = (
+        '<html><body><nav><a href="/">Home</a></nav><article><h1>Post title</h1>'
+        f'<p>{body}<a href="https://example.com/ref">a reference</a></p>'
+        f'<h2>Section</h2><p>{body}</p></article></body></html>'
+    )
+    markdown = extract_main_markdown(html, url='https://example.com/post')
+    assert '# Post title' in markdown
+    assert '## Section' in markdown
+    assert '[a reference](https://example.com/ref)' in markdown
+    assert 'Home' not in markdown
@@ -0,0 +1,60 @@
+import pickle
+
+import pytest
+
+from utils.metrics import Metrics
+
+
+def test_timer_records_stage_even_when_it_raises():
+    metrics = Metrics()
+    with metrics.timer('parse_html'):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.timer('parse_html'):
+            raise ValueError
+    assert metrics.report()['stages']['parse_html']['count'] == 2
+
+
+def test_report_quantiles_and_items_per_sec():
+    metrics = Metrics()
+    for seconds in [0.002] * 90 + [0.7] * 10:
+        metrics.observe('stage_seconds', seconds, stage='fetch')
+    metrics.count('items_total', 3, content_type='blog')
+    metrics.count('items_total', 1, content_type='book')
+
+    report = metrics.report(elapsed=2.0)
+    assert report['items'] == 4
+    assert report['items_per_sec'] == 2.0
+    fetch = report['stages']['fetch']
+    assert fetch['count'] == 100
+    assert fetch['p50_seconds'] == 0.005
+    assert fetch['p95_seconds'] == 0.7
+    assert report['counters']['items_total{content_type="blog"}'] == 3
+
+
+def test_snapshots_merge_across_processes():
+    worker = Metrics()
+    worker.count('http_requests_total', host='example.com', status=200)
+    worker.observe('stage_seconds', 0.5, stage='fetch')
+    parent = Metrics()
+    parent.count('http_requests_total', host='example.com', status=200)
+    parent.merge(pickle.loads(pickle.dumps(worker.snapshot())))
+
+    report = parent.report()
+    assert report['counters']['http_requests_total{host="example.com",status="200"}'] == 2
+    assert report['stages']['fetch']['max_seconds'] == 0.5
+
+
+def test_prometheus_textfile():
+    metrics = Metrics()
+    metrics.count('http_bytes_total', 1024, host='example.com')
+    metrics.observe('stage_seconds', 0.02, stage='fetch')
+    metrics.observe('stage_seconds', 3, stage='fetch')
+
+    lines = metrics.to_prometheus().splitlines()
+    assert '# TYPE scrape_http_bytes_total counter' in lines
+    assert 'scrape_http_bytes_total{host="example.com"} 1024' in lines
+    assert '# TYPE scrape_stage_seconds histogram' in lines
+    assert 'scrape_stage_seconds_bucket{stage="fetch",le="0.025"} 1' in lines
+    assert 'scrape_stage_seconds_bucket{stage="fetch",le="+Inf"} 2' in lines
+    assert 'scrape_stage_seconds_count{stage="fetch"} 2' in lines
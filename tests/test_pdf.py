@@ -0,0 +1,58 @@
+from PyPDF2 import PageObject
+
+from extractors.pdf import PDFExtractor
+from utils.markdown import text_to_markdown
+
+
+def book_pages(count):
+    return [[f'CHAPTER {n}', f'Page {n} text.', 'KEY POINTS', 'Summary:'] for n in range(1, count + 1)]
+
+
+def test_parallel_extraction_matches_serial(make_pdf):
+    path = make_pdf(book_pages(9))
+    serial = PDFExtractor().extract(path)
+    parallel = PDFExtractor(workers=2, pages_per_chunk=2).extract(path)
+    assert len(serial) == len(parallel) == 1
+    assert parallel[0].content == serial[0].content
+    assert '# Chapter 9' in serial[0].content
+
+
+def test_streamed_pages_match_text_to_markdown_on_joined_text(make_pdf):
+    path = make_pdf(book_pages(3))
+    extractor = PDFExtractor()
+    # Pages are concatenated without a separator, exactly like the old `text +=` loop
+    joined = ''.join(extractor._iter_page_texts(path))
+    assert extractor.extract(path)[0].content == text_to_markdown(joined)
+
+
+def test_chapter_split_yields_one_item_per_chapter(make_pdf):
+    path = make_pdf([['Preface text.'], ['Chapter 1 Arrays', 'Two pointers.'],
+                     ['More on arrays.', 'CHAPTER 2 Graphs'], ['BFS and DFS.']])
+    items = PDFExtractor(split_chapters=True).extract(path)
+    assert [item.title for item in items] == ['book - Chapter 1 Arrays', 'book - CHAPTER 2 Graphs']
+    assert items[0].content == 'Two pointers.\n\nMore on arrays.'
+    assert items[1].content == 'BFS and DFS.'
+
+
+def test_chapter_split_without_headings_is_one_document(make_pdf):
+    path = make_pdf([['Just some notes.'], ['No chapters here.']])
+    items = PDFExtractor(split_chapters=True).extract(path)
+    assert [item.title for item in items] == ['book - Document']
+
+
+def test_chapters_are_yielded_before_the_rest_of_the_book_is_read(make_pdf, monkeypatch):
+    path = make_pdf([['Chapter 1 Arrays', 'Two pointers.'], ['Sliding windows.'],
+                     ['Chapter 2 Graphs', 'BFS and DFS.'], ['Topological sort.']])
+    read = []
+    extract_text = PageObject.extract_text
+
+    def counting(page, *args, **kwargs):
+        read.append(page)
+        return extract_text(page, *args, **kwargs)
+
+    monkeypatch.setattr(PageObject, 'extract_text', counting)
+    chapters = PDFExtractor(split_chapters=True).iter_extract(path)
+    assert next(chapters).title == 'book - Chapter 1 Arrays'
+    # Chapter 1 ends at the heading on page 3; page 4 isn't read yet
+    assert len(read) == 3
+    chapters.close()
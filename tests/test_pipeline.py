@@ -0,0 +1,57 @@
+import threading
+import time
+
+from benchmarks.bench_e2e import _sources, run_scenario
+from benchmarks.fixture_site import FixtureSite
+from extractors.website import FetchedPage, parse_article, parse_page
+from utils.metrics import metrics
+from utils.pipeline import Pipeline
+
+
+def test_results_in_input_order_with_bounded_lookahead():
+    started = []
+    lock = threading.Lock()
+
+    def fetch(n):
+        with lock:
+            started.append(n)
+        time.sleep(0.01 * (n % 3))
+        return None if n == 2 else n
+
+    pipeline = Pipeline(fetch_workers=3, capacity=4)
+    results = pipeline.run(range(100), fetch, lambda n: n * 10)
+    assert [next(results) for _ in range(4)] == [(0, 0), (1, 10), (2, None), (3, 30)]
+    # A consumer that stops pulling stops the fetches: four handed out, at most four more in flight
+    time.sleep(0.05)
+    assert len(started) <= 4 + 4
+    results.close()
+
+
+def test_parse_stage_runs_in_worker_processes():
+    html = b'<html><body><h1>Pipelines</h1><main><p>Fetch, then parse.</p></main></body></html>'
+    pages = [FetchedPage(f'https://example.com/blog/{n}', html, f'https://example.com/blog/{n}') for n in range(3)]
+    metrics.reset()
+    pipeline = Pipeline(fetch_workers=2, parse_workers=2)
+    try:
+        results = list(pipeline.run(pages, lambda page: page, parse_article))
+    finally:
+        pipeline.close()
+    assert [page.url for page, _ in results] == [page.url for page in pages]
+    assert all(parsed.title == 'Pipelines' and 'Fetch, then parse.' in parsed.markdown for _, parsed in results)
+    # Timings recorded in the workers come back to this process
+    assert metrics.report()['stages']['parse_html']['count'] == 3
+
+
+def test_website_with_parse_workers_matches_inline_parsing():
+    with FixtureSite(posts=8) as site:
+        sources = _sources(site, 'crawl')
+        inline = run_scenario('crawl', sources, concurrency=2)
+        pooled = run_scenario('crawl', sources, concurrency=2, parse_workers=2)
+    assert pooled['items'] == inline['items'] == 8
+    assert pooled['requests'] == inline['requests']
+
+
+def test_listing_links_resolve_against_the_redirected_url():
+    html = b'<html><body><div class="post"><a href="first-post">First</a></div></body></html>'
+    parsed = parse_page(FetchedPage('https://example.com/blog', html, 'https://example.com/blog/'))
+    assert list(parsed.article_links) == ['https://example.com/blog/first-post']
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+import requests
+
+from benchmarks.fixture_site import FixtureSite
+from extractors.base import ContentItem
+from extractors.reddit import RedditExtractor, thing_id
+from utils.batch import _extract_reddit_sources, plan_jobs
+from utils.router import ContentRouter
+
+
+def _path(path, **params):
+    """Path and query string exactly as the extractor requests them."""
+    return requests.Request('GET', 'http://x' + path, params=dict(params, raw_json=1)).prepare().path_url
+
+
+def _comment(id, author, replies=()):
+    return {'kind': 't1', 'data': {
+        'id': id, 'name': f't1_{id}', 'author': author, 'author_fullname': f't2_{author}',
+        'permalink': f'/r/cscareers/comments/p1/thread/{id}/', 'body_html': f'<p>Comment {id}</p>',
+        'replies': {'kind': 'Listing', 'data': {'children': list(replies)}} if replies else '',
+    }}
+
+
+def test_thing_id_from_permalinks():
+    assert thing_id('https://www.reddit.com/r/cscareers/comments/abc12/some_title/def34/?context=3') == 't1_def34'
+    assert thing_id('https://old.reddit.com/r/cscareers/comments/abc12/some_title/') == 't3_abc12'
+    assert thing_id('https://www.reddit.com/r/cscareers/') is None
+
+
+@pytest.mark.parametrize('source, extractor', [
+    ('https://www.reddit.com/r/a/comments/abc/t/def/', 'RedditExtractor'),
+    # Substack and LinkedIn pages are crawled like any other site
+    ('https://newsletter.substack.com/archive', 'WebsiteExtractor'),
+    ('https://www.linkedin.com/pulse/some-article', 'WebsiteExtractor'),
+])
+def test_routing_order(source, extractor):
+    assert type(ContentRouter().get_extractor(source)).__name__ == extractor
+
+
+def test_comment_permalinks_are_looked_up_in_batches():
+    with FixtureSite(posts=0, reddit_comments=150, substack_posts=0, pdfs=0) as site:
+        urls = site.reddit_urls()
+        extractor = RedditExtractor(api_base=site.url)
+        results = list(extractor.iter_extract_many(urls + ['https://www.reddit.com/r/a/comments/x/t/gone/']))
+        # 151 IDs: one call for the first 100, one for the rest
+        assert site.requests == 2
+    assert [source for source, _ in results] == urls
+    assert results[0][1].author == 'user0'
+    assert results[0][1].content.startswith('Comment 0:')
+
+
+def test_comment_tree_walk_expands_more_stubs(site):
+    thread = [{'kind': 'Listing', 'data': {'children': []}}, {'kind': 'Listing', 'data': {'children': [
+        _comment('c1', 'alice', [_comment('c2', 'bob', [{'kind': 'more', 'data': {
+            'children': [], 'parent_id': 't1_c2'}}])]),
+        {'kind': 'more', 'data': {'children': ['c3', 'c4'], 'parent_id': 't3_p1'}},
+    ]}}]
+    more = {'json': {'data': {'things': [_comment('c3', 'alice'), _comment('c4', 'bob')]}}}
+    continued = [thread[0], {'kind': 'Listing', 'data': {'children': [
+        _comment('c2', 'bob', [_comment('c5', 'alice')])]}}]
+    site.pages[_path('/comments/p1.json', limit=500)] = json.dumps(thread)
+    site.pages[_path('/api/morechildren.json', api_type='json', link_id='t3_p1', children='c3,c4')] = json.dumps(more)
+    site.pages[_path('/comments/p1/_/c2.json')] = json.dumps(continued)
+    source = 'https://www.reddit.com/r/cscareers/comments/p1/thread/'
+
+    items = RedditExtractor(api_base=site.url, comment_trees=True).extract(source)
+    assert [item.content for item in items] == [f'Comment {id}' for id in ('c1', 'c2', 'c3', 'c4', 'c5')]
+    assert items[0].source_url == f'{site.url}/r/cscareers/comments/p1/thread/c1/'
+
+    items = RedditExtractor(api_base=site.url, comment_trees=True, authors=['Alice']).extract(source)
+    assert [item.content for item in items] == ['Comment c1', 'Comment c3', 'Comment c5']
+
+
+def test_repeated_continue_stubs_fetch_their_parent_once(site):
+    stub = {'kind': 'more', 'data': {'children': [], 'parent_id': 't1_c1'}}
+    thread = [{'kind': 'Listing', 'data': {'children': []}},
+              {'kind': 'Listing', 'data': {'children': [_comment('c1', 'alice', [stub])]}}]
+    # The subtree comes back with the same stub again
+    continued = [thread[0], {'kind': 'Listing', 'data': {'children': [
+        _comment('c1', 'alice', [_comment('c2', 'bob'), stub])]}}]
+    site.pages[_path('/comments/p1.json', limit=500)] = json.dumps(thread)
+    site.pages[_path('/comments/p1/_/c1.json')] = json.dumps(continued)
+
+    items = RedditExtractor(api_base=site.url, comment_trees=True).extract('https://www.reddit.com/r/a/comments/p1/t/')
+    assert [item.content for item in items] == ['Comment c1', 'Comment c2']
+    assert site.requested.count(_path('/comments/p1/_/c1.json')) == 1
+
+
+def test_plan_jobs_groups_reddit_sources_into_one_job():
+    specs = [{'source': 'https://www.reddit.com/r/a/comments/1/t/a/'}, {'source': 'notes.txt'},
+             {'source': 'https://www.reddit.com/r/a/comments/1/t/b/'},
+             {'source': 'https://www.reddit.com/r/a/comments/1/t/c/', 'max_items': 1}]
+    assert plan_jobs(specs) == [[specs[0], specs[2], specs[3]], [specs[1]]]
+
+
+def test_bulk_job_stops_once_every_source_is_full(monkeypatch):
+    sources = ['https://www.reddit.com/r/a/comments/1/t/a/', 'https://www.reddit.com/r/a/comments/1/t/b/']
+    pulled = []
+
+    def endless(self, urls):
+        # A thread walk that would keep fetching comments forever
+        while True:
+            for url in urls:
+                pulled.append(url)
+                yield url, ContentItem(title='Comment', content='text', content_type='comment', source_url=url)
+
+    monkeypatch.setattr(RedditExtractor, 'iter_extract_many', endless)
+    monkeypatch.setattr('utils.batch._worker_router', ContentRouter())
+    results = _extract_reddit_sources([{'source': url} for url in sources], {'max_items': 2})
+    assert [len(result['items']) for result in results] == [2, 2]
+    assert len(pulled) == 4
+
+
+def test_bulk_job_error_only_fails_unfinished_sources(monkeypatch):
+    sources = ['https://www.reddit.com/r/a/comments/1/t/a/', 'https://www.reddit.com/r/a/comments/1/t/b/']
+
+    def failing(self, urls):
+        yield urls[0], ContentItem(title='Comment', content='text', content_type='comment', source_url=urls[0])
+        raise requests.ConnectionError('reset')
+
+    monkeypatch.setattr(RedditExtractor, 'iter_extract_many', failing)
+    monkeypatch.setattr('utils.batch._worker_router', ContentRouter())
+    results = _extract_reddit_sources([{'source': url} for url in sources], {})
+    assert [len(result['items']) for result in results] == [1, 0]
+    assert [result['error'] for result in results] == [None, 'ConnectionError: reset']
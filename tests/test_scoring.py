@@ -0,0 +1,44 @@
+from bs4 import BeautifulSoup
+
+from utils.scoring import ContentScorer, best_content_block
+
+PARAGRAPH = '<p>Practice explaining your approach out loud, since interviewers grade the reasoning, not just code.</p>'
+
+PAGE = f'''
+<html><body>
+  <div id="wrapper">
+    <div id="nav"><a href="/a">Home page link</a> <a href="/b">All the archives</a> <a href="/c">About us</a></div>
+    <div id="story"><h2>Lessons</h2>{PARAGRAPH * 6}</div>
+    <div id="sidebar"><p>Subscribe to the newsletter for more posts.</p></div>
+    <div id="footer"><a href="/privacy">Privacy policy and terms of service</a></div>
+  </div>
+</body></html>
+'''
+
+
+def test_picks_the_story_not_the_outer_wrapper():
+    soup = BeautifulSoup(PAGE, 'html.parser')
+    assert best_content_block(soup)['id'] == 'story'
+
+
+def test_stats_are_summed_bottom_up():
+    soup = BeautifulSoup(PAGE, 'html.parser')
+    scorer = ContentScorer(soup)
+    wrapper, nav = soup.find(id='wrapper'), soup.find(id='nav')
+    assert scorer.stats(wrapper).text == sum(len(s.strip()) for s in wrapper.strings)
+    assert scorer.stats(nav).link_density == 1.0
+    assert scorer.stats(soup.find(id='story')).tags == 7
+
+
+def test_without_paragraphs_falls_back_to_the_innermost_text_block():
+    soup = BeautifulSoup('<div><div><div id="text">Only a bare block of text here.</div></div>'
+                         '<div><a href="/x">a much longer link text than the text block</a></div></div>',
+                         'html.parser')
+    assert best_content_block(soup)['id'] == 'text'
+
+
+def test_deeply_nested_pages_are_scored_without_recursion():
+    depth = 5000
+    soup = BeautifulSoup('<div>' * depth + PARAGRAPH * 3 + '</div>' * depth, 'html.parser')
+    block = best_content_block(soup)
+    assert block.name == 'div' and len(block.find_all('p', recursive=False)) == 3
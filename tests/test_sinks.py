@@ -0,0 +1,38 @@
+import json
+
+from extractors.base import ContentItem
+from utils.batch import prepare_item
+from utils.sinks import JsonSink
+
+
+def _items(n):
+    return [ContentItem(title=f'Chapter {i}', content=f'Chapter {i}: "ünïcode"\n' * (200 * i + 1),
+                        content_type='book', source_url=f'https://example.com/{i}') for i in range(n)]
+
+
+def test_spilled_output_matches_in_memory_output(tmp_path):
+    outputs = []
+    for threshold in (0, 1000):
+        path = tmp_path / f'out-{threshold}.json'
+        sink = JsonSink(str(path), 'team', spill_threshold=threshold)
+        for item in _items(4):
+            sink.write(prepare_item(item, None, 'source'))
+        if threshold:
+            # Only the large contents left memory
+            assert [isinstance(item['content'], str) for item in sink._items] == [True, False, False, False]
+        sink.close()
+        outputs.append(path.read_text(encoding='utf-8'))
+    expected = {'team_id': 'team', 'items': [item.to_dict() for item in _items(4)]}
+    assert outputs[0] == outputs[1] == json.dumps(expected, indent=2, ensure_ascii=False)
+
+
+def test_empty_output_matches_json_dump(tmp_path):
+    path = tmp_path / 'out.json'
+    JsonSink(str(path), 'team').close()
+    assert path.read_text(encoding='utf-8') == json.dumps({'team_id': 'team', 'items': []}, indent=2)
+
+
+def test_invalid_items_are_skipped_at_the_output_boundary():
+    # Nothing is checked when an extractor builds the item
+    item = ContentItem(title=None, content='text', content_type='blog')
+    assert prepare_item(item, None, 'https://example.com/post') is None
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from utils.http import HttpClient
+from utils.throttle import OK, THROTTLED, HostThrottle, Throttle, parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('7') == 7
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_token_bucket_paces_requests():
+    host = HostThrottle(rate=50, burst=1, max_concurrency=4)
+    start = time.monotonic()
+    for _ in range(6):
+        host.acquire()
+        host.release(OK)
+    # First request uses the burst, the other five wait ~20ms each
+    assert time.monotonic() - start >= 0.08
+
+
+def test_concurrency_backs_off_and_recovers():
+    host = HostThrottle(rate=0, max_concurrency=8)
+    for _ in range(40):
+        host.acquire()
+        host.release(OK)
+    assert host.snapshot()['concurrency'] == 8
+    host.acquire()
+    host.release(THROTTLED, retry_after=0)
+    assert host.snapshot()['concurrency'] == 4
+    assert host.snapshot()['throttled'] == 1
+
+
+def test_in_flight_limit_blocks_until_release():
+    host = HostThrottle(rate=0, min_concurrency=1, max_concurrency=1)
+    host.acquire()
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (host.acquire(), acquired.set()))
+    thread.start()
+    assert not acquired.wait(0.05)
+    host.release(OK)
+    assert acquired.wait(1)
+    host.release(OK)
+    thread.join()
+
+
+def test_client_retries_throttled_responses(site):
+    site.pages['/post'] = [(503, 'busy', {'Retry-After': '0'}), (429, 'slow down', {}), 'ok']
+    client = HttpClient(throttle=Throttle(rate=0), max_retries=3)
+    resp = client.get(f'{site.url}/post')
+    assert resp.text == 'ok'
+    stats = client.stats()[site.url.split('//')[1]]
+    assert (stats['requests'], stats['retries'], stats['throttled']) == (3, 2, 2)
+
+
+def test_client_gives_up_after_max_retries():
+    client = HttpClient(throttle=Throttle(rate=0), max_retries=1, timeout=0.5)
+    with pytest.raises(Exception):
+        # Nothing listens on port 9 (discard) locally
+        client.get('http://127.0.0.1:9/')
+    assert list(client.stats().values())[0]['retries'] == 1
+
+
+def test_non_retryable_errors_release_their_slot(site):
+    site.pages['/loop'] = (302, '', {'Location': '/loop'})
+    throttle = Throttle(rate=0, max_concurrency=2)
+    client = HttpClient(throttle=throttle, max_retries=0)
+    client.session.max_redirects = 2
+    limit = int(throttle.host(site.url).limit)
+
+    def fetch_all():
+        for _ in range(limit + 1):
+            with pytest.raises(requests.TooManyRedirects):
+                client.get(f'{site.url}/loop')
+
+    thread = threading.Thread(target=fetch_all, daemon=True)
+    thread.start()
+    thread.join(5)
+    # A leaked slot would leave the last request waiting in acquire() forever
+    assert not thread.is_alive()
+    assert throttle.host(site.url).in_flight == 0
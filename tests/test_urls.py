@@ -0,0 +1,73 @@
+import threading
+
+from extractors.website import WebsiteExtractor
+from utils.urls import UrlIndex, canonicalize_url, dedupe_urls, normalize_url
+
+
+def test_canonicalize_drops_tracking_and_presentation_differences():
+    variants = [
+        'https://example.com/blog/post-one',
+        'http://Example.com/blog/post-one/',
+        'https://example.com:443/blog/post-one?utm_source=x&utm_medium=email#comments',
+        'https://example.com/blog/post-one?ref=home&fbclid=abc',
+    ]
+    assert {canonicalize_url(url) for url in variants} == {'https://example.com/blog/post-one'}
+    # Meaningful parameters survive, in a stable order
+    assert canonicalize_url('https://example.com/?page=2&utm_campaign=a&id=7') == 'https://example.com/?id=7&page=2'
+    # normalize_url (used for cache keys) keeps anything a server might distinguish
+    assert normalize_url('http://example.com/a/?ref=x') == 'http://example.com/a/?ref=x'
+
+
+def test_dedupe_keeps_first_spelling():
+    urls = ['https://example.com/a?utm_source=x', 'https://example.com/b', 'https://example.com/a/']
+    assert dedupe_urls(urls) == ['https://example.com/a?utm_source=x', 'https://example.com/b']
+
+
+def test_url_index_claims_once_across_threads():
+    index = UrlIndex()
+    wins = []
+    barrier = threading.Barrier(8)
+
+    def claim(i):
+        barrier.wait()
+        if index.claim(f'https://example.com/post/?utm_source={i}'):
+            wins.append(i)
+
+    threads = [threading.Thread(target=claim, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(wins) == 1
+    assert index.duplicates == 7
+    assert index.claim_canonical('https://example.com/a', 'https://example.com/a/')
+    assert index.claim_canonical('https://example.com/b', 'https://example.com/c')
+    assert not index.claim_canonical('https://example.com/d', 'https://example.com/c')
+
+
+ARTICLE = (
+    '<html><head><title>{0}</title>{1}</head><body><article><h1>{0}</h1>'
+    '<p>Body of {0}.</p></article></body></html>'
+)
+
+
+def test_website_fetches_each_article_once(site):
+    cards = ''.join(
+        f'<div class="post"><a href="{href}">Read</a></div>'
+        for href in ['/posts/first-post?utm_source=home', '/posts/first-post/', '/posts/mirror-post',
+                     '/posts/second-post']
+    )
+    site.pages = {
+        '/blog/page-one': f'<html><body>{cards}</body></html>',
+        '/posts/first-post': ARTICLE.format('First post', ''),
+        '/posts/first-post/': ARTICLE.format('First post', ''),
+        '/posts/first-post?utm_source=home': ARTICLE.format('First post', ''),
+        # Same article published under a second URL
+        '/posts/mirror-post': ARTICLE.format('First post', '<link rel="canonical" href="/posts/first-post">'),
+        '/posts/second-post': ARTICLE.format('Second post', ''),
+    }
+    extractor = WebsiteExtractor()
+    items = extractor.extract(f'{site.url}/blog/page-one')
+    assert [item.title for item in items] == ['First post', 'Second post']
+    fetched = [path for path in site.requested if path.startswith('/posts/')]
+    assert fetched == ['/posts/first-post?utm_source=home', '/posts/mirror-post', '/posts/second-post']
@@ -0,0 +1,232 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from itertools import islice
+from multiprocessing.util import Finalize
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+import json
+import logging
+import os
+
+from pydantic import ValidationError
+
+from extractors.base import ContentItem, validate_item
+from utils.metrics import metrics
+from utils.sources import is_reddit, is_web_url
+import config
+
+logger = logging.getLogger(__name__)
+
+# Router built once per worker process and reused for every source it handles
+_worker_router = None
+
+
+def load_sources(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a sources file.
+
+    Either plain text with one URL or path per line (blank lines and ``#``
+    comments ignored), or a JSON list whose entries are strings or objects
+    like ``{"source": ..., "force_content_type": ..., "max_items": ...}``.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        entries = json.loads(text)
+    else:
+        entries = [line.strip() for line in text.splitlines()]
+        entries = [line for line in entries if line and not line.startswith('#')]
+    specs = []
+    for entry in entries:
+        spec = {'source': entry} if isinstance(entry, str) else dict(entry)
+        if not spec.get('source'):
+            raise ValueError(f"Sources file entry without a 'source': {entry!r}")
+        specs.append(spec)
+    return specs
+
+
+def prepare_item(item: ContentItem, router, source: str,
+                 force_content_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Apply content type rules to an extracted item; None if it should be skipped."""
+    if force_content_type:
+        item.content_type = force_content_type
+    elif not item.content_type:
+        item.content_type = router.infer_content_type(source, item.content)
+    if not item.content:
+        metrics.count('items_skipped_total')
+        return None
+    # Items are only validated here, at the output boundary
+    try:
+        prepared = validate_item(item.to_dict())
+    except ValidationError as e:
+        logger.warning(f"Skipping invalid item from {item.source_url or source}: {e}")
+        metrics.count('items_skipped_total')
+        return None
+    metrics.count('items_total', content_type=item.content_type)
+    return prepared
+
+
+def _router(settings: Dict[str, Any]):
+    global _worker_router
+    from utils.router import ContentRouter
+
+    if _worker_router is None:
+        _worker_router = ContentRouter.from_settings(settings)
+        # Pool workers skip atexit; this still runs when the worker exits, so
+        # warm browsers and connections are shut down with it
+        Finalize(_worker_router, _worker_router.close, exitpriority=10)
+    return _worker_router
+
+
+def _new_result(source: str, error: Optional[str] = None) -> Dict[str, Any]:
+    return {'source': source, 'items': [], 'skipped': 0, 'error': error, 'manifest': {}, 'unchanged': 0,
+            'metrics': None}
+
+
+def _hand_off(router, result: Dict[str, Any]):
+    """Move the worker's manifest updates and metrics into ``result`` for the parent."""
+    if router.manifest is not None:
+        # The parent owns the manifest file
+        result['manifest'] = dict(router.manifest.updates)
+        result['unchanged'] = router.manifest.unchanged
+        router.manifest.updates.clear()
+        router.manifest.unchanged = 0
+    # Likewise the metrics, for the parent's --profile report
+    result['metrics'] = metrics.snapshot()
+    metrics.reset()
+
+
+def _extract_source(spec: Dict[str, Any], settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract one source in a worker, never raising."""
+    router = _router(settings)
+    source = spec['source']
+    result = _new_result(source)
+    try:
+        extractor = router.get_extractor(source)
+        max_items = spec.get('max_items', settings.get('max_items'))
+        force_content_type = spec.get('force_content_type', settings.get('force_content_type'))
+        with closing(extractor.iter_extract(source)) as items:
+            for item in islice(items, max_items or None):
+                prepared = prepare_item(item, router, source, force_content_type)
+                if prepared is None:
+                    result['skipped'] += 1
+                else:
+                    result['items'].append(prepared)
+    except Exception as e:
+        logger.error(f"Error processing source {source}: {e}")
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _extract_reddit_sources(specs: List[Dict[str, Any]], settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract many Reddit sources in a worker with batched API lookups, never raising."""
+    router = _router(settings)
+    results = {spec['source']: _new_result(spec['source']) for spec in specs}
+    full = set()
+    try:
+        extractor = router.get_extractor(specs[0]['source'])
+        max_items = settings.get('max_items')
+        force_content_type = settings.get('force_content_type')
+        with closing(extractor.iter_extract_many(list(results))) as items:
+            for source, item in items:
+                if source in full:
+                    continue
+                result = results[source]
+                prepared = prepare_item(item, router, source, force_content_type)
+                if prepared is None:
+                    result['skipped'] += 1
+                else:
+                    result['items'].append(prepared)
+                if max_items and len(result['items']) + result['skipped'] >= max_items:
+                    full.add(source)
+                    if len(full) == len(results):
+                        # Closing the iterator stops any thread walk still fetching comments
+                        break
+    except Exception as e:
+        unfinished = [result for source, result in results.items() if source not in full and not result['items']]
+        logger.error(f"Error processing {len(unfinished)} of {len(specs)} Reddit sources: {e}")
+        # Sources that already got their items succeeded
+        for result in unfinished:
+            result['error'] = f"{type(e).__name__}: {e}"
+    return list(results.values())
+
+
+def _extract_sources(specs: List[Dict[str, Any]], settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Worker entry point: extract one job's sources, never raising.
+
+    Plain Reddit URLs (no per-source options) are looked up together in bulk
+    groups of up to ``config.REDDIT_BULK_SOURCES``; every other source is
+    extracted on its own. Results come back in ``specs`` order.
+    """
+    router = _router(settings)
+    bulk = [spec for spec in specs if set(spec) == {'source'} and is_reddit(spec['source'])]
+    done: Dict[int, Dict[str, Any]] = {}
+    for start in range(0, len(bulk), config.REDDIT_BULK_SOURCES):
+        group = bulk[start:start + config.REDDIT_BULK_SOURCES]
+        by_source = {result['source']: result for result in _extract_reddit_sources(group, settings)}
+        for spec in group:
+            done[id(spec)] = by_source[spec['source']]
+    results = [done[id(spec)] if id(spec) in done else _extract_source(spec, settings) for spec in specs]
+    _hand_off(router, results[-1])
+    return results
+
+
+def _host_key(source: str) -> Optional[str]:
+    """The host a source is fetched from, or None for local files."""
+    if is_reddit(source):
+        # Every Reddit URL is looked up through the same API host
+        return 'reddit.com'
+    if is_web_url(source):
+        return urlparse(source).netloc.lower()
+    return None
+
+
+def plan_jobs(specs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Group sources into pool jobs: every source fetched from the same host
+    goes into one job, and each local file gets a job of its own.
+
+    Each worker paces hosts with its own throttle, so keeping a host's
+    sources in one worker is what makes ``--rate-limit`` and
+    ``--per-host-concurrency`` hold across the whole pool. A job takes the
+    position of its first source.
+    """
+    jobs: List[List[Dict[str, Any]]] = []
+    by_host: Dict[str, List[Dict[str, Any]]] = {}
+    for spec in specs:
+        host = _host_key(spec['source'])
+        if host is None:
+            jobs.append([spec])
+        elif host in by_host:
+            by_host[host].append(spec)
+        else:
+            by_host[host] = [spec]
+            jobs.append(by_host[host])
+    return jobs
+
+
+def run_batch(specs: List[Dict[str, Any]], settings: Dict[str, Any],
+              workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Extract every source across a process pool.
+
+    Yields one result dict per source, in input order except that sources
+    sharing a host come out together (see plan_jobs()), as soon as it and
+    all earlier sources are done. A failing source yields a result with
+    ``error`` set instead of aborting the batch.
+    """
+    jobs = plan_jobs(specs)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    logger.info(f"Processing {len(specs)} sources as {len(jobs)} jobs with {workers} worker processes")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_extract_sources, job, settings) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. killed or unpicklable result)
+                logger.error(f"Worker failed on {job[0]['source']}: {e}")
+                results = [_new_result(spec['source'], f"{type(e).__name__}: {e}") for spec in job]
+            yield from results
@@ -0,0 +1,179 @@
+from contextlib import contextmanager
+from typing import List, Optional
+import logging
+import os
+import threading
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchWindowException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+
+import config
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+
+def chrome_driver_path() -> str:
+    """
+    Resolve the chromedriver binary once per process.
+
+    ``CHROMEDRIVER_PATH`` wins if set; otherwise webdriver_manager is asked
+    once and the answer reused, instead of re-checking on every launch.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = os.environ.get('CHROMEDRIVER_PATH')
+            if not _driver_path:
+                from webdriver_manager.chrome import ChromeDriverManager
+                _driver_path = ChromeDriverManager().install()
+            logger.info(f"Using chromedriver at {_driver_path}")
+        return _driver_path
+
+
+def is_broken_session(error: Exception) -> bool:
+    """
+    True for errors that mean the browser session itself is gone, not just
+    one page misbehaving. Callers that catch errors per page must re-raise
+    these so BrowserPool.driver() can replace the browser.
+    """
+    # Crashed or unreachable Chrome surfaces as a bare WebDriverException
+    if type(error) is WebDriverException:
+        return True
+    return isinstance(error, (InvalidSessionIdException, NoSuchWindowException))
+
+
+def wait_for_ready(driver, timeout: float = config.BROWSER_WAIT_TIMEOUT) -> bool:
+    """Wait until ``document.readyState`` is complete; False on timeout instead of raising."""
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script('return document.readyState') == 'complete'
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_network_idle(driver, timeout: float = config.BROWSER_WAIT_TIMEOUT,
+                          idle: float = config.BROWSER_NETWORK_IDLE) -> bool:
+    """
+    Wait until no new resources have been fetched for ``idle`` seconds, so
+    client-rendered content has had a chance to arrive. Gives up quietly
+    after ``timeout``.
+    """
+    deadline = time.monotonic() + timeout
+    count = -1
+    stable_since = time.monotonic()
+    while time.monotonic() < deadline:
+        current = driver.execute_script("return performance.getEntriesByType('resource').length")
+        now = time.monotonic()
+        if current != count:
+            count = current
+            stable_since = now
+        elif now - stable_since >= idle:
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def wait_for_url_change(driver, old_url: str, timeout: float = config.BROWSER_WAIT_TIMEOUT) -> bool:
+    """Wait for navigation away from ``old_url``; False if it never happens."""
+    try:
+        WebDriverWait(driver, timeout).until(lambda d: d.current_url != old_url)
+        return True
+    except TimeoutException:
+        return False
+
+
+def load_page(driver, url: str, timeout: float = config.BROWSER_WAIT_TIMEOUT):
+    """Navigate and wait for the document and its network activity to settle."""
+    with metrics.timer('selenium'):
+        try:
+            driver.get(url)
+        except TimeoutException:
+            # Work with whatever has loaded, as the fixed sleeps used to
+            logger.warning(f"Page load timed out, continuing with what loaded: {url}")
+        if not wait_for_ready(driver, timeout):
+            logger.info(f"Document not ready after {timeout}s, continuing: {url}")
+        wait_for_network_idle(driver, timeout)
+
+
+class BrowserPool:
+    """
+    Keeps up to ``size`` headless Chrome instances alive for a whole run.
+
+    Drivers are started lazily on first demand and handed out with
+    ``with pool.driver() as driver:``. A driver whose session breaks
+    (crashed or unreachable Chrome, closed window) is discarded and replaced
+    on next use; timeouts and element errors leave it in the pool.
+    """
+
+    def __init__(self, size: int = 1, wait_timeout: float = config.BROWSER_WAIT_TIMEOUT):
+        self.size = max(1, size)
+        self.wait_timeout = wait_timeout
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: List[webdriver.Chrome] = []
+        self._all: List[webdriver.Chrome] = []
+        self._lock = threading.Lock()
+
+    def _start(self) -> webdriver.Chrome:
+        options = Options()
+        for argument in config.SELENIUM_ARGUMENTS:
+            options.add_argument(argument)
+        driver = webdriver.Chrome(service=Service(chrome_driver_path()), options=options)
+        # Explicit waits only: an implicit wait makes every failed lookup block
+        driver.implicitly_wait(0)
+        driver.set_page_load_timeout(max(self.wait_timeout * 3, 30))
+        logger.info("Chrome driver initialized")
+        return driver
+
+    @contextmanager
+    def driver(self):
+        self._slots.acquire()
+        driver = None
+        try:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                driver = self._start()
+                with self._lock:
+                    self._all.append(driver)
+            yield driver
+        except WebDriverException as e:
+            if driver is not None and is_broken_session(e):
+                self._discard(driver)
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                with self._lock:
+                    self._idle.append(driver)
+            self._slots.release()
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            drivers, self._all, self._idle = self._all, [], []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if drivers:
+            logger.info(f"Closed {len(drivers)} Chrome drivers")
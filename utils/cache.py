@@ -0,0 +1,158 @@
+from typing import Optional
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.urls import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the wire encoding rather than the stored (decoded) body
+_WIRE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class CacheMissError(requests.ConnectionError):
+    """Raised in cache-only mode when a URL has never been fetched."""
+
+
+class CachedResponse:
+    """A stored response plus the validators needed to revalidate it."""
+
+    def __init__(self, url: str, status: int, headers: dict, body: bytes, stored_at: float):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+
+    @property
+    def etag(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get('Last-Modified')
+
+    def is_fresh(self, ttl: float) -> bool:
+        return ttl > 0 and time.time() - self.stored_at < ttl
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a ``requests.Response`` so callers can't tell it was cached."""
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp.reason = 'OK'
+        resp.url = self.url
+        resp.headers = CaseInsensitiveDict(self.headers)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp._content = self.body
+        # Lets iter_content() replay the body for callers that asked to stream it
+        resp._content_consumed = True
+        resp.from_cache = True
+        return resp
+
+
+class ResponseCache:
+    """
+    SQLite-backed HTTP response cache keyed by normalized URL.
+
+    Entries older than ``ttl`` seconds are revalidated with their ETag /
+    Last-Modified validators rather than refetched. The cache is kept under
+    ``max_bytes`` by evicting least recently used entries, and entries not
+    touched for ``max_age`` seconds are dropped entirely.
+    """
+
+    # Run eviction after this many writes rather than on every put
+    EVICT_EVERY = 50
+
+    def __init__(self, directory: str, ttl: float = 0,
+                 max_bytes: int = 512 * 1024 * 1024,
+                 max_age: float = 30 * 24 * 3600):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'responses.sqlite3')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+        self.evict()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, status, headers, body, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+        return CachedResponse(row[0], row[1], json.loads(row[2]), row[3], row[4])
+
+    def put(self, url: str, resp: requests.Response):
+        headers = {k: v for k, v in resp.headers.items() if k.lower() not in _WIRE_HEADERS}
+        body = resp.content
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (normalize_url(url), resp.url or url, resp.status_code, json.dumps(headers),
+                 sqlite3.Binary(body), len(body), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            should_evict = self._writes % self.EVICT_EVERY == 0
+        if should_evict:
+            self.evict()
+
+    def touch(self, url: str):
+        """Mark an entry as just revalidated (after a 304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?',
+                (now, now, normalize_url(url))
+            )
+            self._conn.commit()
+
+    def evict(self):
+        """Drop expired entries, then LRU entries until under ``max_bytes``."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses WHERE accessed_at < ?', (time.time() - self.max_age,))
+            total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            if total > self.max_bytes:
+                doomed = []
+                for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                self._conn.executemany('DELETE FROM responses WHERE key = ?', doomed)
+                logger.info(f"Evicted {len(doomed)} cached responses to stay under {self.max_bytes} bytes")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
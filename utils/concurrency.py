@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+from typing import Dict
+from urllib.parse import urlparse
+import threading
+
+
+class FetchLimiter:
+    """Caps the number of in-flight fetches globally and per host."""
+
+    def __init__(self, max_concurrency: int = 1, per_host: int = 2):
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host = max(1, per_host)
+        self._global = threading.BoundedSemaphore(self.max_concurrency)
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            sem = self._hosts.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.per_host)
+                self._hosts[host] = sem
+            return sem
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold a fetch slot for ``url`` for the duration of the block."""
+        # Take the host slot first so threads queued on a busy host don't
+        # sit on a global slot other hosts could be using.
+        host_sem = self._host_semaphore(url)
+        with host_sem:
+            with self._global:
+                yield
+
@@ -0,0 +1,215 @@
+"""
+Breadth-first crawl of a site's index pages to enumerate its articles.
+
+Index pages (the blog root, category and tag listings, ``/page/N``
+pagination) are fetched and mined for links; article pages are only
+collected, since the extractor fetches those itself. Pagination is followed
+at the depth of the page it came from, so ``max_depth`` limits hops into
+sub-listings, not how far back a listing's pages go.
+"""
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+
+import requests
+
+import config
+from utils.document import ParsedDocument
+from utils.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+Fetch = Callable[[str], requests.Response]
+
+PAGE_PATTERN = re.compile(r'/page/\d+/?$|[?&](?:page|paged)=\d+', re.IGNORECASE)
+NEXT_LABELS = {'next', 'next page', 'next »', 'next →', 'older', 'older posts', 'older entries',
+               'more posts', 'load more', '»', '›', '→'}
+
+# Frontier ranks: pagination is drained before sub-listings at the same depth
+_PAGINATION, _LISTING = 0, 1
+
+
+def _host(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class RobotsPolicy:
+    """robots.txt rules per host, fetched once each and shared across threads."""
+
+    def __init__(self, fetch: Fetch, user_agent: str = config.USER_AGENT):
+        self.fetch = fetch
+        self.user_agent = user_agent
+        self._parsers: Dict[str, RobotFileParser] = {}
+        # One lock per origin, held while its robots.txt is fetched; _lock only guards the dicts
+        self._origin_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _parser(self, url: str) -> RobotFileParser:
+        parsed = urlparse(url)
+        origin = f'{parsed.scheme}://{parsed.netloc}'
+        with self._lock:
+            parser = self._parsers.get(origin)
+            if parser is not None:
+                return parser
+            origin_lock = self._origin_locks.setdefault(origin, threading.Lock())
+        # A slow robots.txt only holds up checks against its own host
+        with origin_lock:
+            with self._lock:
+                parser = self._parsers.get(origin)
+            if parser is None:
+                parser = RobotFileParser(f'{origin}/robots.txt')
+                try:
+                    lines = self.fetch(f'{origin}/robots.txt').text.splitlines()
+                except requests.RequestException:
+                    # No readable robots.txt means no restrictions
+                    lines = []
+                parser.parse(lines)
+                with self._lock:
+                    self._parsers[origin] = parser
+            return parser
+
+    def allowed(self, url: str) -> bool:
+        return self._parser(url).can_fetch(self.user_agent, url)
+
+    def delay(self, url: str) -> float:
+        """Seconds to wait between fetches from ``url``'s host."""
+        parser = self._parser(url)
+        delay = parser.crawl_delay(self.user_agent)
+        if delay is None:
+            rate = parser.request_rate(self.user_agent)
+            delay = rate.seconds / rate.requests if rate else 0
+        return max(float(delay), config.CRAWL_DELAY)
+
+    def sitemaps(self, url: str) -> List[str]:
+        """``Sitemap:`` entries for ``url``'s site."""
+        return [urljoin(url, sitemap) for sitemap in self._parser(url).site_maps() or []]
+
+
+class CrawlScope:
+    """
+    Which URLs a crawl may visit.
+
+    Listings are crawled only below the source path, or below the ``allow``
+    prefixes configured for the domain in ``config.CRAWL_SCOPE_RULES``;
+    articles only need to be on the same site. URLs containing a ``deny``
+    pattern are never visited.
+    """
+
+    def __init__(self, source: str, rules: Optional[Dict[str, Dict[str, Iterable[str]]]] = None):
+        rules = config.CRAWL_SCOPE_RULES if rules is None else rules
+        self.host = _host(source)
+        rule = rules.get(self.host, {})
+        self.allow = tuple(rule.get('allow') or [urlparse(source).path.rstrip('/') + '/'])
+        self.deny = tuple(config.CRAWL_DENY_PATTERNS) + tuple(rule.get('deny', ()))
+
+    def on_site(self, url: str) -> bool:
+        if urlparse(url).scheme not in ('http', 'https') or _host(url) != self.host:
+            return False
+        url_lower = url.lower()
+        return not any(pattern in url_lower for pattern in self.deny)
+
+    def allows_listing(self, url: str) -> bool:
+        path = urlparse(url).path.rstrip('/') + '/'
+        return self.on_site(url) and path.startswith(self.allow)
+
+
+def pagination_links(soup, base_url: str) -> List[str]:
+    """Links to further pages of the listing in ``soup``, in document order."""
+    links = {}
+    for tag in soup.find_all(['link', 'a'], href=True):
+        rel = tag.get('rel') or []
+        label = tag.get_text(' ', strip=True).lower() if tag.name == 'a' else ''
+        if 'next' in rel or label in NEXT_LABELS or PAGE_PATTERN.search(tag['href']):
+            links.setdefault(urljoin(base_url, tag['href']), None)
+    return list(links)
+
+
+class Crawler:
+    """
+    Enumerates article URLs reachable from a listing page.
+
+    ``is_article`` decides which links are articles (collected, not fetched);
+    every other in-scope link is a listing to crawl. At most ``max_pages``
+    listings are fetched, none more than ``max_depth`` hops from the source.
+    """
+
+    def __init__(self, fetch: Fetch, is_article: Callable[[str], bool],
+                 max_depth: int = config.CRAWL_MAX_DEPTH, max_pages: int = config.CRAWL_MAX_PAGES,
+                 robots: Optional[RobotsPolicy] = None):
+        self.fetch = fetch
+        self.is_article = is_article
+        self.max_depth = max(0, max_depth)
+        self.max_pages = max(1, max_pages)
+        self.robots = robots or RobotsPolicy(fetch)
+        self._last_fetch: Dict[str, float] = {}
+
+    def _polite_fetch(self, url: str) -> requests.Response:
+        host = _host(url)
+        wait = self._last_fetch.get(host, 0) + self.robots.delay(url) - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            return self.fetch(url)
+        finally:
+            self._last_fetch[host] = time.monotonic()
+
+    def crawl(self, source: str, soup=None) -> List[str]:
+        """
+        Article URLs found from ``source``, in discovery order.
+
+        Pass the already-parsed source page as ``soup`` to avoid fetching it again.
+        """
+        scope = CrawlScope(source)
+        order = itertools.count()
+        frontier = [(0, _LISTING, next(order), source)]
+        seen = {canonicalize_url(source)}
+        articles: Dict[str, None] = {}
+        fetched = 0
+
+        while frontier and fetched < self.max_pages:
+            depth, _, _, url = heapq.heappop(frontier)
+            if soup is None or url != source:
+                if not self.robots.allowed(url):
+                    logger.info(f"robots.txt disallows {url}")
+                    continue
+                try:
+                    page = ParsedDocument.from_response(self._polite_fetch(url)).soup
+                except requests.RequestException as e:
+                    logger.warning(f"Error crawling {url}: {e}")
+                    continue
+            else:
+                page = soup
+            fetched += 1
+
+            next_pages = set(pagination_links(page, url))
+            for a in page.find_all('a', href=True):
+                link = urljoin(url, a['href'])
+                key = canonicalize_url(link)
+                if key in seen or not scope.on_site(link):
+                    continue
+                if self.is_article(link) and link not in next_pages:
+                    seen.add(key)
+                    if self.robots.allowed(link):
+                        articles.setdefault(link, None)
+                elif link in next_pages and scope.allows_listing(link):
+                    seen.add(key)
+                    heapq.heappush(frontier, (depth, _PAGINATION, next(order), link))
+                elif depth < self.max_depth and scope.allows_listing(link):
+                    seen.add(key)
+                    heapq.heappush(frontier, (depth + 1, _LISTING, next(order), link))
+            # <link rel="next"> has no anchor counterpart to pick it up above
+            for link in next_pages:
+                key = canonicalize_url(link)
+                if key not in seen and scope.allows_listing(link):
+                    seen.add(key)
+                    heapq.heappush(frontier, (depth, _PAGINATION, next(order), link))
+
+        logger.info(f"Crawled {fetched} listing pages, found {len(articles)} articles")
+        return list(articles)
@@ -0,0 +1,187 @@
+"""
+Article discovery from sitemaps and RSS/Atom feeds.
+
+A site's sitemap (found via ``robots.txt`` or ``/sitemap.xml``) usually lists
+every post with its last-modified date, which beats paging through index
+pages or driving a browser. Documents are parsed incrementally as they are
+read, so large sitemaps never sit in memory as a whole tree.
+"""
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+import logging
+import xml.etree.ElementTree as ET
+import zlib
+
+import requests
+
+import config
+
+logger = logging.getLogger(__name__)
+
+Fetch = Callable[[str], requests.Response]
+
+FEED_TYPES = ('application/rss+xml', 'application/atom+xml')
+
+# Elements that describe one entry, and the child elements holding its
+# location and modification date, across sitemaps, RSS and Atom
+_ENTRY_TAGS = {'url': 'page', 'sitemap': 'sitemap', 'item': 'page', 'entry': 'page'}
+_LOCATION_TAGS = ('loc', 'link')
+_DATE_TAGS = ('lastmod', 'updated', 'pubDate', 'published')
+
+
+class DiscoveredUrl(NamedTuple):
+    url: str
+    # Verbatim from the document; only ever compared for equality
+    lastmod: Optional[str] = None
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _entry_location(elem: ET.Element) -> Optional[str]:
+    for child in elem:
+        name = _local_name(child.tag)
+        if name not in _LOCATION_TAGS:
+            continue
+        # Atom: <link rel="alternate" href="..."/>; RSS and sitemaps: <link>url</link>
+        href = child.get('href')
+        if href is not None:
+            if child.get('rel', 'alternate') == 'alternate':
+                return href.strip()
+        elif child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _entry_lastmod(elem: ET.Element) -> Optional[str]:
+    dates = {_local_name(child.tag): child.text for child in elem}
+    for name in _DATE_TAGS:
+        if dates.get(name):
+            return dates[name].strip()
+    return None
+
+
+def _decompressed(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Pass chunks through, gunzipping them if the stream is a .gz file."""
+    inflater = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if inflater is None:
+            # requests only undoes Content-Encoding; sitemap.xml.gz files arrive compressed
+            inflater = zlib.decompressobj(16 + zlib.MAX_WBITS) if chunk[:2] == b'\x1f\x8b' else False
+        yield inflater.decompress(chunk) if inflater else chunk
+    if inflater:
+        yield inflater.flush()
+
+
+def iter_entries(chunks: Iterable[bytes]) -> Iterator[Tuple[str, DiscoveredUrl]]:
+    """
+    Yield ``(kind, entry)`` for each entry of a sitemap, sitemap index, RSS
+    or Atom document delivered in byte chunks.
+
+    ``kind`` is ``'sitemap'`` for sitemap-index children and ``'page'`` for
+    everything else. Raises ``xml.etree.ElementTree.ParseError`` on
+    malformed input.
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    for chunk in _decompressed(chunks):
+        parser.feed(chunk)
+        yield from _drain(parser)
+    parser.close()
+    yield from _drain(parser)
+
+
+def _drain(parser: ET.XMLPullParser) -> Iterator[Tuple[str, DiscoveredUrl]]:
+    for _, elem in parser.read_events():
+        kind = _ENTRY_TAGS.get(_local_name(elem.tag))
+        if kind is None:
+            continue
+        url = _entry_location(elem)
+        if url:
+            yield kind, DiscoveredUrl(url, _entry_lastmod(elem))
+        # Entries are independent, so drop each subtree once it's been read
+        elem.clear()
+
+
+def sitemaps_from_robots(text: str, base_url: str) -> List[str]:
+    """``Sitemap:`` entries from a robots.txt body, in file order."""
+    sitemaps = []
+    for line in text.splitlines():
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'sitemap' and value.strip():
+            sitemaps.append(urljoin(base_url, value.strip()))
+    return sitemaps
+
+
+def feed_links(soup, base_url: str) -> List[str]:
+    """RSS/Atom feeds advertised with ``<link rel="alternate">`` on a parsed page."""
+    feeds = {}
+    for link in soup.find_all('link', href=True):
+        rel = link.get('rel') or []
+        if 'alternate' in rel and (link.get('type') or '').lower() in FEED_TYPES:
+            feeds.setdefault(urljoin(base_url, link['href']), None)
+    return list(feeds)
+
+
+def _origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f'{parsed.scheme}://{parsed.netloc}'
+
+
+def read_documents(urls: Iterable[str], fetch: Fetch,
+                   max_documents: int = config.SITEMAP_MAX_DOCUMENTS) -> Dict[str, Optional[str]]:
+    """
+    Page URLs and their lastmod from the given sitemaps or feeds, following
+    sitemap indexes breadth-first.
+
+    At most ``max_documents`` documents are fetched. Documents that fail to
+    download or parse are logged and skipped.
+    """
+    queue = deque(urls)
+    fetched = set()
+    pages: Dict[str, Optional[str]] = {}
+    while queue and len(fetched) < max_documents:
+        url = queue.popleft()
+        if url in fetched:
+            continue
+        fetched.add(url)
+        try:
+            resp = fetch(url)
+            for kind, entry in iter_entries(resp.iter_content(config.DOWNLOAD_CHUNK_SIZE)):
+                if kind == 'sitemap':
+                    queue.append(urljoin(url, entry.url))
+                else:
+                    pages.setdefault(urljoin(url, entry.url), entry.lastmod)
+        except (requests.RequestException, ET.ParseError) as e:
+            logger.info(f"Skipping {url}: {e}")
+    return pages
+
+
+def discover_sitemap_urls(source: str, fetch: Fetch,
+                          sitemaps: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+    """
+    Pages listed in the sitemaps of ``source``'s site, keyed by URL, with their lastmod.
+
+    ``sitemaps`` are the site's robots.txt ``Sitemap:`` entries if the caller
+    already has them; otherwise robots.txt is fetched here.
+    """
+    origin = _origin(source)
+    if sitemaps is None:
+        try:
+            sitemaps = sitemaps_from_robots(fetch(f'{origin}/robots.txt').text, origin)
+        except requests.RequestException:
+            sitemaps = []
+    return read_documents(sitemaps or [f'{origin}/sitemap.xml'], fetch)
+
+
+def in_scope(url: str, source: str) -> bool:
+    """True if ``url`` is on ``source``'s host, below its path, and isn't ``source`` itself."""
+    target, base = urlparse(url), urlparse(source)
+    if target.netloc.lower() != base.netloc.lower():
+        return False
+    prefix = base.path.rstrip('/')
+    path = target.path.rstrip('/')
+    return path != prefix and (path + '/').startswith(prefix + '/')
@@ -0,0 +1,68 @@
+from typing import Optional
+from urllib.parse import urljoin
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+import requests
+
+from utils.metrics import metrics
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+def declared_charset(resp: requests.Response) -> Optional[str]:
+    """Charset from the Content-Type header, only if the server sent one."""
+    match = _CHARSET_RE.search(resp.headers.get('Content-Type', ''))
+    return match.group(1) if match else None
+
+
+class ParsedDocument:
+    """
+    An HTML page parsed exactly once.
+
+    The soup is built from the raw response bytes (with lxml when it is
+    installed), so bs4 sniffs the encoding from the header or ``<meta>``
+    instead of requests guessing it for ``resp.text``. Title, date, content
+    and markdown stages all work on this one tree; trafilatura gets the raw
+    bytes directly.
+    """
+
+    def __init__(self, raw: bytes, url: str = '', encoding: Optional[str] = None):
+        self.raw = raw
+        self.url = url
+        with metrics.timer('parse_html'):
+            self.soup = BeautifulSoup(raw, PARSER, from_encoding=encoding)
+
+    @classmethod
+    def from_response(cls, resp: requests.Response) -> 'ParsedDocument':
+        return cls(resp.content, url=resp.url, encoding=declared_charset(resp))
+
+    @property
+    def title(self) -> Optional[str]:
+        """Text of the ``<title>`` tag, if any."""
+        if self.soup.title and self.soup.title.string:
+            return self.soup.title.string.strip()
+        return None
+
+    @property
+    def canonical_url(self) -> Optional[str]:
+        """Absolute URL from ``<link rel="canonical">``, if the page declares one."""
+        for link in self.soup.find_all('link', href=True):
+            if 'canonical' in (link.get('rel') or []) and link['href'].strip():
+                return urljoin(self.url, link['href'].strip())
+        return None
+
+
+def extract_title_tag(resp: requests.Response) -> Optional[str]:
+    """Read just ``<title>`` without building a tree for the whole page."""
+    soup = BeautifulSoup(resp.content, PARSER, parse_only=SoupStrainer('title'),
+                         from_encoding=declared_charset(resp))
+    if soup.title and soup.title.string:
+        return soup.title.string.strip()
+    return None
@@ -0,0 +1,170 @@
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+import logging
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+from utils.cache import CacheMissError, ResponseCache
+from utils.metrics import metrics
+from utils.throttle import ERROR, OK, THROTTLED, Throttle, backoff_delay, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+def _accept_encoding() -> str:
+    """Advertise brotli only when urllib3 can actually decode it."""
+    try:
+        import brotli  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return 'gzip, deflate, br'
+        except ImportError:
+            return 'gzip, deflate'
+
+
+class HttpClient:
+    """
+    Pooled keep-alive HTTP session shared by every extractor in a run.
+
+    Network requests are paced per host by ``throttle`` and retried on
+    connection errors and ``config.RETRY_STATUSES``; cache hits skip both.
+    """
+
+    def __init__(self,
+                 timeout: float = config.REQUEST_TIMEOUT,
+                 pool_connections: int = config.POOL_CONNECTIONS,
+                 pool_maxsize: int = config.POOL_MAXSIZE,
+                 headers: Optional[Dict[str, str]] = None,
+                 cache: Optional[ResponseCache] = None,
+                 cache_only: bool = False,
+                 throttle: Optional[Throttle] = None,
+                 max_retries: int = config.MAX_RETRIES):
+        self.timeout = timeout
+        self.throttle = throttle if throttle is not None else Throttle()
+        self.max_retries = max(0, max_retries)
+        self.cache = cache
+        # Serve everything from the cache and never touch the network
+        self.cache_only = cache_only
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(config.DEFAULT_HEADERS)
+        self.session.headers['Accept-Encoding'] = _accept_encoding()
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET ``url`` over the shared session, applying the default timeout.
+
+        When a response cache is configured, fresh entries are served without
+        a request and stale ones are revalidated with If-None-Match /
+        If-Modified-Since. Entries are keyed by the URL with ``params``
+        encoded into it. A streamed response is stored, and replayed through
+        iter_content(), only when it declares a Content-Length up to
+        ``config.CACHE_MAX_STREAM_BYTES``; bigger downloads stay streamed and
+        uncached, so they are never held in memory.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if self.cache is None:
+            return self._send(url, **kwargs)
+        if kwargs.get('params'):
+            url = requests.Request('GET', url, params=kwargs.pop('params')).prepare().url
+
+        entry = self.cache.get(url)
+        if entry is not None and (self.cache_only or entry.is_fresh(self.cache.ttl)):
+            logger.debug(f"Cache hit: {url}")
+            metrics.count('http_cache_hits_total')
+            return entry.to_response()
+        if self.cache_only:
+            raise CacheMissError(f"Not in cache (cache-only mode): {url}")
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        resp = self._send(url, headers=headers, **kwargs)
+
+        if resp.status_code == 304 and entry is not None:
+            logger.debug(f"Revalidated cached response: {url}")
+            metrics.count('http_cache_revalidated_total')
+            resp.close()
+            self.cache.touch(url)
+            return entry.to_response()
+        if resp.status_code == 200 and (not kwargs.get('stream') or self._small_enough_to_cache(resp)):
+            self.cache.put(url, resp)
+        return resp
+
+    @staticmethod
+    def _small_enough_to_cache(resp: requests.Response) -> bool:
+        """True when a streamed response declares a body small enough to read whole."""
+        try:
+            size = int(resp.headers.get('Content-Length', ''))
+        except ValueError:
+            return False
+        return size <= config.CACHE_MAX_STREAM_BYTES
+
+    def _send(self, url: str, **kwargs) -> requests.Response:
+        """One logical GET: paced by the host's throttle and retried with backoff."""
+        host = self.throttle.host(url)
+        hostname = urlparse(url).netloc.lower()
+        attempt = 0
+        while True:
+            host.acquire()
+            start = time.monotonic()
+            try:
+                with metrics.timer('fetch'):
+                    resp = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                host.release(ERROR, time.monotonic() - start)
+                metrics.count('http_errors_total', host=hostname)
+                if attempt >= self.max_retries:
+                    raise
+                reason, delay = type(e).__name__, backoff_delay(attempt)
+            except Exception:
+                # Not retryable (bad URL, redirect loop, broken body...), but the slot must still go back
+                host.release(ERROR, time.monotonic() - start)
+                metrics.count('http_errors_total', host=hostname)
+                raise
+            else:
+                metrics.count('http_requests_total', host=hostname, status=resp.status_code)
+                if not kwargs.get('stream'):
+                    # Streamed bodies aren't read yet; their readers count them
+                    metrics.count('http_bytes_total', len(resp.content), host=hostname)
+                retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+                if resp.status_code in config.THROTTLE_STATUSES:
+                    host.release(THROTTLED, time.monotonic() - start, retry_after)
+                else:
+                    host.release(ERROR if resp.status_code >= 500 else OK, time.monotonic() - start)
+                if resp.status_code not in config.RETRY_STATUSES or attempt >= self.max_retries:
+                    return resp
+                resp.close()
+                reason = f"HTTP {resp.status_code}"
+                if retry_after is None:
+                    delay = backoff_delay(attempt)
+                elif resp.status_code in config.THROTTLE_STATUSES:
+                    # The throttle already paused the whole host until then
+                    delay = 0
+                else:
+                    delay = min(retry_after, config.RETRY_AFTER_MAX)
+            host.record_retry()
+            logger.info(f"{reason} from {url}; retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request statistics for this client so far."""
+        return self.throttle.stats()
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,95 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Manifest:
+    """
+    Per-team record of already-extracted sources.
+
+    Maps each source key (usually ``source_url``) to the hash of the raw
+    content it was extracted from, and the sitemap/feed date if there was
+    one, so incremental runs can skip parsing and converting anything that
+    hasn't changed. The items themselves live only in the output.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Entries recorded during this run, so worker processes can ship them back
+        self.updates: Dict[str, Dict[str, Any]] = {}
+        self.unchanged = 0
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('entries', {})
+            # Manifests from before entries were trimmed also held every item
+            self.entries = {key: {field: value for field, value in entry.items() if field != 'items'}
+                            for key, entry in entries.items()}
+            logger.info(f"Loaded manifest with {len(self.entries)} entries from {path}")
+
+    @staticmethod
+    def path_for_team(directory: str, team_id: str) -> str:
+        safe_team = re.sub(r'[^A-Za-z0-9_.-]+', '_', team_id)
+        return os.path.join(directory, f'{safe_team}.json')
+
+    @staticmethod
+    def content_hash(raw: bytes) -> str:
+        return hashlib.sha256(raw).hexdigest()
+
+    @staticmethod
+    def file_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+        """content_hash of a file, read in chunks so large files aren't loaded whole."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def is_unchanged(self, key: str, digest: str) -> bool:
+        entry = self.entries.get(key)
+        if entry is not None and entry.get('hash') == digest:
+            with self._lock:
+                self.unchanged += 1
+            return True
+        return False
+
+    def is_current(self, key: str, lastmod: str) -> bool:
+        """True when ``key`` was extracted at the modification date a sitemap or feed reports."""
+        entry = self.entries.get(key)
+        if entry is not None and entry.get('lastmod') == lastmod:
+            with self._lock:
+                self.unchanged += 1
+            return True
+        return False
+
+    def record(self, key: str, digest: str, lastmod: Optional[str] = None):
+        entry = {'hash': digest}
+        if lastmod is not None:
+            entry['lastmod'] = lastmod
+        with self._lock:
+            self.entries[key] = entry
+            self.updates[key] = entry
+
+    def merge_updates(self, updates: Dict[str, Dict[str, Any]], unchanged: int = 0):
+        """Fold in entries recorded by another process's copy of this manifest."""
+        with self._lock:
+            self.entries.update(updates)
+            self.updates.update(updates)
+            self.unchanged += unchanged
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -1,56 +1,107 @@
-from markdownify import markdownify as md
+from typing import Iterable, Iterator, Optional, Union
 import re
 
+from utils.metrics import metrics
+
+# markdownify (and bs4 with it) and trafilatura are imported on first use so
+# plain-text sources don't pay for them
+
 def html_to_markdown(html: str) -> str:
-    return md(html, heading_style="ATX")
+    from markdownify import markdownify as md
+    with metrics.timer('markdownify'):
+        return md(html, heading_style="ATX")
+
+def extract_main_markdown(html: Union[str, bytes], url: Optional[str] = None) -> Optional[str]:
+    """
+    Main content of a page as markdown, or None if trafilatura finds none.
+
+    trafilatura renders the markdown itself, keeping headings, emphasis and
+    links, so there's no plain-text result to push through markdownify.
+    """
+    from trafilatura import extract
+    with metrics.timer('trafilatura'):
+        return extract(html, url=url, output_format='markdown', include_comments=False,
+                       include_tables=True, include_formatting=True, include_links=True)
+
+def soup_to_markdown(element) -> str:
+    """Convert an already-parsed bs4 element without re-serializing and re-parsing it."""
+    # markdownify only trims surrounding newlines at the document root, so do
+    # it here to match html_to_markdown(str(element))
+    from markdownify import MarkdownConverter
+    with metrics.timer('markdownify'):
+        return MarkdownConverter(heading_style="ATX").convert_soup(element).strip('\n')
  
+# Compiled once at import; format_line runs for every line of every transcript
+# and PDF, so it shouldn't go through re's pattern cache each time.
+_CHAPTER = re.compile(r'CHAPTER\s+(\d+)(.*)', re.IGNORECASE)
+_NUMBERED = re.compile(r'\d+\.\s+')
+_ALL_CAPS = re.compile(r'[A-Z][A-Z\s]+$')
+
+def format_line(line: str) -> str:
+    """Format one stripped, non-empty line of plain text as markdown."""
+    # Each pattern is anchored at the start, so the first character rules
+    # most of them out before any regex runs.
+    first = line[0]
+    if first in 'cC':
+        # Convert "CHAPTER 1" to "# Chapter 1"
+        chapter_match = _CHAPTER.match(line)
+        if chapter_match:
+            chapter_num = chapter_match.group(1)
+            chapter_title = chapter_match.group(2).strip()
+            if chapter_title:
+                return f"# Chapter {chapter_num}: {chapter_title}"
+            return f"# Chapter {chapter_num}"
+    if first.isdecimal():
+        # Numbered lists
+        if _NUMBERED.match(line):
+            return line
+    elif 'A' <= first <= 'Z' and len(line) > 3 and _ALL_CAPS.match(line):
+        # All caps lines that might be headings
+        return f"## {line.title()}"
+    if line.endswith(':') and len(line) < 100:
+        # Lines ending with colon might be section headers
+        return f"### {line}"
+    # Regular paragraph text
+    return line
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the stripped, non-empty lines of text that arrives in pieces.
+
+    Chunks are treated as if concatenated, so a line split across two chunks
+    (e.g. the end of one PDF page and the start of the next) comes out once,
+    whole. Only the current partial line is held in memory.
+    """
+    pending = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield line
+    pending = pending.strip()
+    if pending:
+        yield pending
+
+def iter_markdown_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Formatted markdown lines for chunked text; see iter_lines."""
+    for line in iter_lines(chunks):
+        yield format_line(line)
+
+def stream_to_markdown(chunks: Iterable[str]) -> str:
+    """text_to_markdown for text delivered in chunks, without joining the input first."""
+    return '\n\n'.join(iter_markdown_lines(chunks))
+
 def text_to_markdown(text: str) -> str:
     """Convert plain text to well-formatted markdown"""
     if not text:
         return ""
-    
-    # Clean up the text
-    text = text.strip()
-    
-    # Split into lines and process
-    lines = text.split('\n')
-    markdown_lines = []
-    
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Detect and format headings
-        if re.match(r'^CHAPTER\s+\d+', line, re.IGNORECASE):
-            # Convert "CHAPTER 1" to "# Chapter 1"
-            chapter_match = re.match(r'^CHAPTER\s+(\d+)(.*)', line, re.IGNORECASE)
-            if chapter_match:
-                chapter_num = chapter_match.group(1)
-                chapter_title = chapter_match.group(2).strip()
-                if chapter_title:
-                    markdown_lines.append(f"# Chapter {chapter_num}: {chapter_title}")
-                else:
-                    markdown_lines.append(f"# Chapter {chapter_num}")
-            else:
-                markdown_lines.append(f"# {line}")
-        elif re.match(r'^\d+\.\s+', line):
-            # Numbered lists
-            markdown_lines.append(line)
-        elif re.match(r'^[A-Z][A-Z\s]+$', line) and len(line) > 3:
-            # All caps lines that might be headings
-            markdown_lines.append(f"## {line.title()}")
-        elif line.endswith(':') and len(line) < 100:
-            # Lines ending with colon might be section headers
-            markdown_lines.append(f"### {line}")
-        else:
-            # Regular paragraph text
-            markdown_lines.append(line)
-    
-    # Join lines with proper spacing
-    result = '\n\n'.join(markdown_lines)
-    
-    # Clean up excessive whitespace
-    result = re.sub(r'\n{3,}', '\n\n', result)
-    
-    return result 
\ No newline at end of file
+    # Formatted lines are never empty and never contain a newline, so the
+    # joined result can't have runs of blank lines to clean up afterwards.
+    with metrics.timer('text_markdown'):
+        return '\n\n'.join(
+            format_line(line) for line in map(str.strip, text.split('\n')) if line
+        )
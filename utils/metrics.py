@@ -0,0 +1,220 @@
+"""
+Run metrics: counters and per-stage timing histograms.
+
+Extractors, the HTTP client and the CLI record into the module-level
+``metrics``; ``scrape.py --profile`` writes them out at the end of a run as
+JSON or a Prometheus textfile. Recording is a dict update under a lock, so
+it stays on for every run.
+
+Stages timed (``stage_seconds{stage=...}``): ``fetch``, ``parse_html``,
+``trafilatura``, ``markdownify``, ``text_markdown``, ``selenium``,
+``pdf_download``, ``pdf_text`` and ``run``.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import threading
+import time
+
+# Upper bounds in seconds, Prometheus style; a final +Inf bucket is implied
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PREFIX = 'scrape_'
+
+Labels = Tuple[Tuple[str, str], ...]
+Series = Tuple[str, Labels]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _series_name(name: str, labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return name
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+    return name + '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+class Histogram:
+    """Bucketed observations plus count, sum, min and max."""
+
+    __slots__ = ('count', 'sum', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        # Non-cumulative counts, one per BUCKETS entry plus +Inf
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+
+    def merge(self, other: 'Histogram'):
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (clamped to max)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total_seconds': round(self.sum, 6),
+            'mean_seconds': round(self.sum / self.count, 6) if self.count else 0.0,
+            'min_seconds': round(self.min, 6) if self.count else 0.0,
+            'p50_seconds': self.quantile(0.5),
+            'p95_seconds': self.quantile(0.95),
+            'max_seconds': round(self.max, 6),
+        }
+
+
+class Metrics:
+    """Thread-safe counters and histograms, keyed by name and labels."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Series, float] = {}
+        self.histograms: Dict[Series, Histogram] = {}
+
+    def count(self, name: str, value: float = 1, **labels):
+        """Add ``value`` to the counter ``name`` with the given labels."""
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one observation in the histogram ``name``."""
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one observation of ``stage``, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - start, stage=stage)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """A picklable copy of everything recorded so far, for merge()."""
+        with self._lock:
+            histograms = {}
+            for key, histogram in self.histograms.items():
+                histograms[key] = copy = Histogram()
+                copy.merge(histogram)
+            return {'counters': dict(self.counters), 'histograms': histograms}
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """Fold in a snapshot() taken elsewhere, e.g. in a batch worker process."""
+        with self._lock:
+            for key, value in snapshot['counters'].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, histogram in snapshot['histograms'].items():
+                self.histograms.setdefault(key, Histogram()).merge(histogram)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def report(self, elapsed: Optional[float] = None) -> Dict[str, Any]:
+        """A JSON-friendly summary: counters, per-stage timings and items/sec."""
+        snapshot = self.snapshot()
+        items = sum(value for (name, _), value in snapshot['counters'].items() if name == 'items_total')
+        report: Dict[str, Any] = {'items': int(items)}
+        if elapsed is not None:
+            report['elapsed_seconds'] = round(elapsed, 3)
+            report['items_per_sec'] = round(items / elapsed, 3) if elapsed > 0 else 0.0
+        report['counters'] = {_series_name(name, labels): value
+                              for (name, labels), value in sorted(snapshot['counters'].items())}
+        report['stages'] = {dict(labels).get('stage', _series_name(name, labels)): histogram.summary()
+                            for (name, labels), histogram in sorted(snapshot['histograms'].items())}
+        return report
+
+    def to_prometheus(self) -> str:
+        """Everything recorded, in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        typed = set()
+        for (name, labels), value in sorted(snapshot['counters'].items()):
+            metric = PREFIX + name
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{_series_name(metric, labels)} {value:g}')
+        for (name, labels), histogram in sorted(snapshot['histograms'].items()):
+            metric = PREFIX + name
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f'# TYPE {metric} histogram')
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float('inf'),), histogram.buckets):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                lines.append(f'{_series_name(metric + "_bucket", labels, (("le", le),))} {cumulative}')
+            lines.append(f'{_series_name(metric + "_sum", labels)} {histogram.sum:.6f}')
+            lines.append(f'{_series_name(metric + "_count", labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str, elapsed: Optional[float] = None):
+        """Write a report to ``path``: Prometheus text for ``.prom``/``.txt``, JSON otherwise."""
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith(('.prom', '.txt')):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.report(elapsed), f, indent=2)
+
+
+# Shared by everything in this process
+metrics = Metrics()
+
+
+@contextmanager
+def profiled(report_path: Optional[str] = None, cpu_path: Optional[str] = None) -> Iterator[Metrics]:
+    """
+    Time the enclosed run as the ``run`` stage and, on the way out, write the
+    metrics report to ``report_path`` and a cProfile capture to ``cpu_path``
+    (either may be None). Metrics recorded before the run are discarded.
+    """
+    metrics.reset()
+    profiler = None
+    if cpu_path:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        with metrics.timer('run'):
+            yield metrics
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(cpu_path)
+        if report_path:
+            metrics.write(report_path, time.perf_counter() - start)
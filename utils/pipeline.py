@@ -0,0 +1,137 @@
+"""
+A fetch → parse pipeline with bounded in-flight work.
+
+Fetching is I/O-bound and runs on threads. Parsing HTML and converting it to
+markdown holds the GIL, so with ``parse_workers`` > 0 it runs in a process
+pool instead, and pages are fetched while earlier ones are being parsed. At
+most ``capacity`` items are between being handed to the pipeline and being
+handed back, so a slow consumer or parse stage stops new fetches rather than
+letting pages pile up in memory.
+"""
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+import multiprocessing
+import threading
+
+from utils.metrics import metrics
+
+T = TypeVar('T')
+P = TypeVar('P')
+R = TypeVar('R')
+
+
+def _fetch_and_parse(fetch: Callable[[T], Optional[P]], parse: Callable[[P], R], item: T) -> Optional[R]:
+    payload = fetch(item)
+    return None if payload is None else parse(payload)
+
+
+def _parse_in_worker(parse: Callable[[P], R], payload: P) -> Tuple[R, Dict[str, Any]]:
+    """Parse-pool entry point: the result plus the metrics recorded while producing it."""
+    metrics.reset()
+    return parse(payload), metrics.snapshot()
+
+
+class Pipeline:
+    """
+    Runs ``fetch`` on a thread pool and ``parse`` on a process pool.
+
+    ``parse`` and whatever ``fetch`` returns must be picklable when
+    ``parse_workers`` > 0 (so ``parse`` is a module-level function); with 0
+    it runs on the fetch thread right after the fetch. The process pool is
+    started on first use and kept for every run() until close().
+    """
+
+    def __init__(self, fetch_workers: int = 1, parse_workers: int = 0, capacity: Optional[int] = None):
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(0, parse_workers)
+        # Enough to keep every fetch thread and parse process busy, plus one queued parse each
+        self.capacity = max(1, capacity or self.fetch_workers + 2 * self.parse_workers)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def parse_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._parse_pool is None:
+                # Spawned, not forked: forking while fetch threads hold locks can deadlock the child
+                self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                                       mp_context=multiprocessing.get_context('spawn'))
+            return self._parse_pool
+
+    def run(self, items: Iterable[T], fetch: Callable[[T], Optional[P]],
+            parse: Callable[[P], R]) -> Iterator[Tuple[T, Optional[R]]]:
+        """
+        Yield ``(item, parse(fetch(item)))`` in input order; the result is
+        None when ``fetch`` returned None.
+
+        Exceptions from either stage propagate, so callers that need per-item
+        error isolation should catch inside ``fetch`` and ``parse``. Closing
+        the iterator early cancels work that hasn't started and waits for
+        fetches already running.
+        """
+        if self.fetch_workers == 1 and not self.parse_workers:
+            for item in items:
+                yield item, _fetch_and_parse(fetch, parse, item)
+            return
+        fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers)
+        closed = threading.Event()
+        window = deque()
+        try:
+            for item in items:
+                window.append((item, *self._submit(fetch_pool, fetch, parse, item, closed)))
+                if len(window) >= self.capacity:
+                    item, _, result = window.popleft()
+                    yield item, result.result()
+            while window:
+                item, _, result = window.popleft()
+                yield item, result.result()
+        finally:
+            closed.set()
+            for _, fetched, result in window:
+                fetched.cancel()
+                result.cancel()
+            fetch_pool.shutdown(wait=True)
+
+    def _submit(self, fetch_pool: ThreadPoolExecutor, fetch: Callable, parse: Callable, item,
+                closed: threading.Event) -> Tuple[Future, Future]:
+        """Start fetching ``item``; returns the fetch future and one for the parsed result."""
+        if not self.parse_workers:
+            fetched = fetch_pool.submit(_fetch_and_parse, fetch, parse, item)
+            return fetched, fetched
+        result: Future = Future()
+
+        def parse_fetched(fetched: Future):
+            # Runs on the fetch thread as soon as the page is in
+            if not result.set_running_or_notify_cancel():
+                return
+            if fetched.cancelled() or closed.is_set():
+                result.set_exception(RuntimeError('pipeline closed'))
+            elif fetched.exception() is not None:
+                result.set_exception(fetched.exception())
+            elif fetched.result() is None:
+                result.set_result(None)
+            else:
+                try:
+                    parsed = self.parse_pool.submit(_parse_in_worker, parse, fetched.result())
+                except RuntimeError as e:
+                    result.set_exception(e)
+                    return
+                parsed.add_done_callback(deliver)
+
+        def deliver(parsed: Future):
+            if parsed.exception() is not None:
+                result.set_exception(parsed.exception())
+                return
+            value, worker_metrics = parsed.result()
+            metrics.merge(worker_metrics)
+            result.set_result(value)
+
+        fetched = fetch_pool.submit(fetch, item)
+        fetched.add_done_callback(parse_fetched)
+        return fetched, result
+
+    def close(self):
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True, cancel_futures=True)
+            self._parse_pool = None
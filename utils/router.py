@@ -1,39 +1,130 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
 from pathlib import Path
+import importlib
 import mimetypes
 from urllib.parse import urlparse
 
-from extractors.base import ContentExtractor, ContentItem
-from extractors.website import WebsiteExtractor
-from extractors.pdf import PDFExtractor
-from extractors.reddit import RedditExtractor
-from extractors.substack import SubstackExtractor
-from extractors.linkedin import LinkedInExtractor
-from extractors.transcript import TranscriptExtractor
-from extractors.generic import GenericExtractor
-from extractors.gdrive import GoogleDriveExtractor
+from extractors.base import ContentExtractor
+from utils.manifest import Manifest
+from utils.urls import UrlIndex
+from utils import sources
+import config
+
+
+class ExtractorSpec(NamedTuple):
+    """Where to find an extractor and how to tell, cheaply, if it applies."""
+    name: str
+    module: str
+    matches: Callable[[str], bool]
+    # Network extractors share the run's pooled HTTP client
+    uses_http: bool = True
+
+
+# Checked in order; the first match wins. Google Drive and Reddit come first
+# to catch their URLs before the generic website extractor does; Substack and
+# LinkedIn URLs are crawled by the website extractor.
+EXTRACTORS: List[ExtractorSpec] = [
+    ExtractorSpec('GoogleDriveExtractor', 'extractors.gdrive', sources.is_gdrive_folder),
+    ExtractorSpec('RedditExtractor', 'extractors.reddit', sources.is_reddit),
+    ExtractorSpec('WebsiteExtractor', 'extractors.website', sources.is_web_url),
+    ExtractorSpec('PDFExtractor', 'extractors.pdf', sources.is_pdf_file, uses_http=False),
+    ExtractorSpec('SubstackExtractor', 'extractors.substack', sources.is_substack),
+    ExtractorSpec('LinkedInExtractor', 'extractors.linkedin', sources.is_linkedin),
+    ExtractorSpec('TranscriptExtractor', 'extractors.transcript', sources.is_transcript_file, uses_http=False),
+]
+FALLBACK = ExtractorSpec('GenericExtractor', 'extractors.generic', lambda source: True, uses_http=False)
+
 
 class ContentRouter:
-    """Routes content extraction to the appropriate extractor."""
+    """
+    Routes content extraction to the appropriate extractor.
+
+    Extractors are matched with the lightweight predicates in
+    ``utils.sources`` and their modules are only imported (and instantiated,
+    once) when selected, so e.g. a transcript run never loads Selenium or
+    trafilatura.
+    """
     
-    def __init__(self):
-        self.extractors: List[ContentExtractor] = [
-            GoogleDriveExtractor(),  # Put Google Drive first to catch drive.google.com URLs
-            WebsiteExtractor(),
-            PDFExtractor(),
-            RedditExtractor(),
-            SubstackExtractor(),
-            LinkedInExtractor(),
-            TranscriptExtractor(),
-            GenericExtractor(),
-        ]
+    def __init__(self, extractor_options: Optional[Dict[str, Dict[str, Any]]] = None,
+                 http=None,
+                 manifest: Optional[Manifest] = None,
+                 http_settings: Optional[Dict[str, Any]] = None):
+        # Per-extractor constructor kwargs, keyed by extractor class name
+        self.extractor_options = extractor_options or {}
+        # One pooled session for the whole run so fetches reuse connections;
+        # built on first use from http_settings if not passed in
+        self._http = http
+        self._http_settings = http_settings or {}
+        self.manifest = manifest
+        # Shared by every extractor so no page is fetched twice in one run
+        self.urls = UrlIndex()
+        self._instances: Dict[str, ContentExtractor] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'ContentRouter':
+        """
+        Build a router from a plain settings dict (as produced by scrape.py).
+        Settings are picklable so batch worker processes can build identical
+        routers. The HTTP client and cache are created lazily.
+        """
+        manifest = Manifest(settings['manifest_path']) if settings.get('manifest_path') else None
+        return cls(extractor_options=settings.get('extractor_options'), manifest=manifest,
+                   http_settings=settings)
+
+    @property
+    def http(self):
+        if self._http is None:
+            from utils.http import HttpClient
+
+            settings = self._http_settings
+            cache = None
+            if settings.get('cache_dir'):
+                from utils.cache import ResponseCache
+
+                cache = ResponseCache(settings['cache_dir'], ttl=settings.get('cache_ttl', 0),
+                                      max_bytes=settings.get('cache_max_bytes', 512 * 1024 * 1024))
+            from utils.throttle import Throttle
+
+            # --per-host-concurrency is the ceiling the adaptive per-host limit can climb to
+            throttle = Throttle(
+                rate=settings.get('rate_limit', config.RATE_LIMIT_PER_HOST),
+                max_concurrency=settings.get('per_host_concurrency', config.HOST_MAX_CONCURRENCY),
+            )
+            self._http = HttpClient(pool_maxsize=settings.get('pool_maxsize', config.POOL_MAXSIZE),
+                                    cache=cache, cache_only=settings.get('cache_only', False),
+                                    throttle=throttle, max_retries=settings.get('max_retries', config.MAX_RETRIES))
+        return self._http
+
+    def _load(self, spec: ExtractorSpec) -> ContentExtractor:
+        extractor = self._instances.get(spec.name)
+        if extractor is None:
+            cls = getattr(importlib.import_module(spec.module), spec.name)
+            kwargs = dict(self.extractor_options.get(spec.name, {}))
+            kwargs['manifest'] = self.manifest
+            kwargs['urls'] = self.urls
+            if spec.uses_http:
+                kwargs['http'] = self.http
+            extractor = cls(**kwargs)
+            self._instances[spec.name] = extractor
+        return extractor
     
     def get_extractor(self, source: str) -> Optional[ContentExtractor]:
         """Find the appropriate extractor for the given source."""
-        for extractor in self.extractors:
-            if extractor.can_handle(source):
-                return extractor
-        return GenericExtractor()
+        for spec in EXTRACTORS:
+            if spec.matches(source):
+                return self._load(spec)
+        return self._load(FALLBACK)
+
+    def http_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request statistics, empty if nothing was fetched over HTTP."""
+        return self._http.stats() if self._http is not None else {}
+
+    def close(self):
+        """Release shared resources (pooled connections, browsers)."""
+        for extractor in self._instances.values():
+            extractor.close()
+        if self._http is not None:
+            self._http.close()
     
     def infer_content_type(self, source: str, content: str) -> str:
         """Infer the content type based on source and content."""
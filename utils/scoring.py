@@ -0,0 +1,129 @@
+"""
+Find the main content block of a parsed page in one pass over the tree.
+
+Every element's text length, link text length and descendant tag count are
+summed bottom-up from its children, so each node is visited once instead of
+calling ``get_text()`` on every candidate (quadratic in nesting depth).
+Paragraph-like blocks then score their parent and grandparent, in the
+manner of readability: the winner is the element that directly holds the
+most prose, discounted by its link density, rather than the outermost
+wrapper, which always has the most text.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from bs4 import Comment, NavigableString, Tag
+
+# Elements whose text is never content
+SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg', 'head'})
+# Blocks whose text counts towards their container's score
+PARAGRAPH_TAGS = frozenset({'p', 'pre', 'blockquote', 'td'})
+# Elements that may be picked as the content block
+CONTAINER_TAGS = frozenset({'div', 'section', 'article', 'main', 'td', 'body'})
+# Shorter paragraphs (bylines, captions, buttons) don't score
+MIN_PARAGRAPH_CHARS = 25
+
+
+class NodeStats:
+    """Totals for an element and everything below it."""
+
+    __slots__ = ('text', 'link_text', 'tags', 'commas', 'score')
+
+    def __init__(self):
+        self.text = 0
+        self.link_text = 0
+        self.tags = 0
+        self.commas = 0
+        self.score = 0.0
+
+    @property
+    def link_density(self) -> float:
+        return self.link_text / self.text if self.text else 0.0
+
+
+_EMPTY = NodeStats()
+
+
+class ContentScorer:
+    """
+    Content scores for one tree, computed on construction and kept per node.
+
+    Build one per page and ask it as many questions as needed; stats() and
+    best_block() only look up what was computed.
+    """
+
+    def __init__(self, root: Tag):
+        self.root = root
+        self._stats: Dict[int, NodeStats] = {}
+        # Document order; every element comes after its ancestors
+        self._tags: List[Tag] = [root] + [tag for tag in root.descendants if isinstance(tag, Tag)]
+        self._measure()
+        self._score()
+
+    def _measure(self):
+        # Reversed document order visits children before their parents
+        for tag in reversed(self._tags):
+            stats = NodeStats()
+            self._stats[id(tag)] = stats
+            if tag.name in SKIP_TAGS:
+                continue
+            for child in tag.contents:
+                if isinstance(child, Tag):
+                    below = self._stats[id(child)]
+                    stats.text += below.text
+                    stats.link_text += below.link_text
+                    stats.commas += below.commas
+                    stats.tags += below.tags + 1
+                elif isinstance(child, NavigableString) and not isinstance(child, Comment):
+                    text = child.strip()
+                    stats.text += len(text)
+                    stats.commas += text.count(',')
+            if tag.name == 'a':
+                stats.link_text = stats.text
+
+    def _score(self):
+        for tag in self._tags:
+            if tag.name not in PARAGRAPH_TAGS:
+                continue
+            stats = self._stats[id(tag)]
+            if stats.text < MIN_PARAGRAPH_CHARS:
+                continue
+            points = 1 + stats.commas + min(stats.text / 100, 3)
+            parent = tag.parent
+            if parent is not None and id(parent) in self._stats:
+                self._stats[id(parent)].score += points
+                grandparent = parent.parent
+                if grandparent is not None and id(grandparent) in self._stats:
+                    self._stats[id(grandparent)].score += points / 2
+
+    def stats(self, tag: Tag) -> NodeStats:
+        """Stats for ``tag``; empty for elements outside this scorer's tree."""
+        return self._stats.get(id(tag), _EMPTY)
+
+    def best_block(self, candidates: Iterable[str] = CONTAINER_TAGS) -> Optional[Tag]:
+        """
+        The element most likely to be the main content, or None if there is
+        no text at all.
+
+        Containers are ranked by paragraph score times one minus their link
+        density. Pages without scoring paragraphs fall back to the container
+        with the most non-link text.
+        """
+        names = frozenset(candidates)
+        best, best_score = None, 0.0
+        fallback, fallback_text = None, 0
+        for tag in self._tags:
+            if tag.name not in names:
+                continue
+            stats = self._stats[id(tag)]
+            score = stats.score * (1 - stats.link_density)
+            if score > best_score:
+                best, best_score = tag, score
+            # On a tie the inner element wins; its wrappers add nothing
+            if stats.text - stats.link_text >= fallback_text and stats.text > stats.link_text:
+                fallback, fallback_text = tag, stats.text - stats.link_text
+        return best if best is not None else fallback
+
+
+def best_content_block(root: Tag, candidates: Iterable[str] = CONTAINER_TAGS) -> Optional[Tag]:
+    """The main content element under ``root``; see ContentScorer.best_block()."""
+    return ContentScorer(root).best_block(candidates)
@@ -0,0 +1,200 @@
+from typing import Any, Dict, IO, Iterable, Iterator, List, NamedTuple
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import config
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('json', 'jsonl')
+
+
+class SpilledText(NamedTuple):
+    """Where a string parked by ContentSpill lives in its temp file."""
+    offset: int
+    length: int
+
+
+class ContentSpill:
+    """
+    Large strings parked in an anonymous temp file until they are written out.
+
+    The file is deleted when closed, or by the OS if the process dies.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+
+    def put(self, text: str) -> SpilledText:
+        data = text.encode('utf-8')
+        self._file.seek(0, os.SEEK_END)
+        ref = SpilledText(self._file.tell(), len(data))
+        self._file.write(data)
+        return ref
+
+    def get(self, ref: SpilledText) -> str:
+        self._file.seek(ref.offset)
+        return self._file.read(ref.length).decode('utf-8')
+
+    def close(self):
+        self._file.close()
+
+
+def _item_key(item: Dict[str, Any]) -> str:
+    return item.get('source_url') or item.get('title', '')
+
+
+def _write_document(f: IO[str], team_id: str, items: Iterable[Dict[str, Any]]):
+    """
+    Write ``{"team_id": ..., "items": [...]}`` exactly as ``json.dump(...,
+    indent=2)`` would, one item at a time so the whole document is never
+    built in memory.
+    """
+    f.write('{\n  "team_id": ' + json.dumps(team_id, ensure_ascii=False) + ',\n  "items": [')
+    empty = True
+    for item in items:
+        f.write('\n    ' if empty else ',\n    ')
+        # Strings are escaped, so every newline here is indentation
+        f.write(json.dumps(item, indent=2, ensure_ascii=False).replace('\n', '\n    '))
+        empty = False
+    f.write(']\n}' if empty else '\n  ]\n}')
+
+
+def read_items(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the items of a previous output file in either format."""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            header = None
+        f.seek(0)
+        if not (isinstance(header, dict) and header.get('type') == 'header'):
+            yield from json.load(f).get('items', [])
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get('type') == 'item':
+                yield record['item']
+
+
+class JsonSink:
+    """
+    Collects items and writes them as one indented JSON document on close.
+
+    This is the original output format: ``{"team_id": ..., "items": [...]}``.
+    Since nothing is written before close, ``content`` of at least
+    ``spill_threshold`` characters is moved to a temp file meanwhile and
+    read back as the document is written (0 keeps everything in memory).
+    """
+
+    def __init__(self, path: str, team_id: str, merge: bool = False,
+                 spill_threshold: int = config.SPILL_CONTENT_CHARS):
+        self.path = path
+        self.team_id = team_id
+        self.merge = merge
+        self.spill_threshold = spill_threshold
+        self.count = 0
+        self._items: List[Dict[str, Any]] = []
+        self._spill = None
+
+    def write(self, item: Dict[str, Any]):
+        content = item.get('content')
+        if self.spill_threshold and isinstance(content, str) and len(content) >= self.spill_threshold:
+            if self._spill is None:
+                self._spill = ContentSpill()
+            item = dict(item, content=self._spill.put(content))
+        self._items.append(item)
+        self.count += 1
+
+    def _load(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if isinstance(item.get('content'), SpilledText):
+            return dict(item, content=self._spill.get(item['content']))
+        return item
+
+    def close(self, skipped: int = 0) -> int:
+        """Write the document; returns the number of items in the file."""
+        items = self._items
+        if self.merge and Path(self.path).exists():
+            # Changed items replace their old version in place, new ones are appended
+            fresh = {_item_key(item): item for item in items}
+            items = [fresh.pop(_item_key(item), item) for item in read_items(self.path)]
+            items.extend(item for item in self._items if _item_key(item) in fresh)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                _write_document(f, self.team_id, (self._load(item) for item in items))
+        finally:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+        return len(items)
+
+
+class JsonlSink:
+    """
+    Streams items to a JSON Lines file as they are produced.
+
+    The first line is a header record carrying ``team_id``, every item is
+    its own ``{"type": "item", "item": {...}}`` line, and a footer record
+    with counts is written on close. A run that dies part way through keeps
+    every item written so far; the missing footer marks it as incomplete.
+    """
+
+    def __init__(self, path: str, team_id: str, merge: bool = False,
+                 flush_every: int = 10, flush_interval: float = 2.0):
+        self.path = path
+        self.team_id = team_id
+        self.merge = merge and Path(path).exists()
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._keys = set()
+        self._last_flush = time.monotonic()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # When merging, the previous file is still needed until close
+        self._write_path = f'{path}.partial' if self.merge else path
+        self._file = open(self._write_path, 'w', encoding='utf-8')
+        self._write_record({"type": "header", "team_id": team_id})
+
+    def _write_record(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+
+    def write(self, item: Dict[str, Any]):
+        self._write_record({"type": "item", "item": item})
+        self.count += 1
+        if self.merge:
+            self._keys.add(_item_key(item))
+        now = time.monotonic()
+        if self.count % self.flush_every == 0 or now - self._last_flush >= self.flush_interval:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self, skipped: int = 0) -> int:
+        """Write the footer; returns the number of items in the file."""
+        total = self.count
+        if self.merge:
+            for item in read_items(self.path):
+                if _item_key(item) not in self._keys:
+                    self._write_record({"type": "item", "item": item})
+                    total += 1
+        self._write_record({"type": "footer", "team_id": self.team_id,
+                            "count": total, "new": self.count, "skipped": skipped})
+        self._file.close()
+        if self._write_path != self.path:
+            os.replace(self._write_path, self.path)
+        return total
+
+
+def open_sink(fmt: str, path: str, team_id: str, merge: bool = False,
+              spill_threshold: int = config.SPILL_CONTENT_CHARS):
+    if fmt == 'jsonl':
+        # Items go straight to disk, so there is nothing to spill
+        return JsonlSink(path, team_id, merge=merge)
+    return JsonSink(path, team_id, merge=merge, spill_threshold=spill_threshold)
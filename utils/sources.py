@@ -0,0 +1,35 @@
+"""
+Cheap source predicates shared by the router and the extractors' can_handle.
+
+This module must stay free of heavy imports: the router uses it to pick an
+extractor before that extractor's module (and its dependencies) is loaded.
+"""
+import os
+
+
+def is_gdrive_folder(source: str) -> bool:
+    return 'drive.google.com/drive/folders/' in source
+
+
+def is_web_url(source: str) -> bool:
+    return source.startswith('http')
+
+
+def is_pdf_file(source: str) -> bool:
+    return os.path.isfile(source) and source.lower().endswith('.pdf')
+
+
+def is_reddit(source: str) -> bool:
+    return 'reddit.com' in source
+
+
+def is_substack(source: str) -> bool:
+    return 'substack.com' in source
+
+
+def is_linkedin(source: str) -> bool:
+    return 'linkedin.com' in source
+
+
+def is_transcript_file(source: str) -> bool:
+    return os.path.isfile(source) and source.lower().endswith('.txt')
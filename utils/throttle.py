@@ -0,0 +1,155 @@
+"""
+Per-host request pacing that adapts to how the server responds.
+
+Each host gets a token bucket (requests per second, with a burst) and an
+in-flight cap. Both shrink by half when the host answers 429/503 and grow
+back gradually on success (AIMD), and a ``Retry-After`` pauses the host for
+every thread, not just the one that got it.
+"""
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+import datetime
+import random
+import threading
+import time
+
+import config
+
+# Outcomes reported back to a HostThrottle
+OK, THROTTLED, ERROR = 'ok', 'throttled', 'error'
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = config.RETRY_BACKOFF_BASE,
+                  cap: float = config.RETRY_BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class HostThrottle:
+    """Token bucket plus AIMD concurrency limit for one host."""
+
+    def __init__(self, rate: float = config.RATE_LIMIT_PER_HOST, burst: int = config.RATE_LIMIT_BURST,
+                 min_concurrency: int = config.HOST_MIN_CONCURRENCY,
+                 max_concurrency: int = config.HOST_MAX_CONCURRENCY):
+        # rate <= 0 disables the token bucket (concurrency is still adaptive)
+        self.max_rate = max(0.0, rate)
+        self.rate = self.max_rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        # Start low and earn more parallelism with successful responses
+        self.limit = float(min(self.max_concurrency, max(self.min_concurrency, 2)))
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self.stats = {'requests': 0, 'ok': 0, 'throttled': 0, 'errors': 0, 'retries': 0, 'seconds': 0.0}
+
+    def _refill(self, now: float):
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _wait_time(self, now: float) -> Optional[float]:
+        """Seconds until a request may start, 0 if now, None if waiting on a release."""
+        if self.paused_until > now:
+            return self.paused_until - now
+        if self.in_flight >= int(self.limit):
+            return None
+        if self.rate > 0 and self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        return 0
+
+    def acquire(self):
+        """Block until this host may take another request."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_time(now)
+                if wait == 0:
+                    if self.rate > 0:
+                        self.tokens -= 1
+                    self.in_flight += 1
+                    self.stats['requests'] += 1
+                    return
+                self._cond.wait(wait)
+
+    def release(self, outcome: str, seconds: float = 0.0, retry_after: Optional[float] = None):
+        """Report how a request acquired with acquire() went."""
+        with self._cond:
+            self.in_flight -= 1
+            self.stats['seconds'] += seconds
+            if outcome == THROTTLED:
+                self.stats['throttled'] += 1
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                if self.max_rate > 0:
+                    self.rate = max(self.max_rate / 16, self.rate / 2)
+                if retry_after is not None:
+                    pause = min(retry_after, config.RETRY_AFTER_MAX)
+                    self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            elif outcome == OK:
+                self.stats['ok'] += 1
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                if self.max_rate > 0:
+                    self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+            else:
+                self.stats['errors'] += 1
+            self._cond.notify_all()
+
+    def record_retry(self):
+        with self._cond:
+            self.stats['retries'] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self.stats)
+            stats['concurrency'] = int(self.limit)
+            stats['rate'] = round(self.rate, 2)
+            stats['avg_seconds'] = round(stats['seconds'] / stats['requests'], 3) if stats['requests'] else 0.0
+            stats['seconds'] = round(stats['seconds'], 3)
+            return stats
+
+
+class Throttle:
+    """HostThrottles for every host a run talks to, created on first use."""
+
+    def __init__(self, rate: float = config.RATE_LIMIT_PER_HOST, burst: int = config.RATE_LIMIT_BURST,
+                 min_concurrency: int = config.HOST_MIN_CONCURRENCY,
+                 max_concurrency: int = config.HOST_MAX_CONCURRENCY):
+        self._options = dict(rate=rate, burst=burst, min_concurrency=min_concurrency,
+                             max_concurrency=max_concurrency)
+        self._hosts: Dict[str, HostThrottle] = {}
+        self._lock = threading.Lock()
+
+    def host(self, url: str) -> HostThrottle:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            throttle = self._hosts.get(host)
+            if throttle is None:
+                throttle = self._hosts[host] = HostThrottle(**self._options)
+            return throttle
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request statistics so far."""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: throttle.snapshot() for host, throttle in sorted(hosts.items())}
@@ -0,0 +1,101 @@
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import threading
+
+import config
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a lookup key.
+
+    Lowercases the scheme and host, drops default ports and fragments, and
+    sorts query parameters. The result still points at the same resource;
+    nothing that a server could treat differently is removed.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    netloc = host if port is None or _DEFAULT_PORTS.get(scheme) == port else f'{host}:{port}'
+    if parts.username:
+        userinfo = parts.username + (f':{parts.password}' if parts.password else '')
+        netloc = f'{userinfo}@{netloc}'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith(config.TRACKING_PARAM_PREFIXES) or name in config.TRACKING_PARAMS
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Identity key for a page: two URLs with the same key are the same article.
+
+    On top of normalize_url, drops tracking parameters (``utm_*``, ``ref``,
+    ``fbclid``...), a trailing slash, and the difference between http and
+    https. Those don't change what the sites we scrape serve, but a server
+    could in principle treat them differently, so use this to compare URLs,
+    not as a URL to fetch or cache by.
+    """
+    parts = urlsplit(normalize_url(url))
+    scheme = 'https' if parts.scheme == 'http' else parts.scheme
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode([(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not _is_tracking_param(name)])
+    return urlunsplit((scheme, parts.netloc, path, query, ''))
+
+
+def dedupe_urls(urls: Iterable[str]) -> List[str]:
+    """The first of each set of URLs sharing a canonical form, in input order."""
+    unique = {}
+    for url in urls:
+        unique.setdefault(canonicalize_url(url), url)
+    return list(unique.values())
+
+
+class UrlIndex:
+    """
+    Run-wide set of pages already fetched, keyed by canonical URL.
+
+    Shared by every extractor through the router so a page reached several
+    ways (tracking parameters, trailing slashes, several post cards linking
+    to it, a ``<link rel="canonical">`` pointing elsewhere) is only fetched
+    and emitted once. Safe to use from multiple threads.
+    """
+
+    def __init__(self):
+        self._keys = set()
+        self._lock = threading.Lock()
+        # Fetches avoided (or, for canonical hits, items dropped) so far
+        self.duplicates = 0
+
+    def __contains__(self, url: str) -> bool:
+        return canonicalize_url(url) in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def claim(self, url: str) -> bool:
+        """Mark ``url`` as handled; False if it (or an equivalent URL) already was."""
+        key = canonicalize_url(url)
+        with self._lock:
+            if key in self._keys:
+                self.duplicates += 1
+                return False
+            self._keys.add(key)
+            return True
+
+    def claim_canonical(self, url: str, canonical: Optional[str]) -> bool:
+        """
+        After fetching ``url``, also claim the canonical URL the page declares.
+
+        False means the page is an article already handled under another URL.
+        """
+        if not canonical or canonicalize_url(canonical) == canonicalize_url(url):
+            return True
+        return self.claim(canonical)